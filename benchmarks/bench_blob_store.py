@@ -0,0 +1,95 @@
+# 내용 저장소 벤치마크: 세션 여러 개가 같은 큰 로그/데이터 파일을 각자 쓰고 복사할 때
+# 파일 내용이 차지하는 메모리(tracemalloc)와 쓰기, cat/grep, read_file 시간을
+# 저장소 없이(노드마다 str), zlib 압축, lzma 압축으로 비교한다.
+#   python benchmarks/bench_blob_store.py --sessions 20 --lines 200000
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blob_store import BlobStore
+from shell_engine import ShellEngine
+from vfs import VirtualFileSystem
+
+LEVELS = ('INFO', 'INFO', 'INFO', 'WARN', 'ERROR')
+
+
+def make_log(lines, seed):
+    rng = random.Random(seed)
+    return ''.join(f"2024-03-{1 + i // 86400 % 28:02d} {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d} "
+                   f"web{rng.randrange(8)} app[{rng.randrange(1000, 9999)}]: {rng.choice(LEVELS)} "
+                   f"GET /api/item/{rng.randrange(100000)} {rng.randrange(1, 2000)}ms\n" for i in range(lines))
+
+
+def run(store, sessions, dataset, datafile):
+    # 기본 이미지에 데이터 파일 하나, 세션마다 같은 로그를 쓰고 cp로 한 번 더 복사한다.
+    # 명령 출력(> 리다이렉션)처럼 세션마다 따로 만들어진 문자열을 쓴다 (같은 str 객체를 넘기면 원래도 공유된다)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    base = VirtualFileSystem()
+    base.store = store
+    base.create_dir('/data')
+    base.write_file('/data/dataset.csv', datafile.encode().decode())
+    engines = []
+    start = time.perf_counter()
+    for _ in range(sessions):
+        vfs = VirtualFileSystem.overlay(base)
+        vfs.store = store
+        vfs.create_dir('/tmp')
+        vfs.write_file('/tmp/app.log', dataset.encode().decode())
+        vfs.copy('/tmp/app.log', '/tmp/app.log.1')
+        engines.append(ShellEngine(vfs))
+    write = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+
+    engine = engines[-1]
+    start = time.perf_counter()
+    result = engine.execute('grep -c ERROR /tmp/app.log')
+    grep = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.execute('cat /tmp/app.log | wc -l')
+    cat = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.vfs.read_file('/data/dataset.csv')
+    read = time.perf_counter() - start
+    stats = store.stats() if store is not None else None
+    for engine in engines:
+        engine.vfs.release()
+    engines.clear()
+    return retained, write, grep, cat, read, result.stdout, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--lines', type=int, default=200000, help='로그 파일 줄 수 (데이터 파일도 같은 크기)')
+    options = parser.parse_args()
+
+    dataset = make_log(options.lines, 1)
+    datafile = make_log(options.lines, 2)
+    print(f"세션 {options.sessions}개, 로그 {len(dataset) / 1e6:.1f} MB (세션마다 쓰고 cp), "
+          f"기본 이미지 데이터 {len(datafile) / 1e6:.1f} MB")
+    tracemalloc.start()
+    expected = None
+    for name, store in (('str', None), ('zlib', BlobStore('zlib')), ('lzma', BlobStore('lzma'))):
+        retained, write, grep, cat, read, output, stats = run(store, options.sessions, dataset, datafile)
+        if expected is None:
+            expected = output
+        assert output == expected, (name, output, expected)
+        print(f"{name:>5}: 파일 내용 메모리 {retained / 1e6:8.1f} MB  쓰기 {write * 1e3:8.1f} ms  "
+              f"grep -c {grep * 1e3:7.1f} ms  cat|wc {cat * 1e3:7.1f} ms  read_file {read * 1e3:6.1f} ms")
+        if stats is not None:
+            print(f"       논리 {stats['logical_bytes'] / 1e6:.1f} MB -> 중복 제거 {stats['unique_bytes'] / 1e6:.1f} MB "
+                  f"({stats['dedup_ratio']:.1f}배) -> 실제 {stats['physical_bytes'] / 1e6:.1f} MB "
+                  f"(압축 {stats['compression_ratio']:.1f}배)")
+    tracemalloc.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# Tab 자동 완성 지연 시간 벤치마크: 항목 5만 개짜리 디렉토리에서 완성 한 번이 1ms 안에 끝나는지 잰다.
+#   python benchmarks/bench_completion.py --entries 50000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shell_engine import ShellEngine
+
+
+def measure(engine, line, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine.complete(line)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2], times[int(len(times) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=2000)
+    options = parser.parse_args()
+
+    engine = ShellEngine()
+    engine.vfs.create_dir('/big')
+    for i in range(options.entries):
+        engine.vfs.create_file(f'/big/file_{i:06d}.txt')
+    engine.execute('cd /big')
+
+    start = time.perf_counter()
+    engine.complete('cat file_0')
+    cold = time.perf_counter() - start
+    print(f"항목 수                 : {options.entries}")
+    print(f"첫 완성 (정렬 목록 생성) : {cold * 1000:.2f} ms")
+
+    cases = [
+        ('명령어', 'gr'),
+        ('유일한 파일', f'cat file_{options.entries // 2:06d}'),
+        ('후보 10개', 'cat file_00012'),
+        ('후보 전체 (상대 경로)', 'cat file_'),
+        ('후보 전체 (절대 경로)', 'cat /big/'),
+    ]
+    for label, line in cases:
+        median, p99 = measure(engine, line, options.repeat)
+        print(f"{label:<22}: 중앙값 {median * 1e6:7.1f} us, p99 {p99 * 1e6:7.1f} us")
+
+    # 디렉토리가 바뀐 뒤에도 목록을 다시 정렬하지 않는지
+    engine.execute('touch file_new.txt')
+    median, p99 = measure(engine, 'cat file_n', options.repeat)
+    print(f"{'파일 추가 직후':<22}: 중앙값 {median * 1e6:7.1f} us, p99 {p99 * 1e6:7.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# 에디터 벤치마크: 큰 로그 파일을 vi로 열고, 줄 이동/삭제/입력을 한 뒤 저장하는 데 걸리는 시간을 잰다.
+# 편집마다 전체 문자열을 다시 만들지 않으므로 파일 크기와 상관없이 밀리초 단위여야 한다.
+#   python benchmarks/bench_editor.py --mb 50 --edits 200
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shell_engine import ShellEngine
+
+
+def timed(engine, command):
+    start = time.perf_counter()
+    result = engine.execute(command)
+    assert not result.stderr, (command, result.stderr)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=50, help='로그 파일 크기 (MB)')
+    parser.add_argument('--edits', type=int, default=200, help='줄 편집 횟수')
+    options = parser.parse_args()
+
+    line = 'INFO request handled in 12ms path=/api/items\n'
+    count = options.mb * (1 << 20) // len(line)
+    engine = ShellEngine()
+    engine.vfs.write_file('/var/log/big.log', line * count)
+
+    print(f"파일 크기         : {options.mb} MB ({count}줄)")
+    print(f"열기 (vi)         : {timed(engine, 'vi /var/log/big.log') * 1000:8.2f} ms")
+
+    random.seed(0)
+    elapsed = []
+    for i in range(options.edits):
+        target = random.randint(1, count)
+        elapsed.append(timed(engine, f':{target}'))
+        if i % 2:
+            elapsed.append(timed(engine, 'dd'))
+        else:
+            elapsed.append(timed(engine, 'o'))
+            elapsed.append(timed(engine, f'edited line {i}'))
+            elapsed.append(timed(engine, '^['))
+    elapsed.sort()
+    print(f"명령 하나 (중앙값): {elapsed[len(elapsed) // 2] * 1000:8.3f} ms")
+    print(f"명령 하나 (최대)  : {elapsed[-1] * 1000:8.3f} ms")
+    print(f"조각 수           : {len(engine.editor_buffer.pieces)}")
+    print(f"저장 (:wq)        : {timed(engine, ':wq') * 1000:8.2f} ms")
+    print(f"wc -l             : {timed(engine, 'wc -l /var/log/big.log') * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# 글롭 확장 벤치마크: 항목 10만 개짜리 디렉토리에서 패턴 종류별 확장 시간을
+# 자식마다 fnmatch를 부르는 단순한 방법과 비교한다.
+#   python benchmarks/bench_glob.py --entries 100000
+import argparse
+import fnmatch
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shell_engine import ShellEngine
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2], len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    options = parser.parse_args()
+
+    engine = ShellEngine()
+    vfs = engine.vfs
+    vfs.create_dir('/big')
+    for i in range(options.entries):
+        vfs.create_file(f'/big/{("app", "db", "web", "cache")[i % 4]}_{i:06d}.{("log", "txt")[i % 2]}')
+    for i in range(100):
+        vfs.create_dir(f'/tree{i}')
+        vfs.create_dir(f'/tree{i}/sub')
+        vfs.create_file(f'/tree{i}/sub/notes.txt')
+    big = vfs._resolve_path('/big')
+
+    cases = ['/big/app_0123*', '/big/web_*.log', '/big/*_00012?.txt', '/big/*.log', '/tree*/sub/notes.txt', '/**/notes.txt']
+    for pattern in cases:
+        median, count = measure(lambda: engine.globber.expand(pattern), options.repeat)
+        line = f"{pattern:<22}: {median * 1000:8.2f} ms ({count}개)"
+        if pattern.startswith('/big/'):
+            name = pattern[len('/big/'):]
+            naive, _ = measure(lambda: [n for n in big.children if fnmatch.fnmatch(n, name)], options.repeat)
+            line += f"  / 자식마다 fnmatch {naive * 1000:8.2f} ms"
+        print(line)
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.execute('ls /big/app_01234*')
+    print(f"명령 전체 (ls /big/app_01234*): {(time.perf_counter() - start):.3f} ms/명령")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# 히스토리 벤치마크: 10^6 개 히스토리에서 Ctrl-R 검색(글자 하나 칠 때마다)이 얼마나 걸리는지,
+# 그리고 모아서 fsync 할 때의 추가 속도를 잰다.
+#   python benchmarks/bench_history.py --entries 1000000
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history
+from history import CommandHistory
+
+TEMPLATES = [
+    'cd /home/user/project{0}',
+    'cat /var/log/app{0}.log | grep error',
+    'ls -l /home/user/data{0}',
+    'vi notes{0}.txt',
+    'find / -name "report{0}*"',
+    'echo "build {0}" >> build.log',
+    'ls',
+    'pwd',
+    'history 20',
+]
+
+
+def make_history(path, entries, unique):
+    rng = random.Random(1)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(entries):
+            template = rng.choice(TEMPLATES)
+            f.write(template.format(rng.randrange(unique)) + '\n')
+
+
+def typing(h, text):
+    # 검색어를 한 글자씩 칠 때마다 첫 결과를 찾는 시간
+    times = []
+    for i in range(1, len(text) + 1):
+        start = time.perf_counter()
+        next(h.search(text[:i]), None)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--entries', type=int, default=1000000)
+    parser.add_argument('--unique', type=int, default=20000, help='템플릿마다 서로 다른 번호 수')
+    parser.add_argument('--appends', type=int, default=2000)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'history')
+        make_history(path, options.entries, options.unique)
+
+        start = time.perf_counter()
+        h = CommandHistory(path, max_size=options.entries)
+        print(f"불러오기 ({len(h)}개)          : {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        next(h.search('cd'), None)
+        print(f"검색 색인 만들기 ({len(h._last_use)}종류) : {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        for query in ['cat /var/log/app1234', 'grep error', 'report99', 'zzz-없음']:
+            times = typing(h, query)
+            print(f"'{query}' 한 글자당 최대 {max(times) * 1000:6.2f} ms, 평균 {sum(times) / len(times) * 1000:6.2f} ms")
+
+        start = time.perf_counter()
+        for i in range(options.appends):
+            h.add(f'echo append {i}')
+        h.sync()
+        batched = (time.perf_counter() - start) / options.appends
+        h.close()
+
+        history.SYNC_EVERY = 1  # 비교: 명령마다 fsync
+        h = CommandHistory(path, max_size=options.entries)
+        start = time.perf_counter()
+        for i in range(options.appends):
+            h.add(f'echo append {i}')
+        each = (time.perf_counter() - start) / options.appends
+        h.close()
+        print(f"추가 (모아서 fsync)     : {batched * 1e6:.1f} us/명령")
+        print(f"추가 (명령마다 fsync)   : {each * 1e6:.1f} us/명령")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# 호스트 폴더 마운트 벤치마크: 큰 실제 파일을 grep/wc로 훑을 때 걸리는 시간과
+# 메모리(최대 RSS)가 파일 크기만큼 늘지 않는지 잰다.
+#   python benchmarks/bench_hostfs.py --mb 200
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shell_engine import ShellEngine
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux는 KiB 단위
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mb', type=int, default=200, help='만들 파일 크기 (MB)')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        line = 'INFO request handled in 12ms path=/api/items\n'
+        count = options.mb * (1 << 20) // len(line)
+        with open(os.path.join(tmp, 'app.log'), 'w') as f:
+            for i in range(0, count, 1000):
+                f.write(line * 999 + f'ERROR failed request {i}\n')
+        for i in range(2000):
+            os.makedirs(os.path.join(tmp, 'tree', f'd{i % 50}'), exist_ok=True)
+            open(os.path.join(tmp, 'tree', f'd{i % 50}', f'f{i}.txt'), 'w').close()
+
+        engine = ShellEngine()
+        result = engine.execute(f'mount {tmp} /host')
+        assert not result.stderr, result.stderr
+        rss = peak_rss_mb()
+
+        for command in ['ls /host', 'wc -l /host/app.log', 'grep -c ERROR /host/app.log',
+                        'head -n 3 /host/app.log', 'find /host -name "f19*"']:
+            start = time.perf_counter()
+            result = engine.execute(command)
+            elapsed = time.perf_counter() - start
+            print(f"{command:<32}: {elapsed * 1000:8.1f} ms  (출력 {len(result.stdout)}줄)")
+        print(f"파일 크기               : {options.mb} MB")
+        print(f"최대 RSS 증가           : {peak_rss_mb() - rss:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
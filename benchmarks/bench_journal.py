@@ -0,0 +1,63 @@
+# 자동 저장 비용 벤치마크: 큰 트리에서 명령 하나를 저널에 남기는 비용과
+# 트리 전체를 스냅샷으로 다시 쓰는 비용, 그리고 다시 시작할 때 되살리는 시간을 비교한다.
+#   python benchmarks/bench_journal.py --files 100000 --commands 2000
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from journal import open_state
+from shell_engine import ShellEngine
+from snapshot import save_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--commands', type=int, default=2000)
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = os.path.join(tmp, 'state')
+        engine = ShellEngine(open_state(state))
+        vfs = engine.vfs
+        journal, vfs.journal = vfs.journal, None  # 트리 만드는 부분은 기록하지 않는다
+        for i in range(options.files):
+            if i % 1000 == 0:
+                vfs.create_dir(f'/data/d{i // 1000}' if i else '/data')
+                vfs.create_dir(f'/data/d{i // 1000}')
+            vfs.write_file(f'/data/d{i // 1000}/f{i}.txt', f'file {i}\n')
+        vfs.journal = journal
+
+        start = time.perf_counter()
+        save_snapshot(vfs, os.path.join(tmp, 'full.snap'))
+        full = time.perf_counter() - start
+
+        commands = ['mkdir /work', 'cd /work']
+        for i in range(options.commands):
+            commands.append(('touch f{0}', 'echo hello {0} > f{0}', 'cp f{0} g{0}', 'mv g{0} h{0}',
+                             'rm h{0}')[i % 5].format(i // 5))
+        start = time.perf_counter()
+        for command in commands:
+            engine.execute(command)
+        journaled = time.perf_counter() - start
+        vfs.journal.close()
+
+        start = time.perf_counter()
+        engine.vfs.journal = None
+        os.remove(os.path.join(tmp, 'full.snap'))
+        restored = open_state(state)
+        reopen = time.perf_counter() - start
+        restored.journal.close()
+
+        print(f"트리 크기               : 파일 {vfs.root.nfiles}개")
+        print(f"전체 스냅샷 한 번       : {full * 1000:8.1f} ms")
+        print(f"명령 + 저널 기록        : {journaled / len(commands) * 1e6:8.1f} us/명령")
+        print(f"다시 시작 (저널 재실행) : {reopen * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
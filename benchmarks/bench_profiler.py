@@ -0,0 +1,45 @@
+# 성능 측정 비용 벤치마크: 같은 명령들을 측정 끔 / perfstat on / perfstat mem / --trace 상태로 실행해
+# 명령 하나에 드는 평균 시간을 비교한다 (꺼져 있을 때 측정 전과 차이가 거의 없어야 한다).
+#   python benchmarks/bench_profiler.py --runs 20000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shell_engine import ShellEngine
+
+COMMANDS = ['ls /', 'pwd', 'cat /etc/passwd | grep root', 'touch /home/user/a.txt', 'rm /home/user/a.txt']
+
+
+def measure(engine, runs):
+    start = time.perf_counter()
+    for i in range(runs):
+        engine.execute(COMMANDS[i % len(COMMANDS)])
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=20000, help='상태마다 실행할 명령 수')
+    options = parser.parse_args()
+
+    for name in ['끔', 'perfstat on', 'perfstat mem', '--trace']:
+        engine = ShellEngine()
+        profiler = engine.profiler
+        if name == 'perfstat on':
+            profiler.enable()
+        elif name == 'perfstat mem':
+            profiler.enable(memory=True)
+        elif name == '--trace':
+            profiler.start_trace(engine.vfs)
+        measure(engine, 1000)  # 파싱 캐시 등을 먼저 채운다
+        per_command = measure(engine, options.runs)
+        print(f"{name:<14} 명령당 {per_command * 1e6:8.1f} us  (추적 이벤트 {len(profiler.events)}개)")
+        profiler.disable()
+        profiler.stop_trace()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# 기록 재실행 벤치마크: 기본 이미지(파일 --files개)와 기록 --transcripts개(기록마다 명령 --commands개)를 만들고
+# 작업 프로세스 수를 1, 2, 4, ... 코어 수까지 늘려 가며 초당 재실행한 기록 수와 1개일 때 대비 배율을 잰다.
+#   python benchmarks/bench_replay.py --transcripts 2000 --commands 50 --files 100000
+# 시작 전에 재실행한 grep -r이 작업 프로세스 안에서 다시 프로세스 풀을 만들지 않는지도 확인한다.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parallel_grep
+from replay import ReplayWorker, replay_all, transcripts
+from snapshot import save_snapshot
+from vfs import VirtualFileSystem
+
+SESSION = [
+    'mkdir -p lab', 'cd /home/user', 'mkdir lab{n}', 'cd lab{n}', 'touch notes.txt', 'echo "day {n}" > notes.txt',
+    'cat notes.txt', 'ls -l', 'cp -r /data /home/user/lab{n}/copy', 'ls copy', 'find copy -name "f1*"',
+    'grep -c 7 /data/d0/f{n}.txt', 'cat /etc/passwd | grep root | wc -l', 'rm notes.txt', 'cd ..', 'du -s /home',
+]
+
+
+def check_single_process(tmp):
+    # 병렬 검색을 쓸 만큼 큰 내용에 grep -r을 해도 재실행 작업 프로세스는 자기 프로세스에서만 찾아야 한다
+    # (작업 프로세스마다 grep 풀을 만들면 코어를 몇 배로 나눠 쓰게 된다). 코어가 하나인 컴퓨터에서도
+    # 확인이 되도록 잠시 코어가 여러 개인 것처럼 한다.
+    base = VirtualFileSystem()
+    base.create_dir('/data')
+    base.write_file('/data/big.log', 'ok\nERROR x\n' * (parallel_grep.PARALLEL_BYTES // 10 + 1))
+    image = os.path.join(tmp, 'big.snap')
+    save_snapshot(base, image)
+    path = os.path.join(tmp, 'grep.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('grep -r -c ERROR /data\n')
+    workers, parallel_grep.workers = parallel_grep.workers, lambda: 4
+    try:
+        record = ReplayWorker(image).replay(path)
+    finally:
+        parallel_grep.workers = workers
+    assert parallel_grep._pool is None, '재실행한 grep -r이 프로세스 풀을 만들었습니다'
+    assert record['errors'] == 0, record
+    print("재실행한 grep -r: 한 프로세스에서 실행 (확인)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transcripts', type=int, default=2000)
+    parser.add_argument('--commands', type=int, default=50, help='기록 하나의 명령 수')
+    parser.add_argument('--files', type=int, default=100000, help='기본 이미지의 파일 수')
+    parser.add_argument('--max-jobs', type=int, default=os.cpu_count() or 1, help='늘려 볼 최대 작업 프로세스 수')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        check_single_process(tmp)
+        base = VirtualFileSystem()
+        for i in range(options.files):
+            if i % 1000 == 0:
+                base.create_dir(f'/data/d{i // 1000}' if i else '/data')
+                if not i:
+                    base.create_dir('/data/d0')
+            base.write_file(f'/data/d{i // 1000}/f{i % 1000}.txt', f'line {i}\n' * 8)
+        image = os.path.join(tmp, 'base.snap')
+        save_snapshot(base, image)
+        folder = os.path.join(tmp, 'transcripts')
+        os.mkdir(folder)
+        for t in range(options.transcripts):
+            lines = [SESSION[i % len(SESSION)].format(n=t % 1000) for i in range(options.commands)]
+            with open(os.path.join(folder, f'student{t:05}.txt'), 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+        paths = transcripts(folder)
+
+        cores = options.max_jobs
+        jobs = 1
+        single = None
+        expected = None
+        while True:
+            start = time.perf_counter()
+            results = list(replay_all(paths, image, jobs))
+            # 작업 프로세스 수와 상관없이 결과(트리 해시, 출력 해시)는 같아야 한다
+            digests = [(r['tree'], r['outputs']) for r in results]
+            assert expected is None or digests == expected
+            expected = digests
+            elapsed = time.perf_counter() - start
+            rate = len(results) / elapsed
+            single = single or rate
+            print(f"작업 프로세스 {jobs:3}개: {rate:8.1f} 기록/초  (1개 대비 {rate / single:4.2f}배, "
+                  f"명령당 {elapsed / (len(results) * options.commands) * 1e6:6.1f} us)")
+            if jobs >= cores:
+                break
+            jobs = min(jobs * 2, cores)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+# 명령 실행기 벤치마크: 긴 명령(큰 파일 grep, 파일을 많이 만드는 스크립트)을 실행하는 동안
+# 화면 타이머(16ms)가 얼마나 늦게 불리는지(가장 긴 멈춤)를 직접 실행과 작업 스레드 실행으로 비교하고,
+# Ctrl-C를 누른 뒤 명령이 멈출 때까지 걸리는 시간을 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_runner.py --lines 2000000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QTreeView
+
+from command_runner import CommandRunner
+from shell_engine import ShellEngine
+from tree_model import VfsTreeModel
+
+FRAME_MS = 16
+
+
+class StallMeter:
+    # 화면 타이머가 불린 간격 중 가장 긴 것
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.last = None
+        self.worst = 0.0
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.worst = 0.0
+        self.timer.start(FRAME_MS)
+
+    def tick(self):
+        now = time.perf_counter()
+        self.worst = max(self.worst, now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.tick()
+        self.timer.stop()
+        return self.worst
+
+
+def run_async(runner, command, cancel_after=None):
+    # 이벤트 루프를 돌리며 끝날 때까지 기다린다. (걸린 시간, 결과, 받은 출력 묶음 수, Ctrl-C 뒤 멈출 때까지 걸린 시간)
+    loop = QEventLoop()
+    done = []
+    batches = []
+    cancelled_at = []
+
+    def finished(result):
+        done.append(result)
+        loop.quit()
+
+    def cancel():
+        cancelled_at.append(time.perf_counter())
+        runner.cancel()
+
+    runner.finished.connect(finished)
+    runner.output.connect(batches.append)
+    start = time.perf_counter()
+    runner.submit(command)
+    if cancel_after is not None:
+        QTimer.singleShot(int(cancel_after * 1000), cancel)
+    loop.exec_()
+    elapsed = time.perf_counter() - start
+    runner.finished.disconnect(finished)
+    runner.output.disconnect(batches.append)
+    stop = time.perf_counter() - cancelled_at[0] if cancelled_at else None
+    return elapsed, done[0], len(batches), stop
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=2000000, help='grep할 파일의 줄 수')
+    parser.add_argument('--files', type=int, default=3000, help='스크립트가 만들 파일 수')
+    options = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    engine = ShellEngine()
+    engine.vfs.write_file('/var/log/big.log', 'INFO request handled path=/api/items\n' * options.lines)
+    engine.vfs.write_file('/home/user/make.sh', ''.join(f'touch /home/user/f{i}.txt\n' for i in range(options.files)))
+    model = VfsTreeModel(engine.vfs)
+    view = QTreeView()
+    view.setModel(model)
+    view.resize(400, 600)
+    view.show()
+    app.processEvents()
+    home = model.index(2, 0)  # /home 펼치기 (스크립트가 만든 파일이 트리에 들어간다)
+    view.expand(home)
+    app.processEvents()
+    runner = CommandRunner(engine)
+    meter = StallMeter()
+
+    for command in ['grep -c ERROR /var/log/big.log', 'cat /var/log/big.log', 'bash /home/user/make.sh']:
+        meter.start()
+        start = time.perf_counter()
+        result = engine.execute(command)
+        sync_elapsed = time.perf_counter() - start
+        app.processEvents()
+        sync_stall = meter.stop()
+        engine.execute('rm /home/user/f*.txt')
+        app.processEvents()
+
+        meter.start()
+        elapsed, result, batches, stop = run_async(runner, command)
+        async_stall = meter.stop()
+        assert not result.stderr, result.stderr
+        print(f"{command:<32} 직접: {sync_elapsed * 1000:7.0f} ms (가장 긴 멈춤 {sync_stall * 1000:6.0f} ms)"
+              f"  작업 스레드: {elapsed * 1000:7.0f} ms (가장 긴 멈춤 {async_stall * 1000:4.0f} ms, 출력 {batches}번)")
+        engine.execute('rm /home/user/f*.txt')
+        app.processEvents()
+
+    elapsed, result, batches, stop = run_async(runner, 'grep -c ERROR /var/log/big.log', cancel_after=0.1)
+    print(f"Ctrl-C 뒤 멈출 때까지: {stop * 1000:.1f} ms ({result.stderr})")
+
+    # top -b는 화면 사이에 -d초 기다린다. 기다리는 중에도 Ctrl-C로 곧바로 멈춰야 한다
+    elapsed, result, batches, stop = run_async(runner, 'top -b -n 4 -d 1', cancel_after=0.3)
+    print(f"top -b Ctrl-C 뒤 멈출 때까지: {stop * 1000:.1f} ms ({result.stderr})")
+    assert stop < 0.1, stop
+
+
+if __name__ == '__main__':
+    main()
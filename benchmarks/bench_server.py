@@ -0,0 +1,130 @@
+# 다중 세션 서버 벤치마크: 동시 세션 N개에서 sessions/GB 와 commands/sec 를 잰다.
+# 서버는 이 프로세스에서, 클라이언트 흉내는 별도 프로세스에서 돌린다.
+#   python benchmarks/bench_server.py --sessions 1000 --rounds 20
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from server import SimulatorServer, rss_bytes
+from vfs import VirtualFileSystem
+
+# 세션마다 돌리는 명령 (읽기 위주 + 일부 쓰기)
+SCRIPT = [
+    'pwd',
+    'ls /home/user',
+    'cd /home/user',
+    'cat hello.txt',
+    'mkdir work',
+    'touch work/notes.txt',
+    'echo "lab {n}" > work/notes.txt',
+    'cat work/notes.txt | wc -l',
+    'ls -l /lab/d1',
+    'cat /lab/d3/f7.txt',
+    'cp -r /lab/d2 work/copy',
+    'echo more >> work/copy/f1.txt',
+    'find /lab/d4 -name "f1*"',
+    'du -s /lab',
+    'history | tail -n 3',
+]
+
+
+def build_base(dirs, files):
+    base = VirtualFileSystem()
+    base.create_dir('/lab')
+    for i in range(dirs):
+        base.create_dir(f'/lab/d{i}')
+        for j in range(files):
+            base.write_file(f'/lab/d{i}/f{j}.txt', f'dataset {i} row {j}\n' * 20)
+    return base
+
+
+async def read_response(reader):
+    lines = []
+    while True:
+        line = (await reader.readline()).decode('utf-8')
+        if not line:
+            raise ConnectionError('서버 연결이 끊어졌습니다')
+        if line.startswith('= '):
+            return lines
+        lines.append(line)
+
+
+async def client_main(path, sessions, rounds):
+    connections = []
+    for _ in range(sessions):
+        reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+        await reader.readline()  # 인사 줄
+        connections.append((reader, writer))
+
+    async def run_one(index, reader, writer):
+        for r in range(rounds):
+            command = SCRIPT[r % len(SCRIPT)].replace('{n}', str(index))
+            writer.write((command + '\n').encode('utf-8'))
+            await read_response(reader)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(i, r, w) for i, (r, w) in enumerate(connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = connections[0]
+    writer.write(b'%sessions\n')
+    summary = (await read_response(reader))[0][2:].strip()
+    for reader, writer in connections:
+        writer.close()
+    print(json.dumps({'elapsed': elapsed, 'commands': sessions * rounds, 'summary': summary}))
+
+
+async def server_main(options):
+    base = build_base(options.dirs, options.files)
+    server = SimulatorServer(base)
+    server.base_index.build()
+    rss_before = rss_bytes()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sim.sock')
+        listener = await server.start(unix_path=path)
+        client = await asyncio.create_subprocess_exec(
+            sys.executable, os.path.abspath(__file__), '--client', path,
+            '--sessions', str(options.sessions), '--rounds', str(options.rounds),
+            stdout=asyncio.subprocess.PIPE)
+        out, _ = await client.communicate()
+        listener.close()
+        await listener.wait_closed()
+
+    result = json.loads(out.decode('utf-8'))
+    fields = dict(item.split('=') for item in result['summary'].split())
+    rss_delta = int(fields['rss_bytes']) - rss_before
+    estimated = int(fields['estimated_bytes'])
+    per_session = max(rss_delta, 1) / options.sessions
+    print(f"base image       : {options.dirs * options.files} files, RSS {rss_before / 2**20:.1f} MB")
+    print(f"sessions         : {fields['sessions']}")
+    print(f"commands/sec     : {result['commands'] / result['elapsed']:.0f} "
+          f"({result['commands']} commands in {result['elapsed']:.2f} s)")
+    print(f"RSS growth       : {rss_delta / 2**20:.1f} MB ({per_session / 1024:.1f} KB/session)")
+    print(f"estimated (acct) : {estimated / 2**20:.1f} MB ({estimated / options.sessions / 1024:.1f} KB/session)")
+    print(f"sessions/GB      : {2**30 / per_session:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--dirs', type=int, default=50, help='기본 이미지 /lab 아래 디렉토리 수')
+    parser.add_argument('--files', type=int, default=200, help='디렉토리마다 파일 수')
+    parser.add_argument('--client', metavar='SOCKET', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    if options.client:
+        asyncio.run(client_main(options.client, options.sessions, options.rounds))
+    else:
+        asyncio.run(server_main(options))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# 시작 시간 벤치마크: linux_simulator.py --profile-startup을 여러 번 새 프로세스로 실행해
+# 단계별(모듈 불러오기, 파일 시스템 복원, Qt 시작, 창 만들기, 첫 화면 그리기) 중앙값과 첫 프롬프트까지의 시간을 잰다.
+# 실습실 PC처럼 히스토리 파일이 크고 상태 폴더가 있는 경우로 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py --runs 10 --history 100000
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASE = re.compile(r'^\s+(.+?): ([\d.]+) ms')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--history', type=int, default=100000, help='히스토리 파일의 명령 수')
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = os.path.join(tmp, 'history')
+        with open(history, 'w', encoding='utf-8') as f:
+            f.write(''.join(f'grep -c ERROR /var/log/app{i % 100}.log\n' for i in range(options.history)))
+        command = [sys.executable, os.path.join(ROOT, 'linux_simulator.py'), '--profile-startup',
+                   '--state', os.path.join(tmp, 'state'), '--history', history]
+        subprocess.run(command, capture_output=True)  # 상태 폴더를 만들고 .pyc를 채운다
+        phases = {}
+        process = []
+        for _ in range(options.runs):
+            start = time.perf_counter()
+            output = subprocess.run(command, capture_output=True, text=True).stderr
+            process.append((time.perf_counter() - start) * 1000)
+            for line in output.splitlines():
+                match = PHASE.match(line)
+                if match:
+                    phases.setdefault(match.group(1), []).append(float(match.group(2)))
+    if not phases:
+        sys.exit("--profile-startup 보고를 찾지 못했습니다 (QT_QPA_PLATFORM=offscreen 확인)")
+    for name, values in phases.items():
+        print(f"{name:<20} 중앙값 {statistics.median(values):7.1f} ms")
+    print(f"{'프로세스 전체':<20} 중앙값 {statistics.median(process):7.1f} ms (파이썬 시작과 종료 포함)")
+
+
+if __name__ == '__main__':
+    main()
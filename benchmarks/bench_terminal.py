@@ -0,0 +1,64 @@
+# 터미널 스크롤백 벤치마크: 10^6 줄을 출력하면서 줄당 시간과 메모리 상한을 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_terminal.py --lines 1000000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+from terminal_view import TerminalOutput
+
+
+def rss_mb():
+    # 현재 RSS (리눅스 /proc 기준, 없으면 최대 RSS로 대체)
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=1000000)
+    parser.add_argument('--per-command', type=int, default=100, help='명령 하나가 출력하는 줄 수')
+    parser.add_argument('--scrollback', type=int, default=10000)
+    options = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    view = TerminalOutput(scrollback=options.scrollback)
+    view.resize(800, 400)
+    view.show()
+    app.processEvents()
+
+    line = 'drwxr-xr-x  user user  4096 2024-01-01 12:00 some_directory_name'
+    batch = [line] * options.per_command
+    start_rss = rss_mb()
+    peak_rss = start_rss
+    written = 0
+    start = time.perf_counter()
+    while written < options.lines:
+        view.extend(batch)
+        app.processEvents()  # 이벤트 루프 한 틱 = flush 한 번
+        written += len(batch)
+        if written % (options.per_command * 1000) == 0:
+            peak_rss = max(peak_rss, rss_mb())
+    elapsed = time.perf_counter() - start
+    peak_rss = max(peak_rss, rss_mb())
+
+    print(f"lines            : {written}")
+    print(f"scrollback limit : {view.scrollback()} (blocks kept: {view.blockCount()})")
+    print(f"time per line    : {elapsed / written * 1e6:.2f} us")
+    print(f"total time       : {elapsed:.2f} s")
+    print(f"RSS start/peak   : {start_rss:.1f} MB / {peak_rss:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
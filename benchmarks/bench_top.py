@@ -0,0 +1,49 @@
+# top 표본 비용 벤치마크: PID 수백 개에서 틱 한 번(/proc 읽기 + 화면 만들기)이 몇 ms인지 잰다.
+#   python benchmarks/bench_top.py --procs 500 --ticks 50
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from proc_sampler import ProcSampler
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--procs', type=int, default=500, help='추가로 띄울 잠자는 프로세스 수')
+    parser.add_argument('--ticks', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=20)
+    options = parser.parse_args()
+
+    if not ProcSampler.available():
+        print("/proc이 없는 환경에서는 잴 수 없습니다.")
+        return
+
+    children = [subprocess.Popen(['sleep', '600']) for _ in range(options.procs)]
+    try:
+        sampler = ProcSampler()
+        sampler.frame(rows=options.rows)  # 첫 표본 (이전 값 캐시 채우기)
+        times = []
+        for _ in range(options.ticks):
+            start = time.perf_counter()
+            sampler.frame(rows=options.rows)
+            times.append(time.perf_counter() - start)
+        pids = len(sampler._prev_ticks)
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+    times.sort()
+    print(f"PID 수        : {pids}")
+    print(f"틱당 평균     : {sum(times) / len(times) * 1000:.2f} ms")
+    print(f"틱당 p95      : {times[int(len(times) * 0.95) - 1] * 1000:.2f} ms")
+    print(f"PID당         : {sum(times) / len(times) / pids * 1e6:.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# 폴더 트리 모델 벤치마크: 노드 10만 개짜리 트리를 뷰에 붙이고 몇 개 디렉토리를 펼친 상태에서
+# 스크립트가 초당 1000번 변경할 때, 변경 하나와 화면 한 장(16ms 동안의 변경을 반영)이 얼마나 걸리는지 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_tree_model.py --nodes 100000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QTreeView
+
+from shell_engine import ShellEngine
+from tree_model import VfsTreeModel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--nodes', type=int, default=100000)
+    parser.add_argument('--mutations', type=int, default=1000)
+    parser.add_argument('--rate', type=int, default=1000, help='초당 변경 수')
+    options = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    engine = ShellEngine()
+    vfs = engine.vfs
+    per_dir = 1000
+    for i in range(options.nodes):
+        if i % per_dir == 0:
+            vfs.create_dir(f'/data{i // per_dir}')
+        vfs.create_file(f'/data{i // per_dir}/file_{i:06d}.txt')
+
+    model = VfsTreeModel(vfs)
+    view = QTreeView()
+    view.setUniformRowHeights(True)
+    view.setModel(model)
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+    for row in range(3):  # 디렉토리 몇 개를 펼쳐 둔다 (변경이 보이는 줄에 일어나도록)
+        view.expand(model.index(row, 0))
+    app.processEvents()
+
+    # 초당 options.rate번 변경하면서 화면 한 장(16ms)마다 이벤트를 처리한다
+    commands = [('touch /data0/new_{0}.txt', 'rm /data0/file_{1:06d}.txt', 'mv /data1/file_{2:06d}.txt /data2/',
+                 'echo hello > /data0/new_{0}.txt', 'mkdir /data0/dir_{0}')[i % 5].format(i, i, per_dir + i)
+                for i in range(options.mutations)]
+    per_frame = max(1, options.rate * 16 // 1000)
+    updates = []
+    frames = []
+    for start_at in range(0, len(commands), per_frame):
+        for command in commands[start_at:start_at + per_frame]:
+            start = time.perf_counter()
+            engine.execute(command)
+            updates.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        app.processEvents()
+        frames.append(time.perf_counter() - start)
+
+    print(f"노드 수                 : {vfs.root.nfiles + vfs.root.ndirs}")
+    print(f"변경 하나 (명령 + 알림) : {summary(updates)}")
+    print(f"화면 한 장 ({per_frame}개 변경) : {summary(frames)}")
+
+
+def summary(times):
+    times = sorted(times)
+    return (f"중앙값 {times[len(times) // 2] * 1000:.2f} ms, p99 {times[int(len(times) * 0.99) - 1] * 1000:.2f} ms, "
+            f"최대 {times[-1] * 1000:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+# 벤치마크 모음: 폭(breadth), 깊이(depth), 파일 크기로 만든 가상 트리(최대 10^6 노드)에서
+# 경로 찾기(cd), ls, cat, touch/rm, find, 창에서의 명령 처리량, 큰 출력을 터미널에 그리는 비용과 최대 RSS를 재어
+# JSON으로 남기고, 기준(baseline) 결과와 비교해 정해진 비율 이상 느려진 항목을 알려 준다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/suite.py run --out baseline.json
+#   QT_QPA_PLATFORM=offscreen python benchmarks/suite.py run --out new.json --baseline baseline.json
+#   python benchmarks/suite.py run --breadth 10 --depth 6 --no-gui      # 약 10^6 노드
+#   python benchmarks/suite.py compare baseline.json new.json --threshold 0.2
+# 모든 값은 작을수록 좋다 (시간, 메모리). 느려진 항목이 있으면 종료 코드 1.
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from shell_engine import ShellEngine
+
+ROOT = '/bench'
+SAMPLE_PATHS = 200  # cd/ls/cat에 쓸 무작위 경로 수
+MIN_SECONDS = 1e-6  # 이보다 짧은 값은 비교하지 않는다 (측정 잡음)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def build_tree(vfs, breadth, depth, file_size):
+    # ROOT 아래에 폭 breadth, 깊이 depth인 트리를 만든다. 마지막 단계는 file_size바이트짜리 파일.
+    # (디렉토리 목록, 파일 목록)을 돌려준다
+    line = 'x' * 63 + '\n'
+    content = line * (file_size // len(line)) + 'x' * (file_size % len(line))
+    vfs.create_dir(ROOT)
+    dirs = []
+    files = []
+    level = [ROOT]
+    for step in range(depth):
+        last = step == depth - 1
+        below = []
+        for parent in level:
+            for i in range(breadth):
+                path = f"{parent}/{'f' if last else 'd'}{i}"
+                if last:
+                    vfs.write_file(path, content)
+                    files.append(path)
+                else:
+                    vfs.create_dir(path)
+                    below.append(path)
+        dirs.extend(below)
+        level = below
+    return dirs, files
+
+
+def per_call(engine, commands):
+    # 명령들을 차례로 실행하고 명령당 평균 시간(초). 오류가 나면 측정이 잘못된 것이므로 멈춘다
+    execute = engine.execute
+    start = time.perf_counter()
+    for command in commands:
+        result = execute(command)
+        if result.status and result.stderr:
+            raise RuntimeError(f"{command}: {result.stderr}")
+    return (time.perf_counter() - start) / len(commands)
+
+
+def engine_cases(engine, dirs, files, rng):
+    results = {}
+    sample_dirs = [rng.choice(dirs) for _ in range(SAMPLE_PATHS)] if dirs else [ROOT]
+    sample_files = [rng.choice(files) for _ in range(SAMPLE_PATHS)]
+    results['cd_us'] = per_call(engine, [f'cd {path}' for path in sample_dirs]) * 1e6
+    engine.execute('cd /')
+    results['ls_us'] = per_call(engine, [f'ls {path}' for path in sample_dirs]) * 1e6
+    results['ls_l_us'] = per_call(engine, [f'ls -l {path}' for path in sample_dirs]) * 1e6
+    results['cat_us'] = per_call(engine, [f'cat {path}' for path in sample_files]) * 1e6
+    results['grep_c_us'] = per_call(engine, [f'grep -c y {path}' for path in sample_files]) * 1e6
+    new_files = [f'{path}/new{i}.txt' for i, path in enumerate(sample_dirs or [ROOT])]
+    results['touch_us'] = per_call(engine, [f'touch {path}' for path in new_files]) * 1e6
+    results['rm_us'] = per_call(engine, [f'rm {path}' for path in new_files]) * 1e6
+    results['find_name_ms'] = per_call(engine, [f'find {ROOT} -name f0']) * 1e3
+    results['du_s_ms'] = per_call(engine, [f'du -s {ROOT}']) * 1e3
+    return results
+
+
+def gui_cases(engine, dirs, commands, render_lines):
+    # 창을 띄우고(offscreen) 입력 줄로 명령을 넣어 작업 스레드 실행, 출력 그리기까지 끝나는 데 걸린 시간
+    from PyQt5.QtWidgets import QApplication
+
+    from linux_simulator import LinuxSimulator
+    from terminal_view import TerminalOutput
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    window = LinuxSimulator(vfs=engine.vfs)
+    window.show()
+    app.processEvents()
+
+    def run(lines):
+        start = time.perf_counter()
+        for line in lines:
+            window.command_input.setText(line)
+            window.execute_command()
+        while window.runner.busy:
+            app.processEvents()
+        app.processEvents()
+        return time.perf_counter() - start
+
+    sample = [f'ls {dirs[i % len(dirs)]}' if dirs and i % 2 else 'pwd' for i in range(commands)]
+    results['gui_dispatch_us'] = run(sample) / commands * 1e6
+    engine.vfs.write_file('/tmp/render.txt', 'drwxr-xr-x  user user  4096 2024-01-01 12:00 name\n' * render_lines)
+    results['gui_cat_render_ms'] = run(['cat /tmp/render.txt']) * 1e3
+    engine.vfs.remove('/tmp/render.txt')
+    window.runner.wait()
+    window.close()
+
+    # 터미널 위젯만: 큰 출력을 한 번에 넣고 그리는 비용
+    view = TerminalOutput()
+    view.resize(800, 400)
+    view.show()
+    app.processEvents()
+    batch = ['drwxr-xr-x  user user  4096 2024-01-01 12:00 name'] * render_lines
+    start = time.perf_counter()
+    view.extend(batch)
+    view.flush()
+    app.processEvents()
+    results['render_ms'] = (time.perf_counter() - start) * 1e3
+    # 스크롤백이 가득 찬 뒤: 넣을 때마다 오래된 줄을 버려야 한다 (명령 출력이 조금씩 올 때와 같은 경우)
+    start = time.perf_counter()
+    for i in range(0, render_lines, 5000):
+        view.extend(batch[i:i + 5000])
+        view.flush()
+    app.processEvents()
+    results['render_full_ms'] = (time.perf_counter() - start) * 1e3
+    view.close()
+    return results
+
+
+def run(options):
+    rng = random.Random(options.seed)
+    engine = ShellEngine()
+    vfs = engine.vfs
+    if 'tmp' not in vfs.list_dir('/'):
+        vfs.create_dir('/tmp')
+    start = time.perf_counter()
+    dirs, files = build_tree(vfs, options.breadth, options.depth, options.file_size)
+    results = {'build_tree_s': time.perf_counter() - start}
+    results.update(engine_cases(engine, dirs, files, rng))
+    if not options.no_gui:
+        results.update(gui_cases(engine, dirs, options.gui_commands, options.render_lines))
+    peak = peak_rss_mb()
+    if peak is not None:
+        results['peak_rss_mb'] = peak
+    return {
+        'params': {'breadth': options.breadth, 'depth': options.depth, 'file_size': options.file_size,
+                   'nodes': len(dirs) + len(files), 'gui': not options.no_gui,
+                   'gui_commands': options.gui_commands, 'render_lines': options.render_lines,
+                   'seed': options.seed},
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+
+
+def compare(base, new, threshold):
+    # 느려진 항목 이름 목록과 비교 표
+    lines = []
+    if base.get('params') != new.get('params'):
+        lines.append(f"주의: 측정 조건이 다릅니다 ({base.get('params')} / {new.get('params')})")
+    lines.append(f"{'METRIC':<20}{'BASELINE':>12}{'RESULT':>12}{'CHANGE':>9}")  # 한글은 두 칸이라 머리글은 영어로
+    regressions = []
+    for name, old in base['results'].items():
+        value = new['results'].get(name)
+        if value is None:
+            continue
+        change = (value - old) / old if old > MIN_SECONDS else 0.0
+        mark = ''
+        if change > threshold:
+            mark = '  느려짐'
+            regressions.append(name)
+        elif change < -threshold:
+            mark = '  빨라짐'
+        lines.append(f"{name:<20}{old:>12.2f}{value:>12.2f}{change * 100:>8.1f}%{mark}")
+    return regressions, lines
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def report(regressions, lines, threshold):
+    print('\n'.join(lines))
+    if regressions:
+        print(f"{threshold * 100:.0f}% 넘게 느려진 항목: {', '.join(regressions)}")
+        return 1
+    print(f"{threshold * 100:.0f}% 넘게 느려진 항목이 없습니다.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가상 파일 시스템, 명령 실행, 터미널 그리기 벤치마크 모음')
+    commands = parser.add_subparsers(dest='action', required=True)
+    run_parser = commands.add_parser('run', help='벤치마크를 실행해 JSON으로 저장')
+    run_parser.add_argument('--breadth', type=int, default=10, help='디렉토리마다 자식 수')
+    run_parser.add_argument('--depth', type=int, default=4, help='트리 깊이 (마지막 단계는 파일)')
+    run_parser.add_argument('--file-size', type=int, default=4096, help='파일 하나의 크기 (바이트)')
+    run_parser.add_argument('--gui-commands', type=int, default=500, help='창에서 실행할 명령 수')
+    run_parser.add_argument('--render-lines', type=int, default=100000, help='터미널에 그릴 출력 줄 수')
+    run_parser.add_argument('--no-gui', action='store_true', help='창(Qt)을 쓰는 항목은 건너뛴다')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--out', metavar='PATH', help='결과 JSON을 저장할 파일')
+    run_parser.add_argument('--baseline', metavar='PATH', help='실행 뒤 이 결과와 비교')
+    run_parser.add_argument('--threshold', type=float, default=0.2, help='이 비율 넘게 느려지면 실패 (0.2 = 20%%)')
+    compare_parser = commands.add_parser('compare', help='두 결과 JSON 비교')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('result')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='이 비율 넘게 느려지면 실패 (0.2 = 20%%)')
+    options = parser.parse_args()
+
+    if options.action == 'compare':
+        return report(*compare(load(options.baseline), load(options.result), options.threshold), options.threshold)
+
+    result = run(options)
+    if options.out:
+        with open(options.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if options.baseline:
+        return report(*compare(load(options.baseline), result, options.threshold), options.threshold)
+    print(f"노드 {result['params']['nodes']}개")
+    for name, value in result['results'].items():
+        print(f"{name:<20}{value:>12.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
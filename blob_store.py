@@ -0,0 +1,187 @@
+import threading
+import zlib
+
+# 파일 내용 저장소 (내용 주소 방식).
+# 큰 파일 내용은 노드마다 str로 갖지 않고 내용 해시로 찾는 blob 하나를 참조한다.
+# 같은 내용을 여러 파일/세션이 써도 blob은 하나이고, 참조(BlobContent)가 모두 사라지면 저장소에서도 지운다.
+# 큰 blob은 압축해 두고, cat/grep(iter_lines)은 덩어리 단위로 풀면서 줄을 흘려보낸다.
+# read_file(노드 content)은 읽을 때마다 풀어 주고 노드에 풀어 둔 str을 남기지 않는다.
+STORE_MIN_BYTES = 4096  # 이보다 작은 내용은 그냥 노드에 str로 둔다 (해시 비용이 더 크다)
+COMPRESS_MIN_BYTES = 64 * 1024  # 이보다 큰 blob은 압축한다
+COMPRESS_MAX_RATIO = 0.9  # 압축해도 이 비율 넘게 남으면 압축하지 않고 둔다
+CHUNK_SIZE = 1 << 18  # 압축을 풀 때 한 번에 넣고 꺼내는 크기
+DIGEST_BYTES = 20
+CODECS = ('zlib', 'lzma')
+
+
+def _compress(codec, raw):
+    if codec == 'lzma':
+        import lzma  # 압축률이 필요할 때만 (느리다)
+        return lzma.compress(raw, preset=6)
+    return zlib.compress(raw, 6)
+
+
+def _decompress(codec, data):
+    if codec == 'lzma':
+        import lzma
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+def _chunks(codec, data):
+    # 압축된 data를 풀면서 CHUNK_SIZE 이하의 바이트 덩어리로 내준다 (전체를 한 번에 풀지 않음)
+    view = memoryview(data)
+    if codec == 'lzma':
+        import lzma
+        decompressor = lzma.LZMADecompressor()
+        for start in range(0, len(view), CHUNK_SIZE):
+            yield decompressor.decompress(view[start:start + CHUNK_SIZE], CHUNK_SIZE)
+            while not decompressor.needs_input and not decompressor.eof:
+                yield decompressor.decompress(b'', CHUNK_SIZE)
+        return
+    decompressor = zlib.decompressobj()
+    for start in range(0, len(view), CHUNK_SIZE):
+        pending = view[start:start + CHUNK_SIZE]
+        while pending:
+            yield decompressor.decompress(pending, CHUNK_SIZE)
+            pending = decompressor.unconsumed_tail
+    yield decompressor.flush()
+
+
+class Blob:
+    # 저장소 항목. data는 압축하지 않았으면 원래 str, 압축했으면 압축된 bytes
+    __slots__ = ('key', 'data', 'codec', 'length', 'refs')
+
+    def __init__(self, key, data, codec, length):
+        self.key = key
+        self.data = data
+        self.codec = codec  # None이면 압축하지 않음
+        self.length = length  # 원래 내용의 UTF-8 바이트 수
+        self.refs = 0
+
+    def physical(self):
+        data = self.data
+        if data.__class__ is str:
+            return len(data) if data.isascii() else len(data.encode('utf-8'))
+        return len(data)
+
+
+class BlobContent:
+    # blob을 가리키는 파일 내용 (지연 내용 규약: load(), iter_lines(), length, raw()).
+    # 노드 하나가 참조 하나를 갖는다. cp나 지연 복사본으로 복사한 노드는 share()로 자기 참조를 받는다.
+    __slots__ = ('store', 'blob', 'length')
+
+    def __init__(self, store, blob):
+        self.store = store
+        self.blob = blob
+        self.length = blob.length
+
+    def __del__(self):
+        store = self.store
+        if store is not None:
+            store.release(self.blob)
+
+    def share(self):
+        # 같은 blob을 가리키는 새 참조 (복사한 노드용. 논리 크기에 복사본도 들어가도록)
+        return self.store.ref(self.blob)
+
+    def raw(self):
+        blob = self.blob
+        if blob.codec is None:
+            return blob.data.encode('utf-8')
+        return _decompress(blob.codec, blob.data)
+
+    def load(self):
+        blob = self.blob
+        if blob.codec is None:
+            return blob.data
+        return self.raw().decode('utf-8')
+
+    def iter_lines(self):
+        blob = self.blob
+        if blob.codec is None:
+            text = blob.data
+            lines = text.split('\n')
+            if text.endswith('\n'):
+                lines.pop()
+            yield from lines
+            return
+        # 푼 덩어리를 마지막 줄바꿈에서 끊어 디코딩하고, 남은 조각은 다음 덩어리 앞에 붙인다
+        rest = b''
+        for chunk in _chunks(blob.codec, blob.data):
+            if not chunk:
+                continue
+            chunk = rest + chunk
+            cut = chunk.rfind(b'\n')
+            if cut < 0:
+                rest = chunk
+                continue
+            yield from chunk[:cut].decode('utf-8').split('\n')
+            rest = chunk[cut + 1:]
+        if rest:
+            yield rest.decode('utf-8')
+
+
+class BlobStore:
+    def __init__(self, codec='zlib'):
+        if codec not in CODECS:
+            raise ValueError(f"지원하지 않는 압축 방식입니다: {codec}")
+        self.codec = codec
+        self.blobs = {}  # 내용 해시 -> Blob
+        # 명령 실행 스레드와 화면 스레드 어디서든 참조가 사라질 수 있다 (__del__ 안에서 다시 잡을 수 있게 RLock)
+        self.lock = threading.RLock()
+
+    def put(self, text):
+        # text를 저장소에 넣고 그 blob을 가리키는 새 참조를 돌려준다. 같은 내용이 있으면 그것을 쓴다.
+        # 해시와 압축은 잠금 밖에서 한다 (큰 파일 하나를 쓰는 동안 다른 세션/스레드가 기다리지 않도록)
+        import hashlib  # 불러오는 데 시간이 걸려 (시작 시간) 처음 큰 파일을 쓸 때
+        raw = text.encode('utf-8')
+        key = hashlib.blake2b(raw, digest_size=DIGEST_BYTES).digest()
+        with self.lock:
+            blob = self.blobs.get(key)
+            if blob is not None:
+                return self.ref(blob)
+        blob = self._blob(key, text, raw)
+        with self.lock:
+            # 압축하는 동안 다른 스레드가 같은 내용을 먼저 넣었으면 그것을 쓴다
+            blob = self.blobs.setdefault(key, blob)
+            return self.ref(blob)
+
+    def ref(self, blob):
+        with self.lock:
+            blob.refs += 1
+            return BlobContent(self, blob)
+
+    def _blob(self, key, text, raw):
+        if len(raw) >= COMPRESS_MIN_BYTES:
+            packed = _compress(self.codec, raw)
+            if len(packed) <= len(raw) * COMPRESS_MAX_RATIO:
+                return Blob(key, packed, self.codec, len(raw))
+        return Blob(key, text, None, len(raw))
+
+    def release(self, blob):
+        with self.lock:
+            blob.refs -= 1
+            if blob.refs <= 0 and self.blobs.get(blob.key) is blob:
+                del self.blobs[blob.key]
+
+    def stats(self):
+        # 논리 크기: 참조하는 노드(복사본 포함)마다 따로 가졌을 때, 고유 크기: 중복 제거 후, 실제 크기: 압축까지 한 뒤
+        with self.lock:
+            blobs = list(self.blobs.values())
+        logical = sum(blob.length * blob.refs for blob in blobs)
+        unique = sum(blob.length for blob in blobs)
+        physical = sum(blob.physical() for blob in blobs)
+        return {
+            'blobs': len(blobs),
+            'compressed': sum(blob.codec is not None for blob in blobs),
+            'refs': sum(blob.refs for blob in blobs),
+            'logical_bytes': logical,
+            'unique_bytes': unique,
+            'physical_bytes': physical,
+            'dedup_ratio': logical / unique if unique else 1.0,
+            'compression_ratio': unique / physical if physical else 1.0,
+        }
+
+
+STORE = BlobStore()  # 모든 파일 시스템(세션, 지연 복사본)이 같이 쓰는 기본 저장소
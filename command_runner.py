@@ -0,0 +1,78 @@
+from collections import deque
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from shell_engine import CommandResult
+
+
+class _Job(QRunnable):
+    def __init__(self, runner, command):
+        super().__init__()
+        self.runner = runner
+        self.command = command
+
+    def run(self):
+        self.runner._run(self.command)
+
+
+class CommandRunner(QObject):
+    # GUI의 명령 스케줄러. 명령을 작업 스레드(스레드 하나짜리 QThreadPool)에서 실행해 창이 멈추지 않게 한다.
+    # 셸처럼 한 번에 한 명령만 실행하고, 실행 중에 들어온 명령은 줄을 세워 두었다가 차례로 실행한다.
+    # 실행하는 동안 파일 시스템 잠금(vfs.lock)을 잡고, 긴 출력은 output 신호로 조금씩 보낸다.
+    # 신호는 작업 스레드에서 나가지만 받는 쪽(창)에서는 Qt가 GUI 스레드에서 보낸 순서대로 부른다.
+    started = pyqtSignal(str, bool)  # 명령, 에디터/top 입력인지
+    output = pyqtSignal(object)  # 실행 중인 명령의 stdout 일부 (list, 줄마다 변환하지 않도록 object로)
+    finished = pyqtSignal(object)  # CommandResult (아직 보내지 않은 stdout 포함)
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.pool.setExpiryTimeout(-1)  # 작업 스레드를 명령마다 새로 만들지 않는다
+        self.busy = False
+        self._queue = deque()
+        self._job = None
+        self.finished.connect(self._next)
+
+    def submit(self, command):
+        self._queue.append(command)
+        if not self.busy:
+            self._next()
+
+    def cancel(self):
+        # Ctrl-C: 기다리던 명령은 버리고 실행 중인 명령을 멈춘다. 멈출 명령이 있었는지를 돌려준다
+        self._queue.clear()
+        if not self.busy:
+            return False
+        self.engine.cancel()
+        return True
+
+    def wait(self):
+        # 창을 닫을 때: 실행 중인 명령을 멈추고 끝날 때까지 기다린다.
+        # 작업 스레드가 폴더 트리에 보낸 알림을 기다리고 있을 수 있으므로 이벤트는 계속 처리한다.
+        self.cancel()
+        while not self.pool.waitForDone(10):
+            QCoreApplication.processEvents()
+
+    def _next(self, result=None):
+        if not self._queue:
+            self.busy = False
+            self._job = None
+            return
+        self.busy = True
+        self._job = _Job(self, self._queue.popleft())
+        self.pool.start(self._job)
+
+    def _run(self, command):
+        # 작업 스레드에서 실행된다
+        engine = self.engine
+        try:
+            with engine.vfs.lock:
+                self.started.emit(command, engine.in_interactive_mode())
+                result = engine.execute(command, sink=self.output.emit)
+        except Exception as e:
+            result = CommandResult(command)
+            result.stderr.append(f"오류: {str(e)}")
+            result.status = 1
+        self.finished.emit(result)
@@ -0,0 +1,114 @@
+import bisect
+from collections import OrderedDict
+
+from vfs import VfsListener
+
+MAX_CANDIDATES = 100  # 한 번에 보여줄 후보 수 (나머지는 개수만 알린다)
+
+
+def _common_prefix(first, last):
+    # 정렬된 목록에서는 처음과 마지막 항목의 공통 접두사가 전체의 공통 접두사이다
+    size = min(len(first), len(last))
+    i = 0
+    while i < size and first[i] == last[i]:
+        i += 1
+    return first[:i]
+
+
+class Completer(VfsListener):
+    # Tab 자동 완성. 명령어 이름과 디렉토리별 정렬된 자식 이름 목록에서 이분 탐색으로 찾는다.
+    # 정렬 목록은 최근에 쓴 디렉토리만 캐시하고, 변경 알림으로 항목을 넣고 빼서 다시 정렬하지 않는다.
+    # 아직 구체화되지 않은 지연 복사본은 원본 디렉토리의 목록을 그대로 쓴다 (복사를 일으키지 않음).
+    CACHE_SIZE = 64
+
+    def __init__(self, vfs, commands):
+        self.vfs = vfs
+        self.commands = sorted(commands)
+        self._names = OrderedDict()  # 디렉토리 노드 -> 정렬된 자식 이름 목록
+        vfs.add_listener(self)
+
+    def _source(self, directory):
+        if directory._children is None and directory.origin is not None:
+            return directory.origin
+        return directory
+
+    def sorted_names(self, directory):
+        source = self._source(directory)
+        kids = source.children  # 호스트 마운트는 여기서 읽거나 다시 읽는다 (캐시가 지워진다)
+        names = self._names.get(source)
+        if names is None:
+            names = self._names[source] = sorted(kids)
+            if len(self._names) > self.CACHE_SIZE:
+                self._names.popitem(last=False)
+        else:
+            self._names.move_to_end(source)
+        return names
+
+    # 변경 알림: 캐시된 디렉토리의 목록만 고친다
+    def _insert(self, directory, name):
+        names = self._names.get(directory)
+        if names is not None:
+            bisect.insort(names, name)
+
+    def _delete(self, directory, name):
+        names = self._names.get(directory)
+        if names is not None:
+            i = bisect.bisect_left(names, name)
+            if i < len(names) and names[i] == name:
+                del names[i]
+
+    def node_added(self, node):
+        self._insert(node.parent, node.name)
+
+    def node_removed(self, node, old_parent):
+        self._delete(old_parent, node.name)
+        self._names.pop(node, None)
+
+    def node_moved(self, node, old_parent, old_name):
+        self._delete(old_parent, old_name)
+        self._insert(node.parent, node.name)
+
+    def children_materialized(self, directory):
+        self._names.pop(directory, None)  # 호스트 디렉토리를 다시 읽었다
+
+    # 완성
+    def _range(self, names, prefix):
+        start = bisect.bisect_left(names, prefix)
+        end = bisect.bisect_left(names, prefix + '\uffff', start)
+        return start, end
+
+    def complete(self, line):
+        # 커서 앞까지의 입력 -> (완성된 입력, 후보 목록, 전체 후보 수)
+        # 후보가 하나면 끝까지 채우고, 여러 개면 공통 접두사까지 채운 뒤 후보를 돌려준다.
+        start = max(line.rfind(' '), line.rfind('|'), line.rfind('>')) + 1
+        word = line[start:]
+        before = line[:start].rstrip()
+        if not before or before[-1] == '|':
+            return self._finish(line, start, word, self.commands, lambda name: ' ')
+
+        head, slash, prefix = word.rpartition('/')
+        if slash:
+            directory = self.vfs._resolve_path(head or '/')
+        else:
+            directory = self.vfs.get_current_dir()
+        if directory is None or not directory.is_dir():
+            return line, [], 0
+        names = self.sorted_names(directory)
+        kids = self._source(directory).children
+
+        def suffix(name):
+            return '/' if kids[name].type == 'directory' else ' '
+
+        return self._finish(line, start + len(head) + len(slash), prefix, names, suffix)
+
+    def _finish(self, line, start, prefix, names, suffix):
+        lo, hi = self._range(names, prefix)
+        total = hi - lo
+        if total == 0:
+            return line, [], 0
+        if total == 1:
+            name = names[lo]
+            return line[:start] + name + suffix(name), [], 1
+        common = _common_prefix(names[lo], names[hi - 1])
+        candidates = names[lo:min(hi, lo + MAX_CANDIDATES)]
+        return line[:start] + common, candidates, total
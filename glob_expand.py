@@ -0,0 +1,156 @@
+import bisect
+import fnmatch
+import re
+from collections import OrderedDict
+
+from name_index import GLOB_CHARS
+
+# 셸 글롭 확장 (*, ?, [...], **). 명령을 실행하기 전에 인자를 실제 경로 목록으로 바꾼다.
+# 패턴은 '/'로 나눈 조각마다 한 번만 컴파일해 캐시하고, 글롭 문자가 없는 조각은 자식 하나만
+# 찾아 내려간다. 앞부분이 고정된 조각(예: app*.log)은 디렉토리의 정렬된 이름 목록에서 이분 탐색한다.
+PATTERN_CACHE_SIZE = 256  # 컴파일해 둘 조각 패턴 수
+
+# 따옴표 안이나 \ 뒤에 있던 글롭 문자 (파싱할 때 이 글자로 바꿔 두고, 확장하지 않는다)
+PROTECTED = {'*': chr(0xE000), '?': chr(0xE001), '[': chr(0xE002)}
+UNPROTECT = str.maketrans({value: key for key, value in PROTECTED.items()})
+ESCAPED = {value: f'[{key}]' for key, value in PROTECTED.items()}  # fnmatch에서 글자 그대로
+
+_compiled = OrderedDict()  # 조각 패턴 -> (고정 접두사, match 함수)
+
+
+class GlobWord(str):
+    # 확장할 인자 (따옴표 밖에 글롭 문자가 있던 단어)
+    __slots__ = ()
+
+
+def protect(command):
+    # 따옴표 안과 \ 뒤의 글롭 문자를 자리표시 글자로 바꾼다
+    if not GLOB_CHARS.search(command):
+        return command
+    out = []
+    quote = None
+    escaped = False
+    for ch in command:
+        if escaped:
+            out.append(PROTECTED.get(ch, ch))
+            escaped = False
+            continue
+        if ch == '\\' and quote != "'":
+            escaped = True
+        elif quote is None:
+            if ch in ('"', "'"):
+                quote = ch
+        elif ch == quote:
+            quote = None
+        else:
+            ch = PROTECTED.get(ch, ch)
+        out.append(ch)
+    return ''.join(out)
+
+
+def word(token):
+    # 파싱한 토큰 -> 글롭 단어 또는 (자리표시를 되돌린) 보통 문자열
+    if GLOB_CHARS.search(token):
+        return GlobWord(token)
+    return token.translate(UNPROTECT)
+
+
+def literal(text):
+    return text.translate(UNPROTECT)
+
+
+def _compile(segment):
+    entry = _compiled.get(segment)
+    if entry is not None:
+        _compiled.move_to_end(segment)
+        return entry
+    first = GLOB_CHARS.search(segment).start()
+    pattern = ''.join(ESCAPED.get(ch, ch) for ch in segment)
+    entry = (literal(segment[:first]), re.compile(fnmatch.translate(pattern)).match)
+    _compiled[segment] = entry
+    if len(_compiled) > PATTERN_CACHE_SIZE:
+        _compiled.popitem(last=False)
+    return entry
+
+
+class GlobExpander:
+    # completer: 디렉토리별 정렬된 이름 목록(Completer.sorted_names)을 함께 쓴다
+    def __init__(self, vfs, completer):
+        self.vfs = vfs
+        self.completer = completer
+
+    def _kids(self, directory):
+        # 지연 복사본은 구체화하지 않고 원본의 자식을 본다 (이름과 내용이 같다)
+        return self.completer._source(directory).children
+
+    def expand(self, pattern):
+        # 맞는 경로를 정렬해서 돌려준다. 없으면 빈 목록 (호출하는 쪽이 글자 그대로 쓴다)
+        absolute = pattern.startswith('/')
+        segments = [segment for segment in pattern.split('/') if segment]
+        dirs_only = pattern.endswith('/')
+        matches = [(self.vfs.root if absolute else self.vfs.get_current_dir(), '/' if absolute else '')]
+        for i, segment in enumerate(segments):
+            last = i == len(segments) - 1
+            found = []
+            for node, path in matches:
+                if not node.is_dir():
+                    continue
+                if segment == '**':
+                    self._globstar(node, path, last, found)
+                elif not GLOB_CHARS.search(segment):
+                    child = self._literal_child(node, literal(segment))
+                    if child is not None:
+                        found.append((child, path + literal(segment)))
+                else:
+                    self._match(node, path, segment, found)
+            if not last:
+                # 다음 조각 앞에 붙일 접두사 ('', '/', 'a/b/')
+                found = [(node, path + '/' if path and not path.endswith('/') else path)
+                         for node, path in found if node.is_dir()]
+            matches = found
+            if not matches:
+                return []
+        if dirs_only:
+            matches = [(node, path if path.endswith('/') else path + '/')
+                       for node, path in matches if node.is_dir()]
+        return sorted(path for node, path in matches)
+
+    def _literal_child(self, node, name):
+        if name == '.':
+            return node
+        if name == '..':
+            return node.parent if node.parent is not None else node
+        return self._kids(node).get(name)
+
+    def _match(self, node, path, segment, found):
+        prefix, match = _compile(segment)
+        show_hidden = segment.startswith('.')
+        kids = self._kids(node)
+        if prefix:
+            names = self.completer.sorted_names(node)
+            start = bisect.bisect_left(names, prefix)
+            end = bisect.bisect_left(names, prefix + '\uffff', start)
+            candidates = names[start:end]
+        else:
+            candidates = kids
+        for name in candidates:
+            if (show_hidden or name[0] != '.') and match(name):
+                found.append((kids[name], path + name))
+
+    def _globstar(self, node, path, last, found):
+        # ** : 0개 이상의 디렉토리. 마지막 조각이면 아래의 모든 파일과 디렉토리
+        if not last:
+            found.append((node, path if path == '/' else path.rstrip('/')))  # 0개 (바로 여기)
+        stack = [(node, path)]
+        while stack:
+            current, current_path = stack.pop()
+            kids = self._kids(current)
+            for name, child in kids.items():
+                if name[0] == '.':
+                    continue
+                child_path = current_path + name
+                if child.is_dir():
+                    found.append((child, child_path))
+                    stack.append((child, child_path + '/'))
+                elif last:
+                    found.append((child, child_path))
@@ -0,0 +1,255 @@
+import os
+import re
+import sys
+import time
+
+DEFAULT_HISTORY_SIZE = 100000  # 보관할 최대 명령 수
+SYNC_EVERY = 64  # 이만큼 쌓이면 fsync
+SYNC_INTERVAL = 2.0  # 또는 마지막 fsync 뒤 이만큼(초) 지났으면 fsync
+GRAM_CACHE_SIZE = 1024  # 캐시할 세 글자 조각 집합 수
+FEW_MATCHES = 512  # 결과가 이보다 적으면 한꺼번에 정렬해 돌려준다
+
+# !! (직전 명령), !n (n번 명령), !-n (n개 전 명령), !문자열 (그 문자열로 시작하는 가장 최근 명령)
+EVENT = re.compile(r'!(!|-?\d+|[A-Za-z_./][\w./-]*)')
+SINGLE_QUOTED = re.compile(r"('[^']*')")
+
+
+class HistoryError(Exception):
+    pass
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CommandHistory:
+    # 명령 히스토리. 파일에는 한 줄에 명령 하나씩 덧붙이기만 하고, fsync는 모아서 한다.
+    # 최대 크기를 넘으면 메모리에서는 오래된 것부터 버리고, 파일이 두 배를 넘으면 새로 써서 줄인다.
+    # 번호는 버린 만큼(base) 밀리지 않으므로 !n 이 가리키는 명령이 바뀌지 않는다.
+    # 파일은 처음 쓸 때(또는 창이 뜬 뒤 load()를 부를 때) 읽는다: 큰 히스토리가 시작을 늦추지 않도록.
+    def __init__(self, path=None, max_size=DEFAULT_HISTORY_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self.entries = []
+        self.base = 0  # 버린 명령 수 (entries[0]의 번호는 base + 1)
+        self._file = None
+        self._file_lines = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        # Ctrl-R 검색 색인 (처음 검색할 때 만든다)
+        self._last_use = None  # 서로 다른 명령 -> 마지막 번호 (최근에 쓴 것이 뒤)
+        self._grams = None  # 세 글자 조각 -> 그 조각이 든 명령 집합 (검색에 쓰인 조각만)
+        self._last_search = (None, None)  # (직전 검색어, 그 결과 집합)
+        self.loaded = path is None
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, encoding='utf-8', errors='replace') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+        self._file_lines = len(lines)
+        keep = lines[-self.max_size:] if self.max_size else []
+        self.base = len(lines) - len(keep)
+        self.entries = [sys.intern(line) for line in keep]
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._file_lines > 2 * self.max_size:
+            self._compact_file()
+
+    def __len__(self):
+        self.load()
+        return len(self.entries)
+
+    def __iter__(self):
+        self.load()
+        return iter(self.entries)
+
+    def last_number(self):
+        self.load()
+        return self.base + len(self.entries)
+
+    def numbered(self, count=None):
+        # (번호, 명령) 을 오래된 순서로. count가 있으면 마지막 count개만
+        self.load()
+        start = 0 if count is None else max(len(self.entries) - count, 0)
+        for i in range(start, len(self.entries)):
+            yield self.base + i + 1, self.entries[i]
+
+    def add(self, command):
+        self.load()
+        command = sys.intern(command)
+        self.entries.append(command)
+        number = self.last_number()
+        if self._last_use is not None:
+            self._index(command, number)
+        if self._file is not None:
+            self._file.write(command + '\n')
+            self._file_lines += 1
+            self._unsynced += 1
+            if self._unsynced >= SYNC_EVERY or time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+                self.sync()
+        # 넘친 만큼을 한꺼번에 버린다 (매번 앞에서 하나씩 지우면 O(n))
+        if len(self.entries) > self.max_size + self.max_size // 4:
+            self._trim()
+        if self._file is not None and self._file_lines > 2 * self.max_size:
+            self._compact_file()
+
+    def clear(self):
+        self.load()
+        self.base += len(self.entries)
+        self.entries = []
+        self._last_use = None
+        self._grams = None
+        if self._file is not None:
+            self._compact_file()
+
+    def sync(self):
+        if self._file is None or not self._unsynced:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _trim(self):
+        drop = len(self.entries) - self.max_size
+        dropped = self.entries[:drop]
+        del self.entries[:drop]
+        self.base += drop
+        if self._last_use is not None:
+            for command in dropped:
+                number = self._last_use.get(command)
+                if number is not None and number <= self.base:
+                    self._unindex(command)
+
+    def _compact_file(self):
+        # 남아 있는 명령만 새 파일에 쓰고 원자적으로 바꿔치기한다
+        self._file.close()
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(''.join(command + '\n' for command in self.entries))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._file_lines = len(self.entries)
+        self._unsynced = 0
+
+    # !n / !! 확장
+    def get(self, number):
+        self.load()
+        i = number - self.base - 1
+        if 0 <= i < len(self.entries):
+            return self.entries[i]
+        return None
+
+    def expand(self, command):
+        # 확장된 명령을 돌려준다. 찾을 수 없는 이벤트면 HistoryError
+        if '!' not in command:
+            return command
+        self.load()
+
+        def event(match):
+            key = match.group(1)
+            if key == '!':
+                found = self.entries[-1] if self.entries else None
+            elif key.lstrip('-').isdigit():
+                number = int(key)
+                found = self.get(number if number > 0 else self.last_number() + number + 1)
+            else:
+                found = next((c for c in reversed(self.entries) if c.startswith(key)), None)
+            if found is None:
+                raise HistoryError(f"!{key}: 이벤트를 찾을 수 없습니다")
+            return found
+
+        # 작은따옴표 안은 bash처럼 확장하지 않는다
+        parts = SINGLE_QUOTED.split(command)
+        for i in range(0, len(parts), 2):
+            parts[i] = EVENT.sub(event, parts[i])
+        return ''.join(parts)
+
+    # Ctrl-R 역방향 검색
+    # 서로 다른 명령만 최근 순서로 모아 두고(_last_use), 세 글자 조각별 명령 집합(n-gram 색인)은
+    # 그 조각이 처음 검색될 때 만들어 캐시한다. 한 번 만든 집합은 add/_trim 때 함께 고친다.
+    # 글자를 하나 더 칠 때는 직전 검색 결과 안에서만 다시 거른다.
+    def _build_index(self):
+        numbers = {command: number for number, command in enumerate(self.entries, self.base + 1)}
+        newest_first = dict.fromkeys(reversed(self.entries))
+        self._last_use = {command: numbers[command] for command in reversed(newest_first)}
+        self._grams = {}
+        self._last_search = (None, None)
+
+    def _index(self, command, number):
+        last_use = self._last_use
+        if command in last_use:
+            del last_use[command]  # 다시 넣어 최근 순서의 맨 뒤로 보낸다
+        else:
+            grams = self._grams
+            for gram in _trigrams(command):
+                posting = grams.get(gram)
+                if posting is not None:
+                    posting.add(command)
+        last_use[command] = number
+        self._last_search = (None, None)
+
+    def _unindex(self, command):
+        del self._last_use[command]
+        grams = self._grams
+        for gram in _trigrams(command):
+            posting = grams.get(gram)
+            if posting is not None:
+                posting.discard(command)
+        self._last_search = (None, None)
+
+    def _posting(self, gram):
+        posting = self._grams.get(gram)
+        if posting is None:
+            if len(self._grams) >= GRAM_CACHE_SIZE:
+                del self._grams[next(iter(self._grams))]  # 가장 먼저 만든 것부터 버린다
+            posting = self._grams[gram] = {command for command in self._last_use if gram in command}
+        return posting
+
+    def _matches(self, query):
+        # query가 들어 있는 명령 집합
+        previous, found = self._last_search
+        if previous is not None and previous in query:
+            pool = found
+        else:
+            # 조각 집합은 앞/가운데/끝 세 개면 충분히 좁혀진다 (나머지는 직접 확인)
+            grams = sorted(_trigrams(query))
+            picked = {grams[0], grams[len(grams) // 2], grams[-1]}
+            pool = set.intersection(*sorted((self._posting(gram) for gram in picked), key=len))
+        found = {command for command in pool if query in command}
+        self._last_search = (query, found)
+        return found
+
+    def search(self, query):
+        # query가 들어 있는 서로 다른 명령을 최근 것부터 (번호, 명령)으로 돌려준다
+        self.load()
+        if self._last_use is None:
+            self._build_index()
+        last_use = self._last_use
+        if len(query) < 3:
+            # 짧은 질의는 최근 순서로 훑는다 (대개 몇 개 안 보고 찾는다)
+            for command in reversed(last_use):
+                if query in command:
+                    yield last_use[command], command
+            return
+
+        found = self._matches(query)
+        if len(found) <= FEW_MATCHES:
+            yield from sorted(((last_use[command], command) for command in found), reverse=True)
+            return
+        # 결과가 많으면 최근 순서로 훑으며 바로바로 돌려준다 (첫 결과는 금방 나온다)
+        for command in reversed(last_use):
+            if command in found:
+                yield last_use[command], command
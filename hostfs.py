@@ -0,0 +1,241 @@
+import mmap
+import os
+
+from vfs import Inode
+
+CHUNK_SIZE = 1 << 20  # 한 번에 디코딩할 크기 (줄바꿈에서 끊는다)
+MADV_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)  # Windows 등에는 없다
+
+# 호스트 디렉토리를 읽기 전용으로 가상 파일 시스템에 붙인다 (mount).
+# 디렉토리는 처음 들여다볼 때 os.scandir로 한 단계만 읽고, 이후에는 디렉토리 mtime이
+# 바뀌었을 때만 다시 읽는다. 파일 내용은 mmap으로 열어 cat/head/grep이 줄 단위로 흘려보낸다.
+
+
+class HostContent:
+    # 호스트 파일 내용 (지연 내용 규약: load(), iter_lines(), length)
+    __slots__ = ('path', 'length')
+
+    def __init__(self, path, length):
+        self.path = path
+        self.length = length
+
+    def raw(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def load(self):
+        return self.raw().decode('utf-8', 'replace')
+
+    def iter_lines(self):
+        # 줄바꿈에서 끊은 덩어리 단위로 디코딩해 흘려보내고, 다 읽은 페이지는 놓아 준다
+        # (큰 파일을 끝까지 읽어도 RSS가 파일 크기만큼 늘지 않는다)
+        with open(self.path, 'rb') as f:
+            try:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return  # 빈 파일은 mmap할 수 없다
+        try:
+            start = released = 0
+            end = len(mapping)
+            while start < end:
+                stop = min(start + CHUNK_SIZE, end)
+                if stop < end:
+                    newline = mapping.rfind(b'\n', start, stop)
+                    if newline < 0:
+                        newline = mapping.find(b'\n', stop)  # 덩어리보다 긴 줄
+                    stop = end if newline < 0 else newline + 1
+                text = mapping[start:stop].decode('utf-8', 'replace')
+                lines = text.split('\n')
+                if text.endswith('\n'):
+                    lines.pop()
+                yield from lines
+                start = stop
+                page_end = stop - stop % mmap.PAGESIZE
+                if MADV_DONTNEED is not None and page_end > released:
+                    mapping.madvise(MADV_DONTNEED, released, page_end - released)
+                    released = page_end
+        finally:
+            mapping.close()
+
+
+class HostFileInode(Inode):
+    __slots__ = ()
+    read_only = True
+
+    def clone(self, parent, name=None):
+        # 밖으로 복사하면 지금 내용을 글자로 읽어 호스트와 끊긴 보통 파일을 만든다 (HostContent를 같이 쓰지 않는다)
+        data = self._content
+        return Inode(name if name is not None else self.name, 'file', parent,
+                     data if data.__class__ is str else data.load())
+
+
+class HostDirInode(Inode):
+    # 호스트 디렉토리. _children가 None이면 아직 읽지 않은 것이다.
+    __slots__ = ('host_path', 'mtime')
+    read_only = True
+
+    def __init__(self, name, parent, host_path):
+        super().__init__(name, 'directory', parent)
+        self._children = None
+        self.host_path = host_path
+        self.mtime = None
+
+    @property
+    def children(self):
+        try:
+            mtime = os.stat(self.host_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._children is None or mtime != self.mtime:
+            self._scan(mtime)
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
+    def clone(self, parent, name=None):
+        # 밖으로 복사(cp -r)하면 지금 하위 전체를 보통 노드로 바로 복사한다.
+        # 지연 복사(origin)로 두면 복사본이 호스트 폴더를 계속 따라가 내용과 집계값(du)이 어긋난다
+        node = Inode(name if name is not None else self.name, 'directory', parent)
+        for child_name, child in self.children.items():
+            copy = child.clone(node, child_name)
+            node._children[child_name] = copy
+            size, files, dirs = copy.totals()
+            node.size += size
+            node.nfiles += files
+            node.ndirs += dirs
+        return node
+
+    def _scan(self, mtime):
+        old = self._children or {}
+        kids = {}
+        try:
+            entries = list(os.scandir(self.host_path))
+        except OSError:
+            entries = []  # 권한이 없거나 사라진 디렉토리는 비어 있는 것으로 본다
+        for entry in entries:
+            try:
+                # 디렉토리 심볼릭 링크는 따라가지 않는다 (순환 방지)
+                if entry.is_dir(follow_symlinks=False):
+                    node = old.get(entry.name)
+                    if node is None or node.__class__ is not HostDirInode:
+                        node = HostDirInode(entry.name, self, entry.path)
+                elif entry.is_file():
+                    size = entry.stat().st_size
+                    node = old.get(entry.name)
+                    if node is None or node.__class__ is not HostFileInode:
+                        node = HostFileInode(entry.name, 'file', self)
+                    node._content = HostContent(entry.path, size)
+                    node.size = size
+                else:
+                    continue  # 소켓, 장치 파일 등
+            except OSError:
+                continue
+            kids[entry.name] = node
+        for name, node in old.items():
+            if kids.get(name) is not node:
+                node.parent = None  # 호스트에서 사라진 항목
+        self._children = kids
+        self.mtime = mtime
+
+        # 새로 알게 된 크기를 상위 디렉토리 집계값에 반영하고, 색인 등에 알린다
+        size = files = dirs = 0
+        for child in kids.values():
+            child_size, child_files, child_dirs = child.totals()
+            size += child_size
+            files += child_files
+            dirs += child_dirs
+        delta = (size - self.size, files - self.nfiles, dirs - self.ndirs)
+        self.size, self.nfiles, self.ndirs = size, files, dirs
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        vfs = getattr(root, 'vfs', None)
+        if vfs is not None:
+            if self.parent is not None:
+                vfs._adjust(self.parent, *delta)
+            vfs._invalidate()
+            vfs._emit('children_materialized', self)
+
+    def refresh(self):
+        # 하위 전체를 읽는다 (find -name 처럼 색인이 전체를 알아야 할 때). 바뀐 디렉토리만 다시 읽는다
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            for child in node.children.values():
+                if child.__class__ is HostDirInode:
+                    stack.append(child)
+
+
+def parse_mount_spec(spec):
+    # --mount 옵션 값 "호스트폴더:경로" (Windows의 C:\data:/data 도 되도록 마지막 ':'로 나눈다)
+    host_dir, colon, path = spec.rpartition(':')
+    if not colon or not host_dir or not path.startswith('/'):
+        raise ValueError(f"'호스트폴더:/경로' 형식이어야 합니다: {spec}")
+    return host_dir, path
+
+
+def mount(vfs, host_dir, path):
+    # host_dir을 path에 읽기 전용으로 붙인다. path는 없거나 비어 있는 디렉토리여야 한다
+    host_dir = os.path.abspath(host_dir)
+    if not os.path.isdir(host_dir):
+        raise ValueError(f"호스트 디렉토리가 아닙니다: {host_dir}")
+    parent, name = vfs._split_parent(path)
+    if parent is None or not name or name in ('.', '..'):
+        raise ValueError(f"마운트할 위치를 찾을 수 없습니다: {path}")
+    if parent.read_only:
+        raise ValueError(f"읽기 전용 파일 시스템 안에는 마운트할 수 없습니다: {path}")
+    existing = parent.children.get(name)
+    if existing is not None:
+        if not existing.is_dir() or existing.read_only or existing.children:
+            raise ValueError(f"마운트 위치는 비어 있는 디렉토리여야 합니다: {path}")
+        if vfs._is_ancestor(existing, vfs.cwd):
+            raise ValueError(f"사용 중인 디렉토리입니다: {path}")
+
+    vfs._detach_clones(parent)
+    if existing is not None:
+        del parent.children[name]
+        existing.parent = None
+        vfs._adjust(parent, *(-value for value in existing.totals()))
+        vfs._emit('node_removed', existing, parent)
+    node = HostDirInode(name, parent, host_dir)
+    parent.children[name] = node
+    vfs._adjust(parent, *node.totals())
+    vfs._invalidate()
+    vfs._emit('node_added', node)
+    vfs.mounts.append(node)
+    return node
+
+
+def umount(vfs, path):
+    # 마운트를 떼고 그 자리에 빈 디렉토리를 되돌려 둔다
+    node = vfs._resolve_path(path)
+    if node is None or node not in vfs.mounts:
+        raise ValueError(f"마운트된 위치가 아닙니다: {path}")
+    if vfs._is_ancestor(node, vfs.cwd):
+        raise ValueError(f"사용 중인 디렉토리입니다: {path}")
+    parent = node.parent
+    vfs._detach_clones(parent)
+    del parent.children[node.name]
+    node.parent = None
+    vfs._adjust(parent, *(-value for value in node.totals()))
+    vfs._invalidate()
+    vfs._emit('node_removed', node, parent)
+    vfs.mounts.remove(node)
+    vfs.create_dir(vfs.node_path(parent).rstrip('/') + '/' + node.name)
+
+
+def active_mounts(vfs):
+    # 삭제된 디렉토리 아래에 있던 마운트는 빼고 돌려준다
+    vfs.mounts = [node for node in vfs.mounts if vfs._is_attached(node)]
+    return vfs.mounts
+
+
+def refresh_mounts(vfs, node):
+    # node 아래(또는 node를 품은) 마운트를 끝까지 읽어 둔다. 이름 색인이 전체를 알게 된다
+    for mount_point in active_mounts(vfs):
+        if vfs._is_ancestor(node, mount_point):
+            mount_point.refresh()
+        elif vfs._is_ancestor(mount_point, node) and node.__class__ is HostDirInode:
+            node.refresh()
@@ -0,0 +1,249 @@
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+
+from snapshot import load_snapshot, save_snapshot
+from vfs import VirtualFileSystem
+
+# 자동 저장: 마지막 스냅샷 + 그 뒤의 변경 기록(저널)
+#   상태 폴더/snapshot.N  : 저널 1..N번까지 반영된 스냅샷
+#   상태 폴더/journal.M   : M번 저널 (실행할 때마다, 그리고 압축할 때마다 새 번호로 연다)
+# 시작할 때는 가장 큰 N의 스냅샷을 읽고 M > N인 저널을 차례로 다시 실행한다.
+# 저널이 커지면 지금 쓰던 저널을 닫고, 백그라운드 스레드가 (스냅샷 + 닫힌 저널)로 새 스냅샷을 만든다.
+# 압축은 살아 있는 트리를 건드리지 않고 파일만 읽으므로 화면이 멈추지 않는다.
+DEFAULT_STATE_DIR = os.path.join(os.path.expanduser('~'), '.linux_simulator_state')
+SYNC_EVERY = 64  # 이만큼 쌓이면 fsync (그룹 커밋)
+SYNC_INTERVAL = 1.0  # 또는 마지막 fsync 뒤 이만큼(초) 지났으면 fsync
+COMPACT_BYTES = 4 << 20  # 스냅샷에 반영되지 않은 저널이 이보다 커지면 압축
+
+MAGIC = b'LSIMJNL1'
+RECORD = struct.Struct('<II')  # 내용 길이, crc32
+FIELD = struct.Struct('<I')  # 필드 길이
+OPS = ('mkdir', 'touch', 'write', 'append', 'rm', 'cp', 'mv', 'patch')  # 새 연산은 끝에 (번호가 기록에 남는다)
+OP_CODES = {op: code for code, op in enumerate(OPS)}
+STATE_FILE = re.compile(r'(snapshot|journal)\.(\d+)$')
+
+
+def _encode(op, args):
+    parts = [bytes((OP_CODES[op],))]
+    for arg in args:
+        data = arg.encode('utf-8')
+        parts.append(FIELD.pack(len(data)))
+        parts.append(data)
+    payload = b''.join(parts)
+    return RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_journal(path):
+    # (op, 인자 목록)을 차례로. 마지막 기록이 끊겼거나 깨졌으면(전원이 나간 경우) 거기서 멈춘다.
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        return
+    pos = len(MAGIC)
+    while pos + RECORD.size <= len(data):
+        length, crc = RECORD.unpack_from(data, pos)
+        start = pos + RECORD.size
+        payload = data[start:start + length]
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return
+        args = []
+        at = 1
+        while at < length:
+            (size,) = FIELD.unpack_from(payload, at)
+            at += FIELD.size
+            args.append(payload[at:at + size].decode('utf-8'))
+            at += size
+        yield OPS[payload[0]], args
+        pos = start + length
+
+
+def replay(vfs, path):
+    # 저널을 다시 실행한다. 저널에는 성공한 변경만 있으므로 실패는 무시한다.
+    journal, vfs.journal = vfs.journal, None
+    try:
+        for op, args in read_journal(path):
+            if op == 'mkdir':
+                vfs.create_dir(args[0])
+            elif op == 'touch':
+                vfs.create_file(args[0])
+            elif op == 'write':
+                vfs.write_file(args[0], args[1])
+            elif op == 'append':
+                existing = vfs.read_file(args[0])
+                if existing and not existing.endswith('\n'):
+                    existing += '\n'
+                vfs.write_file(args[0], (existing or '') + args[1])
+            elif op == 'patch':
+                # 큰 파일을 고쳐 쓴 것: (시작 위치, 지울 글자 수, 넣을 글자)
+                existing = vfs.read_file(args[0]) or ''
+                start, removed = int(args[1]), int(args[2])
+                vfs.write_file(args[0], existing[:start] + args[3] + existing[start + removed:])
+            elif op == 'rm':
+                vfs.remove(args[0])
+            elif op == 'cp':
+                vfs.copy(args[0], args[1], recursive=True)
+            elif op == 'mv':
+                vfs.move(args[0], args[1])
+    finally:
+        vfs.journal = journal
+
+
+def _state_files(state_dir):
+    # {'snapshot': [N...], 'journal': [M...]} (오름차순)
+    found = {'snapshot': [], 'journal': []}
+    for name in os.listdir(state_dir):
+        match = STATE_FILE.match(name)
+        if match:
+            found[match.group(1)].append(int(match.group(2)))
+    found['snapshot'].sort()
+    found['journal'].sort()
+    return found
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Windows에서 아직 mmap 중인 스냅샷은 지울 수 없다 (다음 실행 때 지운다)
+
+
+def _fsync_file(path):
+    with open(path, 'r+b') as f:
+        os.fsync(f.fileno())
+
+
+def open_state(state_dir, image=None):
+    # 상태 폴더에서 파일 시스템을 되살리고 저널을 붙여 돌려준다.
+    # 처음이면 image(없으면 기본 트리)를 0번 스냅샷으로 삼는다.
+    os.makedirs(state_dir, exist_ok=True)
+    files = _state_files(state_dir)
+    if not files['snapshot']:
+        first = os.path.join(state_dir, 'snapshot.0')
+        if image:
+            import shutil
+            shutil.copyfile(image, first + '.tmp')
+        else:
+            save_snapshot(VirtualFileSystem(), first + '.tmp')
+        _fsync_file(first + '.tmp')
+        os.replace(first + '.tmp', first)
+        files['snapshot'] = [0]
+    generation = files['snapshot'][-1]
+    vfs = load_snapshot(os.path.join(state_dir, f'snapshot.{generation}'))
+
+    pending = []
+    for seq in files['journal']:
+        path = os.path.join(state_dir, f'journal.{seq}')
+        if seq <= generation or os.path.getsize(path) <= len(MAGIC):
+            _remove(path)  # 이미 스냅샷에 들어갔거나 비어 있는 저널
+        else:
+            replay(vfs, path)
+            pending.append(seq)
+    for seq in files['snapshot'][:-1]:
+        _remove(os.path.join(state_dir, f'snapshot.{seq}'))
+
+    vfs.journal = Journal(state_dir, generation, pending)
+    return vfs
+
+
+class Journal:
+    # 변경 기록 파일. 기록은 바로 OS에 넘기고(프로그램이 죽어도 남음), fsync는 모아서 한다.
+    def __init__(self, state_dir, generation, pending=()):
+        self.state_dir = state_dir
+        # 아래 세 값은 백그라운드 압축 스레드도 바꾸므로 lock을 잡고 읽고 쓴다
+        self.lock = threading.Lock()
+        self.generation = generation  # 지금 스냅샷 번호
+        self.pending = list(pending)  # 스냅샷에 아직 반영되지 않은 닫힌 저널 번호
+        self.pending_bytes = sum(os.path.getsize(self._path('journal', seq)) for seq in self.pending)
+        self.seq = max(self.pending + [generation]) + 1
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._compactor = None
+        self.compactions = 0
+        self._open_segment()
+        self._maybe_compact()
+
+    def _path(self, kind, seq):
+        return os.path.join(self.state_dir, f'{kind}.{seq}')
+
+    def _open_segment(self):
+        self._file = open(self._path('journal', self.seq), 'wb')
+        self._file.write(MAGIC)
+        self._file.flush()
+        self._written = len(MAGIC)
+
+    def append(self, op, args):
+        record = _encode(op, args)
+        self._file.write(record)
+        self._file.flush()
+        self._written += len(record)
+        self._unsynced += 1
+        if self._unsynced >= SYNC_EVERY or time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            self.sync()
+        self._maybe_compact()
+
+    def sync(self):
+        if self._file is None or not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._file is not None:
+            self._unsynced = max(self._unsynced, 1)
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    # 압축
+    def _maybe_compact(self):
+        with self.lock:
+            pending_bytes = self.pending_bytes
+        if pending_bytes + self._written < COMPACT_BYTES:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self.compact()
+
+    def compact(self):
+        # 지금 저널을 닫고 새 번호로 다시 연 뒤, 닫힌 저널들을 백그라운드에서 스냅샷에 합친다
+        if self._compactor is not None:
+            self._compactor.join()
+        self._unsynced = max(self._unsynced, 1)
+        self.sync()
+        self._file.close()
+        with self.lock:
+            self.pending.append(self.seq)
+            self.pending_bytes += self._written
+            generation, segments = self.generation, list(self.pending)
+        self.seq += 1
+        self._open_segment()
+        self._compactor = threading.Thread(target=self._compact, args=(generation, segments), daemon=True)
+        self._compactor.start()
+
+    def _compact(self, generation, segments):
+        # 살아 있는 트리와 따로, 파일만으로 새 스냅샷을 만든다
+        vfs = load_snapshot(self._path('snapshot', generation))
+        for seq in segments:
+            replay(vfs, self._path('journal', seq))
+        upto = segments[-1]
+        target = self._path('snapshot', upto)
+        save_snapshot(vfs, target + '.tmp')
+        _fsync_file(target + '.tmp')
+        os.replace(target + '.tmp', target)  # 여기서 새 스냅샷이 확정된다
+        for seq in segments:
+            _remove(self._path('journal', seq))
+        _remove(self._path('snapshot', generation))
+        # 압축하는 동안 닫힌 저널은 남겨 둔다 (다음 압축 대상)
+        with self.lock:
+            self.pending = [seq for seq in self.pending if seq > upto]
+            self.pending_bytes = sum(os.path.getsize(self._path('journal', seq)) for seq in self.pending)
+            self.generation = upto
+            self.compactions += 1
@@ -1,184 +1,86 @@
+import time
+STARTUP_TIME = time.perf_counter()  # --profile-startup: 모듈을 불러오기 시작한 때
+
 import sys
+import argparse
 import os
-import shutil
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                           QHBoxLayout, QTextEdit, QLineEdit, QLabel, QSplitter,
-                           QMessageBox, QPushButton)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QTextCursor
-
-class VirtualFileSystem:
-    def __init__(self):
-        self.root = {
-            'type': 'directory',
-            'name': '/',
-            'children': {
-                'bin': {
-                    'type': 'directory',
-                    'name': 'bin',
-                    'children': {
-                        'ls': {'type': 'file', 'name': 'ls', 'content': '#!/bin/bash\necho "List directory contents"'},
-                        'cat': {'type': 'file', 'name': 'cat', 'content': '#!/bin/bash\necho "Concatenate files"'}
-                    }
-                },
-                'etc': {
-                    'type': 'directory',
-                    'name': 'etc',
-                    'children': {
-                        'passwd': {'type': 'file', 'name': 'passwd', 'content': 'root:x:0:0:root:/root:/bin/bash\nuser:x:1000:1000:user:/home/user:/bin/bash'},
-                        'hostname': {'type': 'file', 'name': 'hostname', 'content': 'linux-simulator'}
-                    }
-                },
-                'home': {
-                    'type': 'directory',
-                    'name': 'home',
-                    'children': {
-                        'user': {
-                            'type': 'directory',
-                            'name': 'user',
-                            'children': {
-                                'Documents': {'type': 'directory', 'name': 'Documents', 'children': {}},
-                                'Downloads': {'type': 'directory', 'name': 'Downloads', 'children': {}},
-                                'hello.txt': {'type': 'file', 'name': 'hello.txt', 'content': 'Hello, Linux World!'}
-                            }
-                        }
-                    }
-                },
-                'var': {
-                    'type': 'directory',
-                    'name': 'var',
-                    'children': {
-                        'log': {
-                            'type': 'directory',
-                            'name': 'log',
-                            'children': {
-                                'syslog': {'type': 'file', 'name': 'syslog', 'content': 'System log file'}
-                            }
-                        }
-                    }
-                }
-            }
-        }
-        self.current_path = ['/']
-
-    def get_current_dir(self):
-        current = self.root
-        for part in self.current_path[1:]:
-            if part in current['children']:
-                current = current['children'][part]
-            else:
-                return None
-        return current
-
-    def list_dir(self, path=None):
-        if path is None:
-            current = self.get_current_dir()
-        else:
-            current = self._resolve_path(path)
-        if current and current['type'] == 'directory':
-            return sorted(current['children'].keys())
-        return []
-
-    def _resolve_path(self, path):
-        if path.startswith('/'):
-            parts = path.strip('/').split('/')
-            current = self.root
-        else:
-            parts = path.split('/')
-            current = self.get_current_dir()
-
-        for part in parts:
-            if part == '..':
-                if len(self.current_path) > 1:
-                    self.current_path.pop()
-                current = self.get_current_dir()
-            elif part == '.':
-                continue
-            elif part in current['children']:
-                current = current['children'][part]
-            else:
-                return None
-        return current
-
-    def change_dir(self, path):
-        target = self._resolve_path(path)
-        if target and target['type'] == 'directory':
-            if path.startswith('/'):
-                self.current_path = ['/'] + path.strip('/').split('/')
-            else:
-                for part in path.split('/'):
-                    if part == '..':
-                        if len(self.current_path) > 1:
-                            self.current_path.pop()
-                    elif part != '.':
-                        self.current_path.append(part)
-            return True
-        return False
+                           QHBoxLayout, QLabel, QSplitter,
+                           QMessageBox, QPushButton, QTreeView)
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt5.QtGui import QFont
 
-    def get_path(self):
-        return '/'.join(self.current_path)
+import script_runner
+from command_runner import CommandRunner
+from history import CommandHistory, DEFAULT_HISTORY_SIZE
+from hostfs import mount, parse_mount_spec
+from journal import DEFAULT_STATE_DIR, open_state
+from shell_engine import ShellEngine
+from snapshot import load_snapshot
+from vfs import VirtualFileSystem
+from terminal_view import CommandInput, TerminalOutput, DEFAULT_SCROLLBACK
+from tree_model import VfsTreeModel
 
-    def create_file(self, name):
-        current = self.get_current_dir()
-        if current and name not in current['children']:
-            current['children'][name] = {'type': 'file', 'name': name, 'content': ''}
-            return True
-        return False
+DEFAULT_HISTORY_FILE = os.path.join(os.path.expanduser('~'), '.linux_simulator_history')
+STARTUP_BUDGET_MS = 300  # 첫 프롬프트가 보일 때까지의 목표 시간
 
-    def create_dir(self, name):
-        current = self.get_current_dir()
-        if current and name not in current['children']:
-            current['children'][name] = {'type': 'directory', 'name': name, 'children': {}}
-            return True
-        return False
 
-    def read_file(self, path):
-        target = self._resolve_path(path)
-        if target and target['type'] == 'file':
-            return target['content']
-        return None
-
-    def remove(self, path):
-        target = self._resolve_path(path)
-        if target:
-            parent = self.get_current_dir()
-            if parent and target['name'] in parent['children']:
-                del parent['children'][target['name']]
-                return True
+class FirstPaint(QObject):
+    # 위젯이 처음 그려진 뒤(다음 이벤트 루프 틱에) callback을 한 번 부른다
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            QTimer.singleShot(0, self.callback)
         return False
 
+
+class StartupProfile:
+    # --profile-startup: 단계마다 mark()로 시각을 남기고, 첫 프롬프트가 그려지면 단계별 시간을 표준 오류로 보고한다
+    # (파이썬 인터프리터가 뜨기까지의 시간은 들어가지 않는다)
+    def __init__(self, start):
+        self.marks = [('', start)]
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        self.mark('첫 화면 그리기')
+        lines = [f"  {name}: {(end - start) * 1000:.1f} ms"
+                 for (_, start), (name, end) in zip(self.marks, self.marks[1:])]
+        total = (self.marks[-1][1] - self.marks[0][1]) * 1000
+        verdict = '목표 안' if total <= STARTUP_BUDGET_MS else '목표 초과'
+        lines.append(f"  첫 프롬프트까지: {total:.1f} ms (목표 {STARTUP_BUDGET_MS} ms, {verdict})")
+        sys.stderr.write("시작 시간\n" + "\n".join(lines) + "\n")
+
 class LinuxSimulator(QMainWindow):
-    def __init__(self):
+    def __init__(self, scrollback=DEFAULT_SCROLLBACK, vfs=None, history=None):
         super().__init__()
-        self.vfs = VirtualFileSystem()
-        self.command_history = []  # 명령어 히스토리 저장
-        self.editor_mode = False  # 에디터 모드 상태
-        self.editor_buffer = []  # 에디터 버퍼
-        self.editor_filename = ""  # 편집 중인 파일명
-        self.top_mode = False  # top 모드 상태
-        self.commands = {
-            'ls': self.ls_command,
-            'cd': self.cd_command,
-            'pwd': self.pwd_command,
-            'mkdir': self.mkdir_command,
-            'rm': self.rm_command,
-            'cp': self.cp_command,
-            'mv': self.mv_command,
-            'cat': self.cat_command,
-            'touch': self.touch_command,
-            'clear': self.clear_command,
-            'exit': self.exit_command,
-            'echo': self.echo_command,
-            'whoami': self.whoami_command,
-            'date': self.date_command,
-            'help': self.help_command,
-            'history': self.history_command,
-            'vi': self.vi_command,
-            'vim': self.vi_command,
-            'nano': self.nano_command,
-            'top': self.top_command
-        }
+        self.scrollback = scrollback
+        self.engine = ShellEngine(vfs, history=history)
+        # Ctrl-R 역방향 검색 상태 (search_matches가 None이면 검색 중이 아님)
+        self.search_matches = None
+        self.search_match = None
+        self.search_saved = ""
+        self.vfs = self.engine.vfs
+        # 명령은 작업 스레드에서 실행한다 (긴 명령 중에도 창이 멈추지 않고 Ctrl-C로 멈출 수 있다)
+        self.runner = CommandRunner(self.engine, self)
+        self.runner.started.connect(self.command_started)
+        self.runner.output.connect(self.command_output)
+        self.runner.finished.connect(self.command_finished)
+        self.command_interactive = False
+        self.top_timer = QTimer(self)  # top 화면 자동 갱신
+        self.top_timer.timeout.connect(self.refresh_top)
+        self.trace_path = None  # --trace: 닫을 때 Chrome 추적 JSON을 저장할 경로
         self.initUI()
+        self.terminal_output.profiler = self.engine.profiler  # 추적 중이면 화면 그리기 시간도 남긴다
+        # 시작을 늦추지 않도록 미뤄 둔 준비(히스토리 파일 읽기)는 프롬프트가 그려진 뒤에 한다
+        self.startup = None  # --profile-startup이면 StartupProfile
+        FirstPaint(self.command_input, self.first_paint)
         
     def initUI(self):
         self.setWindowTitle('리눅스 명령어 학습 시뮬레이터')
@@ -215,18 +117,23 @@ class LinuxSimulator(QMainWindow):
         # 스플리터로 화면을 상하로 분할
         splitter = QSplitter(Qt.Vertical)
         
-        # 상단 패널 (Windows 환경 시뮬레이션)
-        self.windows_panel = QTextEdit()
-        self.windows_panel.setReadOnly(True)
-        self.windows_panel.setFont(QFont('Consolas', 10))
+        # 상단 패널 (Windows 환경 시뮬레이션): 왼쪽은 폴더 트리, 오른쪽은 동작 메시지
+        self.tree_model = VfsTreeModel(self.vfs, self)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.tree_model)
+        self.tree_view.setUniformRowHeights(True)  # 큰 디렉토리에서도 스크롤이 가볍도록
+        self.tree_view.setColumnWidth(0, 220)
+        self.windows_panel = TerminalOutput(scrollback=1000)
+        windows_splitter = QSplitter(Qt.Horizontal)
+        windows_splitter.addWidget(self.tree_view)
+        windows_splitter.addWidget(self.windows_panel)
+        windows_splitter.setSizes([300, 500])
         
         # 하단 패널 (터미널)
         terminal_widget = QWidget()
         terminal_layout = QVBoxLayout(terminal_widget)
         
-        self.terminal_output = QTextEdit()
-        self.terminal_output.setReadOnly(True)
-        self.terminal_output.setFont(QFont('Consolas', 10))
+        self.terminal_output = TerminalOutput(scrollback=self.scrollback)
         
         # 명령어 입력을 위한 위젯들
         input_widget = QWidget()
@@ -237,8 +144,13 @@ class LinuxSimulator(QMainWindow):
         self.prompt_label.setFont(QFont('Consolas', 10))
         self.prompt_label.setStyleSheet("color: green;")
         
-        self.command_input = QLineEdit()
+        self.command_input = CommandInput()
         self.command_input.returnPressed.connect(self.execute_command)
+        self.command_input.completionRequested.connect(self.complete_command)
+        self.command_input.reverseSearchRequested.connect(self.reverse_search)
+        self.command_input.searchExitRequested.connect(self.exit_search)
+        self.command_input.interruptRequested.connect(self.interrupt)
+        self.command_input.textEdited.connect(self.update_search)
         
         input_layout.addWidget(self.prompt_label)
         input_layout.addWidget(self.command_input)
@@ -247,7 +159,7 @@ class LinuxSimulator(QMainWindow):
         terminal_layout.addWidget(input_widget)
         
         # 스플리터에 위젯 추가
-        splitter.addWidget(self.windows_panel)
+        splitter.addWidget(windows_splitter)
         splitter.addWidget(terminal_widget)
         
         # 스플리터 비율 설정
@@ -265,208 +177,150 @@ class LinuxSimulator(QMainWindow):
         self.update_prompt()
 
     def update_prompt(self):
-        current_path = self.vfs.get_path()
-        if current_path == "/":
-            path_display = "/"
-        else:
-            path_display = current_path
-        self.prompt_label.setText(f"user@ubuntu_Server:{path_display}$ ")
+        self.prompt_label.setText(self.engine.prompt())
 
     def execute_command(self):
+        if self.search_matches is not None:
+            self.exit_search(True)  # 검색 중 Enter는 찾은 명령을 실행
         command = self.command_input.text().strip()
         self.command_input.clear()
         
         if not command:
             return
-            
-        if self.editor_mode:
-            if command == ":wq":
-                self.save_and_exit_editor()
-            elif command == ":q!":
-                self.exit_editor_without_save()
-            elif command == "^X":  # Ctrl+X (nano 종료)
-                self.save_and_exit_editor()
-            elif command == "^C":  # Ctrl+C (nano 취소)
-                self.exit_editor_without_save()
-            else:
-                self.editor_buffer.append(command)
-                self.terminal_output.append(command)
-            return
-            
-        if self.top_mode:
-            if command == "q":
-                self.top_mode = False
-                self.terminal_output.append("top 모드를 종료합니다.")
-                self.update_prompt()
-                return
-            self.show_top_info()
+        # 실행 중인 명령이 있으면 끝난 뒤 차례로 실행된다 (터미널의 미리 입력)
+        self.runner.submit(command)
+
+    def command_started(self, command, interactive):
+        # 에디터/top 모드 입력은 프롬프트 없이 처리
+        self.command_interactive = interactive
+        if not interactive:
+            # 명령어와 프롬프트를 함께 출력
+            self.terminal_output.append(f"{self.prompt_label.text()}{command}")
+
+    def command_output(self, lines):
+        # 실행 중인 명령의 출력 일부 (끝날 때까지 기다리지 않고 바로 보여준다)
+        self.terminal_output.end_live()
+        self.terminal_output.extend(lines)
+
+    def command_finished(self, result):
+        self.render_result(result)
+
+        if result.exit:
+            self.close()
             return
-            
-        # 명령어와 프롬프트를 함께 출력
-        self.terminal_output.append(f"{self.prompt_label.text()}{command}")
-        self.command_history.append(command)  # 명령어 히스토리에 추가
-        
-        # 명령어 파싱
-        parts = command.split()
-        cmd = parts[0]
-        args = parts[1:] if len(parts) > 1 else []
-        
-        if cmd in self.commands:
-            self.commands[cmd](args)
-        else:
-            self.terminal_output.append(f"명령어 '{cmd}'를 찾을 수 없습니다.")
-        
-        self.terminal_output.append("")
+        if not self.command_interactive and not result.live:
+            self.terminal_output.append("")
+        self.update_top_timer()
+        self.update_current_dir()
         self.update_prompt()
-        self.terminal_output.moveCursor(QTextCursor.End)
-        
-    def ls_command(self, args):
-        try:
-            path = args[0] if args else None
-            items = self.vfs.list_dir(path)
-            if items is not None:
-                self.terminal_output.append("\n".join(items))
-                self.update_windows_panel(f"디렉토리 내용을 표시합니다: {path if path else self.vfs.get_path()}")
-            else:
-                self.terminal_output.append(f"디렉토리를 찾을 수 없습니다: {path}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def cd_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: cd <디렉토리>")
+
+    def interrupt(self):
+        # Ctrl-C: 실행 중인 명령을 멈춘다. 실행 중인 것이 없으면 bash처럼 입력 줄을 버린다
+        if self.runner.cancel():
             return
-            
-        try:
-            if self.vfs.change_dir(args[0]):
-                self.terminal_output.append(f"현재 디렉토리: {self.vfs.get_path()}")
-                self.update_windows_panel(f"디렉토리로 이동합니다: {args[0]}")
-                self.update_current_dir()  # 현재 디렉토리 레이블 업데이트
-                self.update_prompt()  # 프롬프트 업데이트
-            else:
-                self.terminal_output.append(f"디렉토리를 찾을 수 없습니다: {args[0]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def pwd_command(self, args):
-        self.terminal_output.append(self.vfs.get_path())
-        self.update_windows_panel(f"현재 경로: {self.vfs.get_path()}")
-        self.update_current_dir()  # 현재 디렉토리 레이블 업데이트
-        
-    def mkdir_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: mkdir <디렉토리명>")
+        if self.engine.top_mode:
+            self.runner.submit('q')
             return
-            
-        try:
-            if self.vfs.create_dir(args[0]):
-                self.terminal_output.append(f"디렉토리 '{args[0]}'가 생성되었습니다.")
-                self.update_windows_panel(f"새 디렉토리 생성: {args[0]}")
-                # 생성된 디렉토리 목록에 추가
-                current_dir = self.vfs.get_current_dir()
-                if current_dir:
-                    current_dir['children'][args[0]] = {
-                        'type': 'directory',
-                        'name': args[0],
-                        'children': {}
-                    }
-            else:
-                self.terminal_output.append(f"디렉토리를 생성할 수 없습니다: {args[0]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def rm_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: rm <파일명>")
+        if self.engine.editor_mode:
+            self.runner.submit('^C' if self.engine.editor_kind == 'nano' else '^[')
             return
-            
-        try:
-            target = self.vfs._resolve_path(args[0])
-            if target:
-                parent = self.vfs.get_current_dir()
-                if parent and target['name'] in parent['children']:
-                    del parent['children'][target['name']]
-                    self.terminal_output.append(f"'{args[0]}'가 삭제되었습니다.")
-                    self.update_windows_panel(f"파일/디렉토리 삭제: {args[0]}")
-                else:
-                    self.terminal_output.append(f"파일이나 디렉토리를 찾을 수 없습니다: {args[0]}")
-            else:
-                self.terminal_output.append(f"파일이나 디렉토리를 찾을 수 없습니다: {args[0]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def cp_command(self, args):
-        if len(args) != 2:
-            self.terminal_output.append("사용법: cp <원본> <대상>")
+        self.exit_search(False)
+        self.terminal_output.append(f"{self.prompt_label.text()}{self.command_input.text()}^C")
+        self.command_input.clear()
+
+    def reverse_search(self):
+        if self.runner.busy or self.engine.in_interactive_mode():
             return
-            
-        try:
-            # 가상 파일 시스템에서는 복사 기능을 구현하지 않음
-            self.terminal_output.append("가상 파일 시스템에서는 복사 기능이 지원되지 않습니다.")
-            self.update_windows_panel(f"복사 작업 시뮬레이션: {args[0]} -> {args[1]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def mv_command(self, args):
-        if len(args) != 2:
-            self.terminal_output.append("사용법: mv <원본> <대상>")
+        if self.search_matches is None:
+            # 검색 시작: 입력 줄은 검색어 입력용으로 비운다
+            self.search_saved = self.command_input.text()
+            self.command_input.clear()
+            self.update_search("", force=True)
             return
-            
-        try:
-            # 가상 파일 시스템에서는 이동 기능을 구현하지 않음
-            self.terminal_output.append("가상 파일 시스템에서는 이동 기능이 지원되지 않습니다.")
-            self.update_windows_panel(f"이동 작업 시뮬레이션: {args[0]} -> {args[1]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def cat_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: cat <파일명>")
+        # 다시 Ctrl-R: 같은 검색어로 더 오래된 명령
+        self.search_match = next(self.search_matches, None) or self.search_match
+        self.show_search()
+
+    def update_search(self, query, force=False):
+        if self.search_matches is None and not force:
             return
-            
-        try:
-            content = self.vfs.read_file(args[0])
-            if content is not None:
-                self.terminal_output.append(content)
-                self.update_windows_panel(f"파일 내용 표시: {args[0]}")
-            else:
-                self.terminal_output.append(f"파일을 찾을 수 없습니다: {args[0]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def touch_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: touch <파일명>")
+        self.search_matches = self.engine.history.search(query) if query else iter(())
+        self.search_match = next(self.search_matches, None)
+        self.show_search()
+
+    def show_search(self):
+        query = self.command_input.text()
+        if self.search_match is None and query:
+            self.prompt_label.setText(f"(failed reverse-i-search)`{query}': ")
+        else:
+            found = self.search_match[1] if self.search_match else ""
+            self.prompt_label.setText(f"(reverse-i-search)`{query}': {found}")
+
+    def exit_search(self, accept):
+        if self.search_matches is None:
             return
-            
-        try:
-            if self.vfs.create_file(args[0]):
-                self.terminal_output.append(f"파일 '{args[0]}'가 생성되었습니다.")
-                self.update_windows_panel(f"새 파일 생성: {args[0]}")
-                # 생성된 파일 목록에 추가
-                current_dir = self.vfs.get_current_dir()
-                if current_dir:
-                    current_dir['children'][args[0]] = {
-                        'type': 'file',
-                        'name': args[0],
-                        'content': ''
-                    }
-            else:
-                self.terminal_output.append(f"파일을 생성할 수 없습니다: {args[0]}")
-        except Exception as e:
-            self.terminal_output.append(f"오류: {str(e)}")
-            
-    def clear_command(self, args):
-        self.terminal_output.clear()
-        self.update_windows_panel("화면을 초기화합니다.")
-        
-    def exit_command(self, args):
-        self.terminal_output.append("프로그램을 종료합니다.")
-        self.close()
-        
+        if accept:
+            text = self.search_match[1] if self.search_match else self.command_input.text()
+        else:
+            text = self.search_saved
+        self.search_matches = None
+        self.search_match = None
+        self.command_input.setText(text)
+        self.update_prompt()
+
+    def complete_command(self):
+        if self.search_matches is not None or self.runner.busy:
+            return
+        # 커서 앞부분만 완성하고 뒷부분은 그대로 둔다
+        text = self.command_input.text()
+        cursor = self.command_input.cursorPosition()
+        completed, candidates, total = self.engine.complete(text[:cursor])
+        if completed != text[:cursor]:
+            self.command_input.setText(completed + text[cursor:])
+            self.command_input.setCursorPosition(len(completed))
+        elif candidates:
+            # 더 채울 것이 없으면 후보를 보여준다
+            self.terminal_output.append(f"{self.prompt_label.text()}{text}")
+            self.terminal_output.append("  ".join(candidates))
+            if total > len(candidates):
+                self.terminal_output.append(f"... 외 {total - len(candidates)}개")
+
+    def render_result(self, result):
+        if result.clear:
+            self.terminal_output.clear()
+        if result.live:
+            self.terminal_output.show_live(result.stdout)
+        else:
+            self.terminal_output.end_live()
+            self.terminal_output.extend(result.stdout)
+        self.terminal_output.extend(result.stderr)
+        self.windows_panel.extend(result.panel)
+
+    def update_top_timer(self):
+        # top 모드 동안만 타이머를 돌린다. 간격은 top -d / 'd 초' 입력을 따른다
+        if self.engine.top_mode:
+            self.top_timer.start(int(self.engine.top_delay * 1000))
+        else:
+            self.top_timer.stop()
+
+    def refresh_top(self):
+        if not self.engine.top_mode:
+            self.top_timer.stop()
+            return
+        if self.runner.busy:
+            return  # 키 입력을 처리하는 중이면 이번 갱신은 건너뛴다
+        self.render_result(self.engine.top_tick())
+
+    def first_paint(self):
+        if self.startup is not None:
+            self.startup.report()
+            self.close()
+            return
+        if not self.runner.busy:  # 실행 중인 명령이 있으면 그 명령이 (작업 스레드에서) 읽는다
+            self.engine.history.load()
+
     def update_windows_panel(self, message):
         self.windows_panel.append(message)
-        self.windows_panel.moveCursor(QTextCursor.End)
 
     def show_creator_info(self):
         msg = QMessageBox()
@@ -480,144 +334,89 @@ class LinuxSimulator(QMainWindow):
     def update_current_dir(self):
         self.current_dir_label.setText(f"현재 디렉토리: {self.vfs.get_path()}")
 
-    def echo_command(self, args):
-        if not args:
-            self.terminal_output.append("")
-            return
-        self.terminal_output.append(" ".join(args))
-        self.update_windows_panel(f"텍스트 출력: {' '.join(args)}")
-
-    def whoami_command(self, args):
-        self.terminal_output.append("user")
-        self.update_windows_panel("현재 사용자 정보 표시")
-
-    def date_command(self, args):
-        from datetime import datetime
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.terminal_output.append(current_time)
-        self.update_windows_panel("현재 날짜와 시간 표시")
-
-    def help_command(self, args):
-        help_text = """
-사용 가능한 명령어:
-- ls: 디렉토리 내용 보기
-- cd: 디렉토리 이동
-- pwd: 현재 작업 디렉토리 확인
-- mkdir: 새 디렉토리 생성
-- rm: 파일/디렉토리 삭제
-- cp: 파일/디렉토리 복사
-- mv: 파일/디렉토리 이동
-- cat: 파일 내용 보기
-- touch: 빈 파일 생성
-- clear: 화면 지우기
-- exit: 프로그램 종료
-- echo: 텍스트 출력
-- whoami: 현재 사용자 정보
-- date: 현재 날짜와 시간
-- help: 이 도움말 보기
-- history: 명령어 히스토리 보기
-- vi/vim: 텍스트 에디터 (기본 모드)
-- nano: 텍스트 에디터 (간단 모드)
-        """
-        self.terminal_output.append(help_text)
-        self.update_windows_panel("도움말 정보 표시")
-
-    def history_command(self, args):
-        if not self.command_history:
-            self.terminal_output.append("명령어 히스토리가 없습니다.")
-            return
-        for i, cmd in enumerate(self.command_history, 1):
-            self.terminal_output.append(f"{i}  {cmd}")
-        self.update_windows_panel("명령어 히스토리 표시")
-
-    def top_command(self, args):
-        self.top_mode = True
-        self.terminal_output.append("top - 시뮬레이션된 프로세스 정보")
-        self.terminal_output.append("종료하려면 'q'를 입력하세요.")
-        self.terminal_output.append("")
-        self.show_top_info()
-        self.update_windows_panel("시스템 프로세스 정보 표시")
+    def closeEvent(self, event):
+        self.runner.wait()  # 실행 중인 명령을 멈추고 기다린다
+        self.engine.history.close()  # 아직 fsync하지 않은 히스토리를 디스크에 남긴다
+        if self.vfs.journal is not None:
+            self.vfs.journal.close()  # 파일 시스템 변경 기록도 마저 남긴다
+        if self.trace_path:
+            self.engine.profiler.dump_trace(self.trace_path)
+        super().closeEvent(event)
 
-    def show_top_info(self):
-        import random
-        import time
-        
-        # 시뮬레이션된 프로세스 정보 생성
-        processes = [
-            {"PID": 1, "USER": "root", "PR": 20, "NI": 0, "VIRT": "100m", "RES": "10m", "SHR": "5m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:10", "COMMAND": "init"},
-            {"PID": 2, "USER": "root", "PR": 20, "NI": 0, "VIRT": "200m", "RES": "20m", "SHR": "10m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:20", "COMMAND": "kthreadd"},
-            {"PID": 3, "USER": "user", "PR": 20, "NI": 0, "VIRT": "300m", "RES": "30m", "SHR": "15m", "S": "R", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:30", "COMMAND": "bash"},
-            {"PID": 4, "USER": "user", "PR": 20, "NI": 0, "VIRT": "400m", "RES": "40m", "SHR": "20m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:40", "COMMAND": "python"},
-            {"PID": 5, "USER": "user", "PR": 20, "NI": 0, "VIRT": "500m", "RES": "50m", "SHR": "25m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:50", "COMMAND": "top"}
-        ]
-        
-        # 헤더 출력
-        self.terminal_output.append("PID USER      PR  NI    VIRT    RES    SHR S  %CPU %MEM     TIME+ COMMAND")
-        
-        # 프로세스 정보 출력
-        for proc in processes:
-            line = f"{proc['PID']:<4} {proc['USER']:<9} {proc['PR']:<3} {proc['NI']:<3} {proc['VIRT']:<7} {proc['RES']:<7} {proc['SHR']:<7} {proc['S']} {proc['CPU']:>4} {proc['MEM']:>4} {proc['TIME']:>9} {proc['COMMAND']}"
-            self.terminal_output.append(line)
-        
-        # 시스템 정보 출력
-        self.terminal_output.append("")
-        self.terminal_output.append(f"Tasks: {len(processes)} total, 1 running, {len(processes)-1} sleeping, 0 stopped, 0 zombie")
-        self.terminal_output.append(f"Cpu(s): {random.randint(1, 100)}%us, {random.randint(1, 50)}%sy, {random.randint(0, 20)}%ni, {random.randint(1, 50)}%id, {random.randint(0, 10)}%wa, {random.randint(0, 5)}%hi, {random.randint(0, 5)}%si, {random.randint(0, 5)}%st")
-        self.terminal_output.append(f"Mem: {random.randint(1000, 8000)}M total, {random.randint(500, 4000)}M used, {random.randint(500, 4000)}M free, {random.randint(100, 1000)}M buffers")
-        self.terminal_output.append(f"Swap: {random.randint(1000, 4000)}M total, {random.randint(0, 1000)}M used, {random.randint(1000, 4000)}M free, {random.randint(500, 2000)}M cached")
-        self.terminal_output.append("")
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='리눅스 명령어 학습 시뮬레이터')
+    parser.add_argument('--scrollback', type=int, default=DEFAULT_SCROLLBACK,
+                        help='터미널에 보관할 최대 줄 수')
+    parser.add_argument('--image', metavar='PATH',
+                        help='시작할 때 불러올 파일 시스템 스냅샷')
+    parser.add_argument('--script', metavar='PATH',
+                        help="GUI 없이 실행할 스크립트 파일 ('-'이면 표준 입력)")
+    parser.add_argument('--save-image', metavar='PATH',
+                        help='스크립트 실행 뒤 파일 시스템을 스냅샷으로 저장')
+    parser.add_argument('--history', metavar='PATH', default=DEFAULT_HISTORY_FILE,
+                        help='명령어 히스토리를 저장할 파일 (빈 문자열이면 저장하지 않음)')
+    parser.add_argument('--history-size', type=int, default=DEFAULT_HISTORY_SIZE,
+                        help='보관할 최대 히스토리 수')
+    parser.add_argument('--state', metavar='DIR', default=DEFAULT_STATE_DIR,
+                        help='파일 시스템을 자동 저장할 폴더 (빈 문자열이면 저장하지 않음)')
+    parser.add_argument('--mount', metavar='HOST:PATH', action='append', type=parse_mount_spec, default=[],
+                        help='실제 폴더를 읽기 전용으로 붙이기 (예: --mount ~/data:/mnt/data, 여러 번 쓸 수 있음)')
+    parser.add_argument('--profile', action='store_true',
+                        help='명령별 실행 시간을 처음부터 측정 (perfstat으로 보기, --script면 끝난 뒤 표준 오류로)')
+    parser.add_argument('--profile-memory', action='store_true',
+                        help='--profile에 메모리 사용량도 측정 (tracemalloc, 느려짐)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='명령, 파일 시스템 연산, 화면 그리기를 Chrome 추적 JSON으로 저장 (끝날 때)')
+    parser.add_argument('--replay', metavar='DIR',
+                        help='GUI 없이 폴더 안의 기록(한 줄에 명령 하나)들을 여러 코어에서 다시 실행해 결과를 JSONL로 (채점용)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='--replay의 작업 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='첫 프롬프트가 보일 때까지의 단계별 시간을 표준 오류로 보고하고 끝내기')
+    return parser.parse_known_args(argv)
 
-    def vi_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: vi <파일명>")
-            return
-            
-        self.editor_filename = args[0]
-        self.editor_mode = True
-        self.editor_buffer = []
-        self.terminal_output.append(f"'{self.editor_filename}' 파일 편집 모드로 진입했습니다.")
-        self.terminal_output.append("편집을 마치려면 :wq 를 입력하세요.")
-        self.terminal_output.append("저장하지 않고 종료하려면 :q! 를 입력하세요.")
-        self.update_windows_panel(f"파일 편집 시작: {self.editor_filename}")
-
-    def nano_command(self, args):
-        if not args:
-            self.terminal_output.append("사용법: nano <파일명>")
-            return
-            
-        self.editor_filename = args[0]
-        self.editor_mode = True
-        self.editor_buffer = []
-        self.terminal_output.append(f"'{self.editor_filename}' 파일 편집 모드로 진입했습니다.")
-        self.terminal_output.append("편집을 마치려면 ^X (Ctrl+X)를 입력하세요.")
-        self.terminal_output.append("저장하지 않고 종료하려면 ^C (Ctrl+C)를 입력하세요.")
-        self.update_windows_panel(f"파일 편집 시작: {self.editor_filename}")
-
-    def save_and_exit_editor(self):
-        if self.editor_filename:
-            content = "\n".join(self.editor_buffer)
-            current_dir = self.vfs.get_current_dir()
-            if current_dir:
-                current_dir['children'][self.editor_filename] = {
-                    'type': 'file',
-                    'name': self.editor_filename,
-                    'content': content
-                }
-                self.terminal_output.append(f"'{self.editor_filename}' 파일이 저장되었습니다.")
-                self.update_windows_panel(f"파일 저장 완료: {self.editor_filename}")
-        self.editor_mode = False
-        self.editor_buffer = []
-        self.editor_filename = ""
-
-    def exit_editor_without_save(self):
-        self.terminal_output.append("편집을 취소하고 종료합니다.")
-        self.update_windows_panel("파일 편집 취소")
-        self.editor_mode = False
-        self.editor_buffer = []
-        self.editor_filename = ""
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    ex = LinuxSimulator()
+    if getattr(sys, 'frozen', False):
+        # 실행 파일(PyInstaller)에서 grep -r의 작업 프로세스가 창을 다시 띄우지 않도록
+        import multiprocessing
+        multiprocessing.freeze_support()
+    options, qt_args = parse_args(sys.argv[1:])
+    startup = StartupProfile(STARTUP_TIME) if options.profile_startup else None
+    if startup is not None:
+        startup.mark('모듈 불러오기')
+    if options.replay:
+        # 채점용 재실행: 기록마다 --image(없으면 기본 트리)에서 새로 시작한다
+        import replay
+        sys.exit(replay.run(options.replay, options.image, options.jobs))
+    if options.script:
+        # 스크립트 모드: 창을 띄우지 않고 실행 결과를 표준 출력으로 보낸다
+        sys.exit(script_runner.run_with_image(options.script, options.image, options.save_image,
+                                              options.mount, options.profile, options.profile_memory,
+                                              options.trace))
+    if options.state:
+        # 마지막 스냅샷 + 저널로 이전 상태를 되살린다 (처음이면 --image나 기본 트리에서 시작)
+        vfs = open_state(options.state, options.image)
+    else:
+        vfs = load_snapshot(options.image) if options.image else None
+    if options.mount:
+        vfs = vfs if vfs is not None else VirtualFileSystem()
+        for host_dir, path in options.mount:
+            mount(vfs, os.path.expanduser(host_dir), path)
+    history = CommandHistory(options.history or None, options.history_size)
+    if startup is not None:
+        startup.mark('파일 시스템 복원')
+    app = QApplication(sys.argv[:1] + qt_args)
+    if startup is not None:
+        startup.mark('Qt 시작')
+    ex = LinuxSimulator(scrollback=options.scrollback, vfs=vfs, history=history)
+    if startup is not None:
+        startup.mark('창 만들기')
+        ex.startup = startup
+    if options.profile or options.profile_memory:
+        ex.engine.profiler.enable(memory=options.profile_memory)
+    if options.trace:
+        ex.engine.profiler.start_trace(ex.vfs)
+        ex.trace_path = options.trace
     ex.show()
     sys.exit(app.exec_()) 
\ No newline at end of file
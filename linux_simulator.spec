@@ -1,5 +1,25 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# 시뮬레이터는 QtCore/QtGui/QtWidgets만 쓴다. 나머지 Qt 모듈과 플러그인, 번역 파일은 빼서
+# 실행 파일을 줄이고 시작할 때 풀어야 할 파일을 줄인다 (build/linux_simulator/xref, Analysis-00.toc 기준).
+EXCLUDES = [
+    'PyQt5.QtNetwork', 'PyQt5.QtQml', 'PyQt5.QtQuick', 'PyQt5.QtQuickWidgets', 'PyQt5.QtSvg',
+    'PyQt5.QtWebSockets', 'PyQt5.QtDBus', 'PyQt5.QtOpenGL', 'PyQt5.QtPrintSupport', 'PyQt5.QtSql',
+    'PyQt5.QtXml', 'PyQt5.QtTest', 'PyQt5.QtMultimedia', 'PyQt5.QtBluetooth', 'PyQt5.QtPositioning',
+    'tkinter', 'unittest', 'pydoc', 'doctest', 'pdb', 'xmlrpc', 'asyncio',
+]
+# 위 모듈이 끌고 오는 Qt DLL과 쓰지 않는 플러그인 (경로에 이 글자가 들어가면 뺀다)
+UNUSED_QT_FILES = [
+    'Qt5Network', 'Qt5Qml', 'Qt5QmlModels', 'Qt5Quick', 'Qt5Svg', 'Qt5WebSockets', 'Qt5DBus',
+    'opengl32sw', 'd3dcompiler_47', 'libEGL', 'libGLESv2',
+    'qwebgl', 'qminimal', 'qoffscreen', 'qxdgdesktopportal', 'qtuiotouchplugin',
+    'iconengines', 'imageformats', 'translations',
+]
+
+
+def _used(entry):
+    return not any(name in entry[0] for name in UNUSED_QT_FILES)
+
 
 a = Analysis(
     ['linux_simulator.py'],
@@ -10,10 +30,12 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
     optimize=0,
 )
+a.binaries = [entry for entry in a.binaries if _used(entry)]
+a.datas = [entry for entry in a.datas if _used(entry)]
 pyz = PYZ(a.pure)
 
 exe = EXE(
@@ -0,0 +1,185 @@
+import bisect
+import fnmatch
+import re
+
+from vfs import VfsListener
+
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+class NameIndex(VfsListener):
+    # 파일 이름 색인: 이름 -> 노드 집합, 그리고 접두/접미 검색용 정렬 목록.
+    # 처음 검색할 때 한 번 전체를 훑어 만들고, 이후에는 변경 알림으로만 갱신한다.
+    # cp -r로 만든 지연 복사본은 색인에 넣지 않고, 검색 시 원본의 clones를 따라가 경로를 만든다.
+    # base가 주어지면(공유 이미지 위의 세션) 아직 복사되지 않은 부분은 base 색인에서 찾는다.
+    # 이미지 노드의 clones에는 모든 세션의 사본이 섞여 있으므로, 이 트리의 사본만 mirrors에 따로 둔다.
+    def __init__(self, vfs, base=None):
+        self.vfs = vfs
+        self.base = base
+        self.by_name = {}  # 이름 -> 노드 집합
+        self.names = []  # 정렬된 이름 목록 (접두 검색)
+        self.reversed_names = []  # 뒤집은 이름의 정렬 목록 (접미 검색, 예: *.log)
+        self.mirrors = {}  # 이미지 노드 -> 이 트리에서 그 노드를 지연 복사 중인 노드 집합
+        self.mirror_origin = {}  # 지연 복사 노드 -> 이미지 노드
+        self.built = False
+        vfs.add_listener(self)
+
+    def build(self):
+        stack = [self.vfs.root]
+        while stack:
+            node = stack.pop()
+            kids = node._children
+            if kids is None:
+                self._track_lazy(node)  # 파일이거나 아직 구체화되지 않은 지연 복사본
+                continue
+            for child in kids.values():
+                self._add(child)
+                stack.append(child)
+        self.built = True
+
+    def _add(self, node):
+        nodes = self.by_name.get(node.name)
+        if nodes is None:
+            nodes = self.by_name[node.name] = set()
+            bisect.insort(self.names, node.name)
+            bisect.insort(self.reversed_names, node.name[::-1])
+        nodes.add(node)
+
+    def _discard(self, node, name=None):
+        name = node.name if name is None else name
+        nodes = self.by_name.get(name)
+        if nodes is None:
+            return
+        nodes.discard(node)
+        if not nodes:
+            del self.by_name[name]
+            del self.names[bisect.bisect_left(self.names, name)]
+            reversed_name = name[::-1]
+            del self.reversed_names[bisect.bisect_left(self.reversed_names, reversed_name)]
+
+    def _track_lazy(self, node):
+        # 이미지 노드를 가리키는 이 트리의 지연 복사본을 기록한다
+        origin = node.origin
+        if self.base is None or origin is None:
+            return
+        root = origin
+        while root.parent is not None:
+            root = root.parent
+        if root is self.vfs.root:
+            return  # 같은 트리 안의 사본은 origin.clones로 충분하다
+        self.mirrors.setdefault(origin, set()).add(node)
+        self.mirror_origin[node] = origin
+
+    def _untrack_lazy(self, node):
+        origin = self.mirror_origin.pop(node, None)
+        if origin is not None:
+            mirrors = self.mirrors[origin]
+            mirrors.discard(node)
+            if not mirrors:
+                del self.mirrors[origin]
+
+    # 변경 알림
+    def node_added(self, node):
+        if self.built:
+            self._add(node)
+            self._track_lazy(node)
+
+    def children_materialized(self, directory):
+        if self.built:
+            self._untrack_lazy(directory)
+            for child in directory._children.values():
+                self._add(child)
+                self._track_lazy(child)
+
+    def node_removed(self, node, old_parent):
+        if not self.built:
+            return
+        # 삭제된 하위 트리를 색인에서 뺀다. 단, 아직 누군가 지연 복사 중인 디렉토리는
+        # 그 사본의 경로를 만드는 데 필요하므로 남겨 둔다.
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._untrack_lazy(current)
+            if current.clones:
+                continue
+            self._discard(current)
+            kids = current._children
+            if kids:
+                stack.extend(kids.values())
+
+    def node_moved(self, node, old_parent, old_name):
+        if self.built and old_name != node.name:
+            self._discard(node, old_name)
+            self._add(node)
+
+    # 검색
+    def _ensure_built(self):
+        if not self.built:
+            self.build()
+
+    def _range(self, names, prefix):
+        start = bisect.bisect_left(names, prefix)
+        end = bisect.bisect_left(names, prefix + '\uffff')
+        return names[start:end]
+
+    def match_names(self, pattern):
+        # 패턴에 맞는 이름 목록. 와일드카드가 없으면 해시 조회, 앞/뒤에 고정 문자열이 있으면 이분 탐색
+        self._ensure_built()
+        if not GLOB_CHARS.search(pattern):
+            return [pattern] if pattern in self.by_name else []
+        first = GLOB_CHARS.search(pattern).start()
+        last = max(pattern.rfind('*'), pattern.rfind('?'), pattern.rfind(']'))
+        if first > 0:
+            candidates = self._range(self.names, pattern[:first])
+        elif last < len(pattern) - 1:
+            suffix = pattern[last + 1:]
+            candidates = [name[::-1] for name in self._range(self.reversed_names, suffix[::-1])]
+        else:
+            candidates = self.names
+        if pattern == '*':
+            return list(candidates)
+        match = re.compile(fnmatch.translate(pattern)).match
+        return [name for name in candidates if match(name)]
+
+    def lookup(self, pattern):
+        nodes = []
+        for name in self.match_names(pattern):
+            nodes.extend(self.by_name[name])
+        return nodes
+
+    def paths(self, node, in_base=False):
+        # 노드의 절대 경로들. 상위 디렉토리를 지연 복사 중인 사본이 있으면 그 경로도 포함한다.
+        # in_base: node가 공유 이미지 쪽 노드일 때 (이 트리의 사본을 통해서만 보인다)
+        results = []
+        self._collect(node, '', results, in_base)
+        return results
+
+    def _collect(self, node, suffix, results, in_base):
+        current = node
+        while current.parent is not None:
+            suffix = '/' + current.name + suffix
+            parent = current.parent
+            clones = self.mirrors.get(parent) if in_base else parent.clones
+            if clones:
+                for clone in clones:
+                    self._collect(clone, suffix, results, False)
+            current = parent
+        if not in_base and current is self.vfs.root:
+            results.append(suffix or '/')
+
+    def search(self, pattern):
+        # (경로, 노드) 목록. 더 이상 어디에서도 보이지 않는 노드는 이때 색인에서 정리한다.
+        found = []
+        for node in self.lookup(pattern):
+            paths = self.paths(node)
+            if not paths:
+                self._discard(node)
+                continue
+            for path in paths:
+                found.append((path, node))
+        if self.base is not None:
+            for node in self.base.lookup(pattern):
+                for path in self.paths(node, in_base=True):
+                    found.append((path, node))
+        found.sort(key=lambda item: item[0])
+        return found
@@ -0,0 +1,102 @@
+import atexit
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# grep -r의 병렬 실행. 찾을 내용을 조각으로 나눠 프로세스 풀에서 동시에 검사한다 (GIL을 피해 여러 코어 사용).
+# 메모리 안의 큰 파일은 줄 경계에서 나눠 넘기고, 호스트 파일은 경로만 넘겨 자식 프로세스가 직접 읽는다
+# (내용을 넘기는 비용이 없다). 풀은 처음 쓸 때 만들어 두고 계속 쓴다.
+# GUI는 스레드를 쓰므로 fork 대신 forkserver로 자식을 만든다 (Qt 스레드가 있는 프로세스를 복제하지 않도록).
+WAIT_SECONDS = 0.05  # 결과를 기다리는 동안 이 간격으로 취소를 확인한다
+PARALLEL_BYTES = 8 << 20  # 찾을 내용이 이보다 작으면 그냥 한 프로세스에서
+CHUNK_CHARS = 4 << 20  # 메모리 안의 큰 파일은 이만큼씩 (줄 경계에서) 나눈다
+
+_pool = None
+
+
+def workers():
+    return os.cpu_count() or 1
+
+
+def available(total_bytes):
+    return workers() > 1 and total_bytes >= PARALLEL_BYTES
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        _pool = ProcessPoolExecutor(workers(), mp_context=multiprocessing.get_context(method))
+        atexit.register(_pool.shutdown, cancel_futures=True)
+    return _pool
+
+
+def _discard():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def split(text):
+    # 큰 글자를 줄 경계에서 나눈 조각 목록 (search()의 조각 형식)
+    chunks = []
+    start = 0
+    line = 1
+    while start < len(text):
+        end = text.find('\n', start + CHUNK_CHARS)
+        end = len(text) if end < 0 else end + 1
+        chunks.append((text[start:end], False, line))
+        line += text.count('\n', start, end)
+        start = end
+    return chunks
+
+
+def _search(pattern, ignore_case, invert, count_only, source, host, first):
+    # 자식 프로세스에서 실행: 맞는 (줄 번호, 줄) 목록, count_only면 개수
+    regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+    if host:
+        with open(source, 'rb') as f:
+            source = f.read().decode('utf-8', 'replace')
+    lines = source.split('\n')
+    if source.endswith('\n'):
+        lines.pop()
+    search = regex.search
+    if count_only:
+        return sum(1 for line in lines if (search(line) is None) == invert)
+    return [(number, line) for number, line in enumerate(lines, first) if (search(line) is None) == invert]
+
+
+def _wait(future, check):
+    while True:
+        if check is not None:
+            check()
+        try:
+            return future.result(WAIT_SECONDS)
+        except TimeoutError:
+            pass
+
+
+def search(pattern, ignore_case, invert, count_only, jobs, check=None):
+    # jobs: [(파일 표시 이름, 조각 목록)], 조각은 (글자 또는 호스트 경로, 호스트 여부, 첫 줄 번호)
+    # 파일 순서대로 (이름, 맞는 (줄 번호, 줄) 목록)을 조각마다, count_only면 (이름, 개수)를 파일마다 돌려준다.
+    # check()는 기다리는 동안 불러 취소를 확인한다 (예외를 던지면 남은 조각은 버린다).
+    pool = _executor()
+    futures = [[pool.submit(_search, pattern, ignore_case, invert, count_only, source, host, first)
+                for source, host, first in chunks] for name, chunks in jobs]
+    try:
+        for (name, chunks), pending in zip(jobs, futures):
+            if count_only:
+                yield name, sum(_wait(future, check) for future in pending)
+            else:
+                for future in pending:
+                    yield name, _wait(future, check)
+    except BrokenProcessPool:
+        _discard()  # 자식 프로세스가 죽었다: 다음 grep -r 때 새로 만든다
+        raise
+    finally:
+        for pending in futures:
+            for future in pending:
+                future.cancel()
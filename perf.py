@@ -0,0 +1,175 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 명령 단위 성능 측정 (perfstat, --profile, --trace)
+# 꺼져 있을 때는 ShellEngine.execute가 enabled 하나만 확인하므로 비용이 거의 없다.
+# 켜면 명령마다 걸린 시간(벽시계/CPU), 출력 줄 수와 글자 수, (tracemalloc을 켰으면) 최대 추가 메모리를 모은다.
+# 추적(trace)을 켜면 명령, 파일 시스템 연산, 화면 그리기를 Chrome 추적 형식(chrome://tracing, Perfetto)으로 남긴다.
+SAMPLES_PER_COMMAND = 1000  # 명령마다 보관할 최근 측정값 수 (p99까지 볼 수 있을 만큼)
+MAX_TRACE_EVENTS = 1000000  # 추적 기록 상한 (넘으면 더 남기지 않는다)
+PERCENTILES = (50, 95, 99)
+# 추적할 때 감싸는 파일 시스템 연산
+VFS_OPERATIONS = ('read_file', 'read_lines', 'list_dir', 'list_entries', 'change_dir', 'create_file',
+                  'create_dir', 'write_file', 'write_lines', 'remove', 'copy', 'move')
+
+
+def cpu_times():
+    # 이 스레드의 (user, sys) CPU 시간. 스레드별 값이 없는 운영체제에서는 프로세스 전체
+    if resource is not None and hasattr(resource, 'RUSAGE_THREAD'):
+        usage = resource.getrusage(resource.RUSAGE_THREAD)
+        return usage.ru_utime, usage.ru_stime
+    times = os.times()
+    return times.user, times.system
+
+
+def percentile(ordered, p):
+    # 정렬된 목록의 p백분위수 (nearest-rank)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+def command_name(command, mode=None):
+    # 통계를 묶을 이름: 파이프라인이면 단계별 명령 이름을 이어 붙인다 (cat|grep)
+    if mode is not None:
+        return f"<{mode}>"
+    names = [part.split(None, 1)[0] for part in command.split('|') if part.strip()]
+    return '|'.join(names) or command
+
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False  # 명령별 통계 수집
+        self.tracing = False  # Chrome 추적 기록
+        self.memory = False  # tracemalloc으로 메모리 측정
+        self.stats = {}  # 명령 이름 -> deque[(벽시계 초, CPU 초, 출력 줄, 출력 글자, 추가 메모리 바이트)]
+        self.events = []  # Chrome 추적 이벤트
+        self._origin = time.perf_counter()
+        self._traced_vfs = None
+        self._own_tracemalloc = False  # tracemalloc을 이 측정기가 켰는지 (끌 때 남이 켠 것은 두고)
+
+    # 켜고 끄기
+    def enable(self, memory=False):
+        self.enabled = True
+        if memory and not self.memory:
+            import tracemalloc  # 불러오는 데 시간이 걸려 메모리를 잴 때만
+            self.memory = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._own_tracemalloc = True
+
+    def disable(self):
+        self.enabled = False
+        if self.memory:
+            self.memory = False
+            if self._own_tracemalloc:
+                import tracemalloc
+                self._own_tracemalloc = False
+                tracemalloc.stop()
+
+    def reset(self):
+        self.stats.clear()
+        self.events = []
+
+    def start_trace(self, vfs=None):
+        # vfs가 주어지면 그 파일 시스템의 연산도 감싼다 (인스턴스 속성으로 덮어써서, 끄면 원래대로)
+        self.enable(self.memory)
+        self.tracing = True
+        if vfs is not None and self._traced_vfs is None:
+            for name in VFS_OPERATIONS:
+                setattr(vfs, name, self._traced(getattr(vfs, name), name))
+            self._traced_vfs = vfs
+
+    def stop_trace(self):
+        self.tracing = False
+        if self._traced_vfs is not None:
+            for name in VFS_OPERATIONS:
+                delattr(self._traced_vfs, name)
+            self._traced_vfs = None
+
+    def dump_trace(self, path):
+        import json
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return len(self.events)
+
+    # 기록
+    def begin(self, command, mode=None):
+        # 명령 하나의 측정 시작. end()에 그대로 넘긴다
+        if self.memory:
+            import tracemalloc
+            tracemalloc.reset_peak()
+            memory = tracemalloc.get_traced_memory()[0]
+        else:
+            memory = 0
+        return [command_name(command, mode), command, time.perf_counter(), time.thread_time(), memory, 0, 0]
+
+    def counting(self, record, sink):
+        # 출력을 조금씩 넘기는 sink를 감싸 넘긴 줄 수와 글자 수를 센다
+        def counted(lines):
+            record[5] += len(lines)
+            record[6] += sum(map(len, lines))
+            sink(lines)
+        return counted
+
+    def end(self, record, result):
+        name, command, start, cpu_start, memory, lines, chars = record
+        end = time.perf_counter()
+        cpu = time.thread_time() - cpu_start
+        allocated = 0
+        if self.memory:
+            import tracemalloc
+            allocated = tracemalloc.get_traced_memory()[1] - memory
+        lines += len(result.stdout)
+        chars += sum(map(len, result.stdout))
+        samples = self.stats.get(name)
+        if samples is None:
+            samples = self.stats[name] = deque(maxlen=SAMPLES_PER_COMMAND)
+        samples.append((end - start, cpu, lines, chars, allocated))
+        if self.tracing:
+            self.add_event(command, 'command', start, end,
+                           {'status': result.status, 'lines': lines, 'cpu_ms': round(cpu * 1000, 3)})
+
+    def add_event(self, name, category, start, end, args=None):
+        if len(self.events) >= MAX_TRACE_EVENTS:
+            return
+        event = {'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                 'ts': (start - self._origin) * 1e6, 'dur': (end - start) * 1e6}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def _traced(self, method, name):
+        def traced(*args, **kwargs):
+            if not self.tracing:
+                return method(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add_event(name, 'vfs', start, time.perf_counter(), {'path': str(args[0])} if args else None)
+        return traced
+
+    # 보고
+    def summary(self):
+        # perfstat 표: 명령마다 횟수, 벽시계 p50/p95/p99, CPU p50, 평균 출력 줄 수, 최대 추가 메모리
+        # (한글은 고정폭 글꼴에서 두 칸이라 top처럼 머리글은 영어로)
+        lines = [f"{'COMMAND':<18}{'CALLS':>6}{'P50 ms':>10}{'P95 ms':>10}{'P99 ms':>10}{'CPU P50':>10}"
+                 f"{'LINES':>10}" + (f"{'PEAK':>12}" if self.memory else '')]
+        for name in sorted(self.stats, key=lambda key: -sum(sample[0] for sample in self.stats[key])):
+            samples = list(self.stats[name])
+            wall = sorted(sample[0] for sample in samples)
+            cpu = sorted(sample[1] for sample in samples)
+            p50, p95, p99 = (percentile(wall, p) * 1000 for p in PERCENTILES)
+            line = (f"{name[:17]:<18}{len(samples):>6}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}"
+                    f"{percentile(cpu, 50) * 1000:>10.2f}{sum(sample[2] for sample in samples) // len(samples):>10}")
+            if self.memory:
+                line += f"{max(sample[4] for sample in samples) / 1024:>10.0f}KB"
+            lines.append(line)
+        return lines
@@ -0,0 +1,218 @@
+import bisect
+import itertools
+
+# vi/nano 편집 버퍼 (피스 테이블)
+# 처음 연 내용(원본)은 복사하지 않고, 편집은 "어느 버퍼의 어디부터 어디까지"라는 조각 목록만 바꾼다.
+# 조각은 항상 줄 경계에서 나뉘므로 줄 단위 편집(:n, dd, o)은 조각 수에만 비례한다.
+# 저장할 때는 조각 목록을 복사한 PieceTable을 그대로 노드 내용(지연 내용)으로 넣는다.
+INDEX_CHUNK = 1 << 14  # 줄 색인: 이만큼(글자)마다 누적 줄바꿈 수를 세어 둔다
+
+
+def _utf8_len(text, start, end):
+    if text.isascii():
+        return end - start
+    return len(text[start:end].encode('utf-8'))
+
+
+class LineBuffer:
+    # 조각들이 가리키는 문자열과 그 줄 색인. 색인은 줄 수를 셀 때 한 번 만든다 (str.count, C 속도)
+    __slots__ = ('text', '_ends')
+
+    def __init__(self, text):
+        self.text = text
+        self._ends = None  # 덩어리 i까지의 누적 줄바꿈 수
+
+    def _index(self):
+        ends = self._ends
+        if ends is None:
+            text = self.text
+            ends = self._ends = list(itertools.accumulate(
+                text.count('\n', start, start + INDEX_CHUNK) for start in range(0, len(text), INDEX_CHUNK)))
+        return ends
+
+    def count(self):
+        # 전체 줄바꿈 수 (색인을 만들면서 센다)
+        ends = self._index()
+        return ends[-1] if ends else 0
+
+    def newline(self, n):
+        # n번째(0부터) 줄바꿈의 위치
+        ends = self._index()
+        chunk = bisect.bisect_right(ends, n)
+        seen = ends[chunk - 1] if chunk else 0
+        pos = chunk * INDEX_CHUNK
+        find = self.text.find
+        for _ in range(n - seen + 1):
+            pos = find('\n', pos) + 1
+        return pos - 1
+
+
+class PieceTable:
+    # 조각: (버퍼, 시작, 끝, 버퍼에서 시작 앞의 줄바꿈 수, 조각 안의 줄바꿈 수, 바이트 수)
+    # 모든 줄은 줄바꿈으로 끝나게 보관한다. 원본이 줄바꿈 없이 끝났으면 eol=False로 기억해 두고
+    # 내보낼 때(load, length) 마지막 줄바꿈 하나를 뺀다.
+    # 지연 내용 규약(load(), iter_lines(), length, raw())을 따르므로 노드 내용으로 바로 쓸 수 있다.
+    __slots__ = ('pieces', 'lines', 'nbytes', 'eol', '_starts')
+
+    def __init__(self, text='', nbytes=None):
+        # nbytes: text의 UTF-8 바이트 수를 이미 알면 (노드 size) 다시 세지 않는다
+        self.pieces = []
+        self.lines = 0
+        self.nbytes = 0
+        self.eol = True
+        self._starts = None
+        if not text:
+            return
+        if nbytes is None:
+            nbytes = _utf8_len(text, 0, len(text))
+        buffer = LineBuffer(text)
+        self.lines = buffer.count()
+        self.pieces.append((buffer, 0, len(text), 0, self.lines, nbytes))
+        self.nbytes = nbytes
+        if not text.endswith('\n'):
+            self.eol = False
+            self.pieces.append((LineBuffer('\n'), 0, 1, 0, 1, 1))
+            self.lines += 1
+            self.nbytes += 1
+
+    @classmethod
+    def of(cls, node):
+        # 파일 노드의 지금 내용으로 편집 버퍼를 만든다 (전에 저장한 피스 테이블이면 조각만 복사)
+        data = node._content
+        if data.__class__ is cls:
+            return data.copy()
+        return cls(node.content, node.size)
+
+    def copy(self):
+        table = PieceTable()
+        table.pieces = list(self.pieces)
+        table.lines = self.lines
+        table.nbytes = self.nbytes
+        table.eol = self.eol
+        table._starts = self._starts
+        return table
+
+    # 지연 내용 규약
+    @property
+    def length(self):
+        return self.nbytes - (not self.eol and self.lines > 0)
+
+    def _segments(self):
+        pieces = self.pieces
+        trim = not self.eol and self.lines > 0
+        last = len(pieces) - 1
+        for i, (buffer, start, end, first, count, nbytes) in enumerate(pieces):
+            if trim and i == last:
+                end -= 1
+            if start == 0 and end == len(buffer.text):
+                yield buffer.text
+            else:
+                yield buffer.text[start:end]
+
+    def load(self):
+        return ''.join(self._segments())
+
+    def raw(self):
+        return self.load().encode('utf-8')
+
+    def iter_lines(self):
+        # 조각을 잘라 복사하지 않고 줄바꿈 위치만 찾아 한 줄씩 흘려보낸다
+        carry = ''
+        for buffer, start, end, first, count, nbytes in self.pieces:
+            text = buffer.text
+            find = text.find
+            while start < end:
+                newline = find('\n', start, end)
+                if newline < 0:
+                    carry += text[start:end]
+                    break
+                yield carry + text[start:newline] if carry else text[start:newline]
+                carry = ''
+                start = newline + 1
+        if carry:
+            yield carry
+
+    # 줄 단위 편집
+    def _line_starts(self):
+        # 조각 i 앞의 줄바꿈 수 (조각이 바뀔 때마다 다시 만든다: 조각 수에 비례)
+        if self._starts is None:
+            self._starts = [0]
+            self._starts.extend(itertools.accumulate(piece[4] for piece in self.pieces))
+        return self._starts
+
+    def _split(self, line):
+        # line번째(0부터) 줄이 조각의 시작이 되도록 나누고 그 조각의 번호를 돌려준다
+        if line <= 0:
+            return 0
+        if line >= self.lines:
+            return len(self.pieces)
+        starts = self._line_starts()
+        i = bisect.bisect_left(starts, line) - 1  # 이 조각 안에 line번째 줄바꿈이 있다
+        buffer, start, end, first, count, nbytes = self.pieces[i]
+        k = line - starts[i]
+        cut = buffer.newline(first + k - 1) + 1
+        if cut >= end:
+            return i + 1
+        # 바이트 수는 짧은 쪽만 센다
+        if cut - start <= end - cut:
+            left = _utf8_len(buffer.text, start, cut)
+        else:
+            left = nbytes - _utf8_len(buffer.text, cut, end)
+        self.pieces[i:i + 1] = [(buffer, start, cut, first, k, left),
+                                (buffer, cut, end, first + k, count - k, nbytes - left)]
+        self._starts = None
+        return i + 1
+
+    def line(self, line):
+        # line번째(0부터) 줄의 내용 (줄바꿈 제외)
+        if not 0 <= line < self.lines:
+            raise IndexError(line)
+        i = 0
+        buffer, start, end, first, count, nbytes = self.pieces[0]
+        if line:
+            # 앞 줄의 줄바꿈 바로 뒤에서 시작한다
+            starts = self._line_starts()
+            i = bisect.bisect_left(starts, line) - 1
+            buffer, start, end, first, count, nbytes = self.pieces[i]
+            start = buffer.newline(first + line - starts[i] - 1) + 1
+            if start >= end:
+                i += 1
+                buffer, start, end, first, count, nbytes = self.pieces[i]
+        parts = []
+        while True:
+            newline = buffer.text.find('\n', start, end)
+            if newline >= 0:
+                parts.append(buffer.text[start:newline])
+                return ''.join(parts)
+            parts.append(buffer.text[start:end])  # 다음 조각으로 이어지는 줄
+            i += 1
+            buffer, start, end, first, count, nbytes = self.pieces[i]
+
+    def insert(self, line, texts):
+        # line번째 줄 앞에 줄들을 넣는다 (line == lines이면 끝에)
+        if not texts:
+            return
+        text = '\n'.join(texts) + '\n'
+        nbytes = _utf8_len(text, 0, len(text))
+        count = text.count('\n')  # 넣은 줄에 줄바꿈이 들어 있을 수도 있다
+        i = self._split(line)
+        self.pieces.insert(i, (LineBuffer(text), 0, len(text), 0, count, nbytes))
+        self.lines += count
+        self.nbytes += nbytes
+        self._starts = None
+
+    def delete(self, line, count=1):
+        # line번째 줄부터 count줄을 지운다. 지운 줄 수를 돌려준다
+        count = min(count, self.lines - line)
+        if line < 0 or count <= 0:
+            return 0
+        i = self._split(line)
+        j = self._split(line + count)
+        removed = self.pieces[i:j]
+        del self.pieces[i:j]
+        self.lines -= sum(piece[4] for piece in removed)
+        self.nbytes -= sum(piece[5] for piece in removed)
+        self._starts = None
+        if not self.lines:
+            self.eol = True
+        return count
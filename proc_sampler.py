@@ -0,0 +1,246 @@
+import heapq
+import os
+import time
+from datetime import datetime
+
+try:
+    import pwd
+except ImportError:  # Windows
+    pwd = None
+
+# top이 보여줄 실제 시스템 정보를 /proc에서 읽는다 (리눅스 전용).
+# 매 틱마다 /proc/stat, /proc/meminfo, /proc/<pid>/stat 만 읽고,
+# 사용자 이름과 공유 메모리(statm)는 화면에 보일 줄에 대해서만 읽는다.
+# %CPU는 이전 표본과의 차이로 계산하므로 첫 화면은 0으로 나온다.
+PROC = '/proc'
+
+# top -o 및 대화형 키로 고를 수 있는 정렬 기준 (값이 큰 것부터, PID/COMMAND는 작은 것부터)
+SORT_KEYS = {
+    '%CPU': (lambda p: p.cpu, True),
+    '%MEM': (lambda p: p.rss, True),
+    'PID': (lambda p: p.pid, False),
+    'TIME+': (lambda p: p.ticks, True),
+    'RES': (lambda p: p.rss, True),
+    'VIRT': (lambda p: p.vsize, True),
+    'COMMAND': (lambda p: p.comm, False),
+}
+SORT_HOTKEYS = {'P': '%CPU', 'M': '%MEM', 'N': 'PID', 'T': 'TIME+'}
+
+MAX_OPEN_FILES = 512  # 열어 둘 /proc/<pid>/stat 수 (fd 한도를 넘지 않도록)
+
+HEADER = "    PID USER      PR  NI    VIRT    RES    SHR S  %CPU  %MEM     TIME+ COMMAND"
+
+
+def _read(path, size=8192):
+    # open()보다 가벼운 저수준 읽기 (틱마다 수백 번 호출된다)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _kib(value):
+    # top처럼 KiB 단위, 여섯 자리를 넘으면 GiB로 줄인다
+    if value < 1000000:
+        return str(value)
+    if value < 100 * 1048576:
+        return f"{value / 1048576:.1f}g"
+    return f"{value / 1048576:.0f}g"
+
+
+class ProcessSample:
+    # /proc/<pid>/stat 한 줄. 정렬에 늘 쓰는 값만 바로 풀고, 나머지는 화면에 보일 때 푼다.
+    __slots__ = ('pid', 'raw_comm', 'fields', 'ticks', 'starttime', 'cpu')
+
+    def __init__(self, pid, raw_comm, fields, ticks, starttime):
+        self.pid = pid
+        self.raw_comm = raw_comm
+        self.fields = fields  # ')' 뒤의 필드들 (bytes)
+        self.ticks = ticks  # utime + stime (클록 틱)
+        self.starttime = starttime  # PID 재사용을 구분하는 데 쓴다
+        self.cpu = 0.0
+
+    @property
+    def comm(self):
+        return self.raw_comm.decode('utf-8', 'replace')
+
+    @property
+    def state(self):
+        return self.fields[0].decode('ascii')
+
+    @property
+    def priority(self):
+        return int(self.fields[15])
+
+    @property
+    def nice(self):
+        return int(self.fields[16])
+
+    @property
+    def vsize(self):
+        return int(self.fields[20])  # 바이트
+
+    @property
+    def rss(self):
+        return int(self.fields[21])  # 페이지 수
+
+
+class ProcSampler:
+    def __init__(self, proc=PROC):
+        self.proc = proc
+        self.hz = os.sysconf('SC_CLK_TCK')
+        self.page_kib = os.sysconf('SC_PAGE_SIZE') // 1024
+        self._prev_ticks = {}  # pid -> (starttime, ticks)
+        self._prev_cpu = None  # 이전 /proc/stat 첫 줄 값
+        self._prev_time = None
+        self._users = {}  # uid -> 사용자 이름
+        self._owners = {}  # pid -> (starttime, 사용자 이름)
+        self._fds = {}  # pid 문자열 -> 열어 둔 /proc/<pid>/stat fd
+
+    @staticmethod
+    def available(proc=PROC):
+        return hasattr(os, 'sysconf') and os.path.exists(os.path.join(proc, 'stat'))
+
+    def sample(self):
+        # 프로세스 목록과 CPU 시간 차이를 계산한다.
+        # /proc/<pid>/stat은 열어 둔 채로 pread만 다시 한다 (틱마다 open/close 비용을 아낀다).
+        # 끝난 프로세스의 fd는 PID가 재사용되어도 ESRCH를 돌려주므로 섞이지 않는다.
+        now = time.monotonic()
+        elapsed = now - self._prev_time if self._prev_time is not None else 0.0
+        scale = 100.0 / (self.hz * elapsed) if elapsed > 0 else 0.0
+        prev_ticks = self._prev_ticks
+        ticks_now = {}
+        processes = []
+        fds = self._fds
+        open_fds = {}
+        proc = self.proc
+        pread = os.pread
+        for entry in os.listdir(proc):
+            if not entry.isdigit():
+                continue
+            fd = fds.pop(entry, None)
+            try:
+                if fd is None:
+                    fd = os.open(f"{proc}/{entry}/stat", os.O_RDONLY)
+                data = pread(fd, 1024, 0)
+            except OSError:
+                if fd is not None:
+                    os.close(fd)
+                continue  # 그 사이 끝난 프로세스
+            if len(open_fds) < MAX_OPEN_FILES:
+                open_fds[entry] = fd
+            else:
+                os.close(fd)
+            close = data.rfind(b')')
+            fields = data[close + 2:].split()
+            pid = int(entry)
+            ticks = int(fields[11]) + int(fields[12])
+            starttime = int(fields[19])
+            process = ProcessSample(pid, data[data.find(b'(') + 1:close], fields, ticks, starttime)
+            prev = prev_ticks.get(pid)
+            if prev is not None and prev[0] == starttime:
+                process.cpu = (ticks - prev[1]) * scale
+            ticks_now[pid] = (starttime, ticks)
+            processes.append(process)
+        for fd in fds.values():  # 목록에서 사라진 프로세스
+            os.close(fd)
+        self._fds = open_fds
+        self._prev_ticks = ticks_now  # 끝난 PID는 자연히 빠진다
+        self._prev_time = now
+        return processes
+
+    def close(self):
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+
+    def cpu_summary(self):
+        # /proc/stat 첫 줄: user nice system idle iowait irq softirq steal
+        values = [int(v) for v in _read(f"{self.proc}/stat", 4096).split(b'\n', 1)[0].split()[1:9]]
+        prev, self._prev_cpu = self._prev_cpu, values
+        if prev is not None:
+            values = [now - before for now, before in zip(values, prev)]
+        total = sum(values) or 1
+        us, ni, sy, idle, wa, hi, si, st = (100.0 * v / total for v in values)
+        return f"%Cpu(s): {us:4.1f} us, {sy:4.1f} sy, {ni:4.1f} ni, {idle:4.1f} id, {wa:4.1f} wa, {hi:4.1f} hi, {si:4.1f} si, {st:4.1f} st"
+
+    def meminfo(self):
+        info = {}
+        for line in _read(f"{self.proc}/meminfo").split(b'\n'):
+            key, _, rest = line.partition(b':')
+            if rest:
+                info[key.decode('ascii')] = int(rest.split()[0])
+        return info
+
+    def user_of(self, process):
+        cached = self._owners.get(process.pid)
+        if cached is not None and cached[0] == process.starttime:
+            return cached[1]
+        try:
+            uid = os.stat(f"{self.proc}/{process.pid}").st_uid
+        except OSError:
+            return '?'
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name if pwd else str(uid)
+            except KeyError:
+                name = str(uid)
+            self._users[uid] = name
+        self._owners[process.pid] = (process.starttime, name)
+        return name
+
+    def shared_kib(self, process):
+        try:
+            return int(_read(f"{self.proc}/{process.pid}/statm", 256).split()[2]) * self.page_kib
+        except (OSError, IndexError):
+            return 0
+
+    def frame(self, sort_key='%CPU', rows=20):
+        # top 화면 한 장 (요약 + 정렬된 프로세스 표)
+        processes = self.sample()
+        mem = self.meminfo()
+        try:
+            uptime = float(_read(f"{self.proc}/uptime").split()[0])
+            load = _read(f"{self.proc}/loadavg").split()[:3]
+        except OSError:
+            uptime, load = 0.0, [b'0.00'] * 3
+        days, rest = divmod(int(uptime), 86400)
+        up = f"{days} days, {rest // 3600:2d}:{rest % 3600 // 60:02d}" if days else f"{rest // 3600:2d}:{rest % 3600 // 60:02d}"
+        states = {}
+        for process in processes:
+            state = process.fields[0]
+            states[state] = states.get(state, 0) + 1
+        states = {state.decode('ascii'): count for state, count in states.items()}
+
+        total = mem.get('MemTotal', 0)
+        free = mem.get('MemFree', 0)
+        cache = mem.get('Buffers', 0) + mem.get('Cached', 0) + mem.get('SReclaimable', 0)
+        swap_total = mem.get('SwapTotal', 0)
+        swap_free = mem.get('SwapFree', 0)
+        lines = [
+            f"top - {datetime.now().strftime('%H:%M:%S')} up {up},  load average: {', '.join(v.decode('ascii') for v in load)}",
+            f"Tasks: {len(processes)} total, {states.get('R', 0)} running, {states.get('S', 0) + states.get('I', 0) + states.get('D', 0)} sleeping, "
+            f"{states.get('T', 0) + states.get('t', 0)} stopped, {states.get('Z', 0)} zombie",
+            self.cpu_summary(),
+            f"MiB Mem : {total / 1024:8.1f} total, {free / 1024:8.1f} free, {(total - free - cache) / 1024:8.1f} used, {cache / 1024:8.1f} buff/cache",
+            f"MiB Swap: {swap_total / 1024:8.1f} total, {swap_free / 1024:8.1f} free, {(swap_total - swap_free) / 1024:8.1f} used, "
+            f"{mem.get('MemAvailable', free) / 1024:8.1f} avail Mem",
+            "",
+            HEADER,
+        ]
+
+        key, descending = SORT_KEYS[sort_key]
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        visible = pick(rows, processes, key=key)
+        page_kib = self.page_kib
+        mem_scale = 100.0 * page_kib / total if total else 0.0
+        for p in visible:
+            seconds, hundredths = divmod(p.ticks * 100 // self.hz, 100)
+            time_plus = f"{seconds // 60}:{seconds % 60:02d}.{hundredths:02d}"
+            priority = 'rt' if p.priority < -99 else p.priority
+            lines.append(f"{p.pid:>7} {self.user_of(p)[:8]:<8} {priority:>3} {p.nice:>3} {_kib(p.vsize // 1024):>7} "
+                         f"{_kib(p.rss * page_kib):>6} {_kib(self.shared_kib(p)):>6} {p.state} {p.cpu:5.1f} "
+                         f"{p.rss * mem_scale:5.1f} {time_plus:>9} {p.comm}")
+        return lines
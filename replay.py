@@ -0,0 +1,210 @@
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from blob_store import BlobContent
+from name_index import NameIndex
+from shell_engine import ShellEngine
+from snapshot import load_snapshot
+from vfs import VirtualFileSystem
+
+# 채점용 기록 재실행 (GUI 없이).
+#   python replay.py transcripts/ --image lab.snap --jobs 8 > results.jsonl
+#   python linux_simulator.py --replay transcripts/ --image lab.snap
+# 기록(transcript)은 히스토리 파일처럼 한 줄에 명령 하나. 폴더의 기록들을 프로세스 풀에 나눠 각자 새 파일 시스템에서
+# 다시 실행하고, 기록마다 최종 트리 해시, 명령별 출력 해시, 걸린 시간을 JSON 한 줄로 (기록 이름 순서대로) 내보낸다.
+# 작업 프로세스는 기본 이미지를 한 번만 읽고(fork면 부모가 읽은 것을 그대로 물려받는다) 기록마다
+# 그 위의 지연 복사본(overlay)에서 실행하므로 기록 하나를 시작하는 비용은 이미지 크기와 상관없다.
+OUTPUT_DIGEST_BYTES = 16  # 명령별 출력 해시 길이
+MAX_CHUNK = 16  # 작업 프로세스에 한 번에 넘기는 기록 수 (결과를 너무 늦게 내보내지 않도록 작게)
+
+_worker = None  # 작업 프로세스의 ReplayWorker (fork면 부모가 만든 것을 물려받는다)
+
+
+def _content_bytes(data):
+    # 파일 내용(str 또는 지연 내용)의 바이트. 지연 내용은 노드에 풀어 두지 않고 원본에서 바로 읽는다
+    if data.__class__ is str:
+        return data.encode('utf-8')
+    return data.raw()
+
+
+class TreeDigest:
+    # 파일 시스템 트리 전체의 해시 (경로, 종류, 내용이 같으면 같다).
+    # 디렉토리 해시는 자식 (이름, 해시)들로 만들고, 기본 이미지 쪽 노드의 해시는 한 번만 계산해 기억한다.
+    # 기록마다 바뀐 부분만 다시 계산하면 되므로 이미지가 커도 기록 하나의 해시 비용은 바뀐 양에 비례한다.
+    def __init__(self, base):
+        self.base_root = base.root
+        self._dirs = {}  # 기본 이미지 디렉토리 노드 -> 해시
+        self._contents = {}  # 기본 이미지 파일 내용 객체의 id -> 해시 (이미지가 살아 있는 동안 id가 바뀌지 않는다)
+        self._blobs = {}  # 내용 저장소 blob 키 -> 해시 (같은 내용이면 키가 같으므로 기록이 달라도 그대로 쓴다)
+        stack = [base.root]
+        while stack:
+            node = stack.pop()
+            if node._children is not None:
+                stack.extend(node._children.values())
+            else:
+                self._contents[id(node._content)] = None  # 해시는 처음 쓸 때 계산한다
+
+    def digest(self, vfs):
+        return self._node(vfs.root).hex()
+
+    def _node(self, node):
+        if node.type == 'file':
+            key = id(node._content)
+            if key in self._contents:
+                found = self._contents[key]
+                if found is None:
+                    found = self._contents[key] = self._file(node._content)
+                return found
+            data = node._content
+            if data.__class__ is BlobContent:
+                found = self._blobs.get(data.blob.key)
+                if found is None:
+                    found = self._blobs[data.blob.key] = self._file(data)
+                return found
+            return self._file(data)
+        while node._children is None and node.origin is not None:
+            node = node.origin  # 아직 복사되지 않은 디렉토리는 원본과 내용이 같다
+        found = self._dirs.get(node)
+        if found is not None:
+            return found
+        h = hashlib.sha1(b'd')
+        for name in sorted(node._children):
+            h.update(name.encode('utf-8') + b'\0' + self._node(node._children[name]))
+        found = h.digest()
+        if self._is_base(node):
+            self._dirs[node] = found
+        return found
+
+    def _file(self, data):
+        h = hashlib.sha1(b'f')
+        h.update(_content_bytes(data))
+        return h.digest()
+
+    def _is_base(self, node):
+        while node.parent is not None:
+            node = node.parent
+        return node is self.base_root
+
+
+class ReplayWorker:
+    # 작업 프로세스 하나의 상태: 기본 이미지, 그 이름 색인, 트리 해시 기억
+    def __init__(self, image=None):
+        self.base = load_snapshot(image) if image else VirtualFileSystem()
+        self.base_index = NameIndex(self.base)
+        self.digests = TreeDigest(self.base)
+
+    def replay(self, path):
+        # 기록 하나를 새 파일 시스템에서 다시 실행한 결과 (JSON으로 바꿀 dict)
+        record = {'transcript': os.path.basename(path)}
+        try:
+            with open(path, encoding='utf-8', errors='replace') as f:
+                lines = [line.rstrip('\n') for line in f]
+        except OSError as e:
+            record['error'] = str(e)
+            return record
+        start = time.perf_counter()
+        vfs = VirtualFileSystem.overlay(self.base)
+        engine = ShellEngine(vfs, base_index=self.base_index)
+        engine.allow_mount = False  # 기록이 채점하는 컴퓨터의 실제 파일을 읽지 못하게
+        engine.allow_parallel = False  # 이미 코어마다 작업 프로세스가 있다
+        outputs = []
+        errors = 0
+        status = 0
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                result = engine.execute(line)
+                if engine.in_interactive_mode():
+                    # 히스토리에는 에디터/top 안에서 친 키가 남지 않으므로 바로 빠져나온다
+                    engine.editor_mode = engine.top_mode = False
+                h = hashlib.blake2b(str(result.status).encode(), digest_size=OUTPUT_DIGEST_BYTES)
+                for text in result.stdout:
+                    h.update(b'1' + text.encode('utf-8') + b'\n')
+                for text in result.stderr:
+                    h.update(b'2' + text.encode('utf-8') + b'\n')
+                outputs.append(h.hexdigest())
+                status = result.status
+                errors += status != 0
+                if result.exit:
+                    break
+            record['tree'] = self.digests.digest(vfs)
+        finally:
+            vfs.release()  # 기본 이미지 쪽에 이 기록의 지연 복사본이 남지 않도록
+        record.update({'commands': len(outputs), 'errors': errors, 'status': status, 'outputs': outputs,
+                       'seconds': round(time.perf_counter() - start, 6), 'worker': os.getpid()})
+        return record
+
+
+def _init_worker(image):
+    global _worker
+    if _worker is None:
+        _worker = ReplayWorker(image)
+
+
+def _replay(path):
+    return _worker.replay(path)
+
+
+def transcripts(directory, pattern='*'):
+    # 폴더 안의 기록 파일 경로 (이름 순서)
+    import fnmatch
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(directory, name))]
+
+
+def replay_all(paths, image=None, jobs=None):
+    # 기록들의 결과를 paths 순서대로 하나씩 돌려준다 (끝난 것부터 바로)
+    global _worker
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        _init_worker(image)
+        for path in paths:
+            yield _worker.replay(path)
+        return
+    context = multiprocessing.get_context()
+    if context.get_start_method() == 'fork':
+        _init_worker(image)  # 부모에서 한 번 읽어 두면 작업 프로세스들은 그대로 물려받는다
+    chunk = max(1, min(MAX_CHUNK, len(paths) // (jobs * 4)))
+    with ProcessPoolExecutor(jobs, mp_context=context, initializer=_init_worker, initargs=(image,)) as pool:
+        yield from pool.map(_replay, paths, chunksize=chunk)
+
+
+def run(directory, image=None, jobs=None, out=None, pattern='*'):
+    out = out if out is not None else sys.stdout
+    paths = transcripts(directory, pattern)
+    start = time.perf_counter()
+    failed = 0
+    for record in replay_all(paths, image, jobs):
+        failed += 'error' in record
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        out.flush()
+    elapsed = time.perf_counter() - start
+    rate = len(paths) / elapsed if elapsed > 0 else 0.0
+    sys.stderr.write(f"기록 {len(paths)}개 재실행: {elapsed:.2f}초 ({rate:.1f}개/초, 작업 프로세스 "
+                     f"{jobs or os.cpu_count() or 1}개, 읽지 못한 기록 {failed}개)\n")
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리눅스 명령어 학습 시뮬레이터 기록 재실행 (채점용)')
+    parser.add_argument('directory', help='기록 파일(한 줄에 명령 하나)이 들어 있는 폴더')
+    parser.add_argument('--image', metavar='PATH', help='기록마다 새로 시작할 파일 시스템 스냅샷 (없으면 기본 트리)')
+    parser.add_argument('--jobs', type=int, default=None, help='작업 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--pattern', default='*', help="재실행할 기록 파일 이름 패턴 (예: '*.txt')")
+    parser.add_argument('--out', metavar='PATH', help='결과 JSONL을 저장할 파일 (기본: 표준 출력)')
+    options = parser.parse_args(argv)
+    if options.out:
+        with open(options.out, 'w', encoding='utf-8') as out:
+            return run(options.directory, options.image, options.jobs, out, options.pattern)
+    return run(options.directory, options.image, options.jobs, pattern=options.pattern)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
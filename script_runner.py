@@ -0,0 +1,79 @@
+import argparse
+import sys
+
+from hostfs import mount, parse_mount_spec
+from shell_engine import ShellEngine
+
+# GUI 없이 스크립트를 실행한다 (Qt 객체를 만들지 않는다).
+#   python script_runner.py setup.sh
+#   python linux_simulator.py --script setup.sh
+#   generate_lab.py | python linux_simulator.py --script -
+# 명령마다 출력을 바로 표준 출력/오류로 내보내고, 마지막 명령의 종료 코드로 끝난다.
+
+
+def run(source, engine=None, out=None, err=None):
+    # source: 호스트의 스크립트 파일 경로, '-'이면 표준 입력을 한 줄씩 읽으며 실행
+    engine = engine if engine is not None else ShellEngine()
+    out = out if out is not None else sys.stdout
+    err = err if err is not None else sys.stderr
+    if source == '-':
+        steps = engine.iter_steps(sys.stdin)
+        name = '<stdin>'
+    else:
+        with open(source, encoding='utf-8') as f:
+            steps = engine.parse_script(f.read())
+        name = source
+
+    status = 0
+    for result in engine.run_script(steps, name):
+        if result.stdout:
+            out.write('\n'.join(result.stdout) + '\n')
+        if result.stderr:
+            out.flush()  # 출력 순서가 섞이지 않도록
+            err.write('\n'.join(result.stderr) + '\n')
+        status = result.status
+    out.flush()
+    return status
+
+
+def run_with_image(script, image=None, save_image=None, mounts=(), profile=False, profile_memory=False,
+                   trace=None):
+    # --image로 시작해서 실행하고, --save-image가 있으면 결과를 스냅샷으로 남긴다
+    # mounts: (호스트 폴더, 경로) 목록. 실행 전에 읽기 전용으로 붙인다
+    # profile: 끝난 뒤 명령별 실행 시간 통계를 표준 오류로, trace: Chrome 추적 JSON을 저장할 경로
+    from snapshot import load_snapshot, save_snapshot
+    engine = ShellEngine(load_snapshot(image) if image else None)
+    for host_dir, path in mounts:
+        mount(engine.vfs, host_dir, path)
+    profiler = engine.profiler
+    if profile or profile_memory:
+        profiler.enable(memory=profile_memory)
+    if trace:
+        profiler.start_trace(engine.vfs)
+    status = run(script, engine)
+    if save_image:
+        save_snapshot(engine.vfs, save_image)
+    if profile or profile_memory:
+        sys.stderr.write('\n'.join(profiler.summary()) + '\n')
+    if trace:
+        profiler.dump_trace(trace)
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리눅스 명령어 학습 시뮬레이터 스크립트 실행기')
+    parser.add_argument('script', help="실행할 스크립트 파일 ('-'이면 표준 입력)")
+    parser.add_argument('--image', metavar='PATH', help='시작할 때 불러올 파일 시스템 스냅샷')
+    parser.add_argument('--save-image', metavar='PATH', help='실행이 끝난 파일 시스템을 스냅샷으로 저장')
+    parser.add_argument('--mount', metavar='HOST:PATH', action='append', type=parse_mount_spec, default=[],
+                        help='실제 폴더를 읽기 전용으로 붙이기 (여러 번 쓸 수 있음)')
+    parser.add_argument('--profile', action='store_true', help='끝난 뒤 명령별 실행 시간 통계(p50/p95/p99)를 표준 오류로')
+    parser.add_argument('--profile-memory', action='store_true', help='--profile에 메모리 사용량도 (tracemalloc, 느려짐)')
+    parser.add_argument('--trace', metavar='PATH', help='명령과 파일 시스템 연산을 Chrome 추적 JSON으로 저장')
+    options = parser.parse_args(argv)
+    return run_with_image(options.script, options.image, options.save_image, options.mount,
+                          options.profile, options.profile_memory, options.trace)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
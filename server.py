@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import itertools
+import sys
+import threading
+
+from blob_store import BlobContent
+from name_index import NameIndex
+from shell_engine import ShellEngine
+from snapshot import load_snapshot
+from vfs import Inode, VfsListener, VirtualFileSystem
+
+# 다중 세션 서버. 모든 세션이 하나의 읽기 전용 기본 이미지를 공유하고,
+# 세션마다 바뀐 부분만 따로 갖는 지연 복사본(overlay) 위에서 명령을 실행한다.
+#
+# 줄 단위 프로토콜 (UTF-8, 한 줄 = 한 메시지)
+#   접속 직후  서버 -> "+ <세션 번호> <프롬프트>"
+#   요청      클라이언트 -> 명령 한 줄
+#   응답      서버 -> "1 <표준 출력>", "2 <오류 출력>", "P <패널 메시지>" 를 0줄 이상,
+#             마지막에 "= <종료 코드> <프롬프트>"
+#   '%'로 시작하는 줄은 서버 명령이다: %stats (이 세션 메모리), %sessions (전체 요약),
+#   %blobs (세션들이 같이 쓰는 내용 저장소: 논리/실제 바이트, 중복 제거 비율)
+#
+# 명령은 이벤트 루프가 아닌 작업 스레드(run_in_executor)에서 실행한다.
+# 한 세션의 긴 명령(큰 파일 grep, top -b)이 다른 세션의 응답을 막지 않도록.
+
+NODE_BYTES = sys.getsizeof(Inode('x', 'file'))  # 노드 하나
+DICT_BYTES = sys.getsizeof({})  # 빈 자식 dict
+ENTRY_BYTES = 40  # dict 항목 하나 (키 참조, 값 참조, 해시, 여유 공간)
+
+
+def rss_bytes():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class SessionAccounting(VfsListener):
+    # 세션이 따로 가진(기본 이미지와 공유하지 않는) 메모리를 변경 알림으로 추정한다.
+    def __init__(self, vfs):
+        self.nodes = 0  # 세션 쪽에 새로 만들어진 노드 수
+        self.dicts = 0  # 세션 쪽 자식 dict 수
+        self.entries = 0  # 그 dict의 항목 수
+        self.content = {}  # 세션이 쓴 파일 -> 바이트 수
+        vfs.add_listener(self)
+
+    def node_added(self, node):
+        self.nodes += 1
+        self.entries += 1
+        if node._children is not None:
+            self.dicts += 1
+
+    def children_materialized(self, directory):
+        self.nodes += len(directory._children)
+        self.entries += len(directory._children)
+        self.dicts += 1
+
+    def node_removed(self, node, old_parent):
+        self.entries -= 1
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self.nodes -= 1
+            self.content.pop(current, None)
+            kids = current._children
+            if kids is not None:
+                self.dicts -= 1
+                self.entries -= len(kids)
+                stack.extend(kids.values())
+
+    def content_changed(self, node):
+        # 저장소에 넣은 큰 내용은 세션끼리 같이 쓰므로 %blobs에서 한 번만 센다
+        self.content[node] = 0 if node._content.__class__ is BlobContent else node.size
+
+    def estimate(self, history):
+        history_bytes = sum(sys.getsizeof(command) for command in history)
+        return (self.nodes * NODE_BYTES + self.dicts * DICT_BYTES + self.entries * ENTRY_BYTES
+                + sum(self.content.values()) + history_bytes)
+
+
+class Session:
+    def __init__(self, session_id, base, base_index):
+        self.id = session_id
+        vfs = VirtualFileSystem.overlay(base)
+        self.accounting = SessionAccounting(vfs)
+        self.engine = ShellEngine(vfs, base_index=base_index)
+        self.engine.allow_mount = False  # 접속한 사용자가 서버의 실제 파일을 읽지 못하게
+        self.engine.allow_host_proc = False  # top이 서버의 실제 프로세스(명령줄, 사용자)를 보여주지 않게
+        # grep -r이 세션마다 코어 수만큼 프로세스를 띄우지 않게 (세션들이 이미 작업 스레드를 나눠 쓴다)
+        self.engine.allow_parallel = False
+        self.commands = 0
+        # 작업 스레드에서 명령을 실행하는 동안 다른 곳(%sessions, 세션 종료)이 엔진과 집계를 같이 만지지 않게
+        self.lock = threading.Lock()
+        self.last_memory = 0  # 명령을 실행 중이라 셀 수 없을 때 보여 줄 마지막 추정치
+
+    def execute(self, command):
+        # 작업 스레드에서 부른다
+        with self.lock:
+            result = self.engine.execute(command)
+            self.commands += 1
+            return result
+
+    def memory(self):
+        # 다른 세션이 %sessions로 부를 수 있다. 명령을 실행 중이면 기다리지 않고 마지막 추정치를 쓴다
+        if not self.lock.acquire(blocking=False):
+            return self.last_memory
+        try:
+            self.last_memory = self.accounting.estimate(self.engine.history)
+            return self.last_memory
+        finally:
+            self.lock.release()
+
+    def close(self):
+        # 연결이 끊겼을 때 아직 실행 중인 명령이 있으면 멈추고 끝나기를 기다린 뒤 정리한다
+        self.engine.cancel()
+        with self.lock:
+            self.engine.vfs.release()
+
+
+class SimulatorServer:
+    def __init__(self, base):
+        self.base = base  # 읽기 전용으로 공유하는 기본 이미지
+        self.base_index = NameIndex(base)
+        self.sessions = {}
+        self._ids = itertools.count(1)
+
+    def open_session(self):
+        session = Session(next(self._ids), self.base, self.base_index)
+        self.sessions[session.id] = session
+        return session
+
+    def close_session(self, session):
+        self.sessions.pop(session.id, None)
+        session.close()
+
+    def server_command(self, session, command):
+        if command == '%stats':
+            return [f"1 session={session.id} commands={session.commands} "
+                    f"nodes={session.accounting.nodes} bytes={session.memory()}"]
+        if command == '%sessions':
+            total = sum(s.memory() for s in self.sessions.values())
+            blob_bytes = self.base.store.stats()['physical_bytes'] if self.base.store is not None else 0
+            return [f"1 sessions={len(self.sessions)} estimated_bytes={total} blob_bytes={blob_bytes} "
+                    f"rss_bytes={rss_bytes()}"]
+        if command == '%blobs':
+            if self.base.store is None:
+                return ["1 store=off"]
+            stats = self.base.store.stats()
+            return [f"1 blobs={stats['blobs']} compressed={stats['compressed']} refs={stats['refs']} "
+                    f"logical_bytes={stats['logical_bytes']} unique_bytes={stats['unique_bytes']} "
+                    f"physical_bytes={stats['physical_bytes']} dedup_ratio={stats['dedup_ratio']:.2f} "
+                    f"compression_ratio={stats['compression_ratio']:.2f}"]
+        return [f"2 알 수 없는 서버 명령입니다: {command}"]
+
+    async def handle(self, reader, writer):
+        session = self.open_session()
+        engine = session.engine
+        loop = asyncio.get_running_loop()
+        try:
+            writer.write(f"+ {session.id} {engine.prompt()}\n".encode('utf-8'))
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode('utf-8', 'replace').rstrip('\r\n')
+                if command.startswith('%'):
+                    out = self.server_command(session, command.strip())
+                    out.append(f"= 0 {engine.prompt()}")
+                    writer.write(('\n'.join(out) + '\n').encode('utf-8'))
+                    await writer.drain()
+                    continue
+
+                result = await loop.run_in_executor(None, session.execute, command)
+                out = [f"1 {text}" for text in result.stdout]
+                out.extend(f"2 {text}" for text in result.stderr)
+                out.extend(f"P {text}" for text in result.panel)
+                out.append(f"= {result.status} {engine.prompt()}")
+                writer.write(('\n'.join(out) + '\n').encode('utf-8'))
+                await writer.drain()
+                if result.exit:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.close_session(session)
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=7000, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='리눅스 명령어 학습 시뮬레이터 다중 세션 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7000)
+    parser.add_argument('--unix', metavar='PATH', help='TCP 대신 유닉스 소켓으로 받기')
+    parser.add_argument('--image', metavar='PATH', help='모든 세션이 공유할 파일 시스템 스냅샷')
+    options = parser.parse_args(argv)
+
+    base = load_snapshot(options.image) if options.image else VirtualFileSystem()
+    server = SimulatorServer(base)
+
+    async def run():
+        listener = await server.start(options.host, options.port, options.unix)
+        where = options.unix or f"{options.host}:{options.port}"
+        print(f"시뮬레이터 서버 시작: {where}", flush=True)
+        async with listener:
+            await listener.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1562 @@
+import itertools
+import random
+import re
+import shlex
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+from completion import Completer
+from glob_expand import GlobExpander, GlobWord, literal, protect, word
+from history import CommandHistory, HistoryError
+import perf
+from hostfs import HostContent, active_mounts, mount, refresh_mounts, umount
+from name_index import GLOB_CHARS, NameIndex
+from piece_table import PieceTable
+from proc_sampler import SORT_HOTKEYS, SORT_KEYS, ProcSampler
+from vfs import VirtualFileSystem, iter_text_lines
+
+DISK_CAPACITY = 1 << 30  # df가 보여줄 가상 디스크 크기 (1GiB)
+PARSE_CACHE_SIZE = 4096  # 파싱해 둔 명령줄 수 (모든 엔진이 함께 쓴다)
+SCRIPT_CACHE_SIZE = 64  # 파싱해 둔 스크립트 수 (내용 해시 기준)
+MAX_SCRIPT_DEPTH = 16  # 스크립트 안에서 스크립트를 부를 수 있는 깊이
+CANCEL_CHECK_LINES = 1024  # 파일을 읽을 때 이만큼마다 Ctrl-C를 확인한다
+OUTPUT_BATCH_LINES = 500  # 출력을 받아 가는 쪽(sink)이 있으면 이만큼씩 넘긴다
+OUTPUT_BATCH_SECONDS = 0.05  # 또는 이만큼(초) 모였으면 넘긴다
+CANCEL_CHECK_SECONDS = 0.02  # top -b처럼 기다리는 명령은 이만큼(초)씩 자면서 Ctrl-C를 확인한다
+
+_parse_cache = OrderedDict()  # 명령줄 -> 파싱 결과
+_script_cache = OrderedDict()  # 스크립트 내용 해시 -> 단계 목록
+
+HELP_TEXT = """
+사용 가능한 명령어:
+- ls: 디렉토리 내용 보기 (-l: 자세히, -h: 읽기 쉬운 크기)
+- cd: 디렉토리 이동
+- pwd: 현재 작업 디렉토리 확인
+- mkdir: 새 디렉토리 생성
+- rm: 파일/디렉토리 삭제
+- cp: 파일/디렉토리 복사 (디렉토리는 cp -r)
+- mv: 파일/디렉토리 이동
+- cat: 파일 내용 보기
+- touch: 빈 파일 생성
+- clear: 화면 지우기
+- exit: 프로그램 종료
+- echo: 텍스트 출력
+- whoami: 현재 사용자 정보
+- date: 현재 날짜와 시간
+- help: 이 도움말 보기
+- history: 명령어 히스토리 보기 (history N: 마지막 N개, -c: 지우기, !!/!n: 다시 실행)
+- vi/vim: 텍스트 에디터 (:N 줄 이동, j/k, dd 삭제, o/O/i 입력, ^[ 명령 모드로, :w 저장, :wq, :q!)
+- nano: 텍스트 에디터 (^K 줄 잘라내기, ^_ N 줄 이동, ^O 저장, ^X 저장 후 종료, ^C 취소)
+- grep: 패턴이 들어 있는 줄 찾기 (-i, -v, -n, -c, -r: 디렉토리 아래 모든 파일)
+- head / tail: 앞/뒤 몇 줄만 보기 (-n N)
+- wc: 줄/단어/글자 수 세기 (-l, -w, -c)
+- sort: 줄 정렬 (-r, -n, -u)
+- uniq: 연속된 중복 줄 제거 (-c)
+- find: 파일 찾기 (find [경로] [-name 패턴] [-type f|d] [-maxdepth N])
+- locate: 이름으로 파일 위치 찾기
+- du: 디렉토리 사용량 보기 (바이트 단위, -s: 합계만, -h: 읽기 쉬운 크기)
+- df: 파일 시스템 사용량 보기 (-h, -i)
+- mount / umount: 실제 컴퓨터의 폴더를 읽기 전용으로 붙이기/떼기 (mount <폴더> <경로>, 인자 없으면 목록)
+- bash / sh: 스크립트 파일 실행 (작업 디렉토리는 끝나면 되돌아감)
+- source / .: 스크립트를 현재 셸에서 실행
+- top: 프로세스 정보 실시간 보기 (-b: 배치, -n 횟수, -d 간격(초), -o 정렬기준)
+- time: 명령이 걸린 시간 보기 (예: time grep -c ERROR /var/log/syslog)
+- perfstat: 명령별 실행 시간 통계 (on: 측정 시작, mem: 메모리도 측정, off, reset)
+- blobstat: 파일 내용 저장소 사용량 (중복 제거, 압축 비율, -h: 읽기 쉬운 크기)
+
+파이프와 리다이렉션:
+- 명령1 | 명령2: 앞 명령의 출력을 뒤 명령의 입력으로 전달
+- 명령 > 파일: 출력을 파일에 저장 (덮어쓰기)
+- 명령 >> 파일: 출력을 파일 끝에 추가
+- Ctrl-C: 실행 중인 명령 중단
+
+와일드카드:
+- *: 아무 글자들, ?: 한 글자, [abc]: 괄호 안의 한 글자, **: 모든 하위 디렉토리 (예: rm *.log, ls **/*.txt)
+- 따옴표로 감싸면 확장하지 않음 (예: find / -name "*.log")
+"""
+
+
+def _minutes(seconds):
+    # time 출력 형식 (0m0.012s)
+    minutes, seconds = divmod(max(seconds, 0.0), 60)
+    return f"{int(minutes)}m{seconds:.3f}s"
+
+
+class CommandCancelled(Exception):
+    # Ctrl-C로 중단된 명령 (ShellEngine.cancel)
+    pass
+
+
+class CommandResult:
+    # 명령 하나의 실행 결과. GUI, 배치 채점기 등이 이 구조만 보고 출력을 그린다.
+    __slots__ = ('command', 'stdout', 'stderr', 'panel', 'status', 'clear', 'exit', 'live', 'sink')
+
+    def __init__(self, command):
+        self.command = command
+        self.stdout = []  # 표준 출력 줄
+        self.stderr = []  # 오류 메시지 줄
+        self.panel = []  # Windows 패널에 보낼 메시지
+        self.status = 0  # 종료 코드
+        self.clear = False  # 화면 지우기 요청
+        self.exit = False  # 프로그램 종료 요청
+        self.live = False  # stdout이 직전 화면(top)을 제자리에서 덮어쓰는 한 장짜리 화면인지
+        self.sink = None  # 긴 출력을 끝나기 전에 조금씩 받아 갈 함수 (GUI 명령 실행기)
+
+    def flush(self):
+        # 지금까지 모인 stdout을 sink로 넘긴다
+        if self.stdout and self.sink is not None:
+            self.sink(self.stdout)
+            self.stdout = []
+
+
+class ShellEngine:
+    # Qt 없이 동작하는 명령 실행기. 파일 시스템, 히스토리, 명령 테이블을 소유한다.
+    def __init__(self, vfs=None, base_index=None, history=None):
+        # base_index: 공유 이미지 위의 세션일 때 이미지 쪽 이름 색인
+        # history: 파일에 저장되는 CommandHistory (없으면 메모리에만 둔다)
+        self.vfs = vfs if vfs is not None else VirtualFileSystem()
+        self.history = history if history is not None else CommandHistory()  # 명령어 히스토리
+        self.editor_mode = False  # 에디터 모드 상태
+        self.editor_buffer = None  # 에디터 버퍼 (PieceTable)
+        self.editor_filename = ""  # 편집 중인 파일명
+        self.editor_path = ""  # 저장할 절대 경로
+        self.editor_kind = 'vi'  # 'vi' 또는 'nano'
+        self.editor_insert = False  # vi 입력 모드 여부 (nano는 항상 입력)
+        self.editor_line = -1  # 현재 줄 (0부터, -1이면 첫 줄 앞)
+        self.editor_modified = False
+        self.top_mode = False  # top 모드 상태
+        self.top_sort = '%CPU'  # top 정렬 기준
+        self.top_delay = 3.0  # top 갱신 간격 (초)
+        self.top_rows = 20  # top이 보여줄 프로세스 수
+        self._top_sampler = None  # /proc 표본 (처음 top을 열 때 만든다)
+        self.allow_mount = True  # 호스트 폴더 mount 허용 여부 (서버 세션에서는 끈다)
+        self.allow_host_proc = True  # top이 호스트의 실제 /proc을 보여줄지 (서버 세션에서는 끄고 시뮬레이션 값을 쓴다)
+        self.allow_parallel = True  # grep -r의 프로세스 풀 사용 여부 (재실행 작업 프로세스와 서버 세션에서는 끈다)
+        self.cancelled = False  # Ctrl-C 요청 (명령을 실행하는 스레드가 아닌 곳에서 켠다)
+        self.name_index = NameIndex(self.vfs, base=base_index)  # find/locate 용 이름 색인
+        self.profiler = perf.Profiler()  # perfstat/--profile/--trace 측정 (기본은 꺼짐)
+        self._result = None
+        self.commands = {
+            'ls': self.ls_command,
+            'cd': self.cd_command,
+            'pwd': self.pwd_command,
+            'mkdir': self.mkdir_command,
+            'rm': self.rm_command,
+            'cp': self.cp_command,
+            'mv': self.mv_command,
+            'cat': self.cat_command,
+            'touch': self.touch_command,
+            'clear': self.clear_command,
+            'exit': self.exit_command,
+            'echo': self.echo_command,
+            'whoami': self.whoami_command,
+            'date': self.date_command,
+            'help': self.help_command,
+            'history': self.history_command,
+            'vi': self.vi_command,
+            'vim': self.vi_command,
+            'nano': self.nano_command,
+            'top': self.top_command,
+            'grep': self.grep_command,
+            'head': self.head_command,
+            'tail': self.tail_command,
+            'wc': self.wc_command,
+            'sort': self.sort_command,
+            'uniq': self.uniq_command,
+            'find': self.find_command,
+            'locate': self.locate_command,
+            'du': self.du_command,
+            'df': self.df_command,
+            'mount': self.mount_command,
+            'umount': self.umount_command,
+            'bash': self.bash_command,
+            'sh': self.bash_command,
+            'source': self.source_command,
+            '.': self.source_command,
+            'time': self.time_command,
+            'perfstat': self.perfstat_command,
+            'blobstat': self.blobstat_command
+        }
+        # 파이프로 들어온 입력(stdin)을 읽는 명령들
+        self.filters = {'cat', 'grep', 'head', 'tail', 'wc', 'sort', 'uniq', 'bash', 'sh'}
+        self._script_depth = 0
+        self.completer = Completer(self.vfs, self.commands)  # Tab 자동 완성
+        self.globber = GlobExpander(self.vfs, self.completer)  # *, ?, [...], ** 확장
+
+    def prompt(self):
+        return f"user@ubuntu_Server:{self.vfs.get_path()}$ "
+
+    def complete(self, line):
+        # Tab 자동 완성: (완성된 입력, 후보 목록, 전체 후보 수)
+        if self.in_interactive_mode():
+            return line, [], 0
+        return self.completer.complete(line)
+
+    def in_interactive_mode(self):
+        # 에디터/top 모드에서는 입력 줄이 명령으로 해석되지 않는다
+        return self.editor_mode or self.top_mode
+
+    def execute(self, command, sink=None):
+        # sink: 출력을 끝나기 전에 조금씩 받아 갈 함수 (없으면 끝난 뒤 한꺼번에 result.stdout으로)
+        command = command.strip()
+        result = CommandResult(command)
+        result.sink = sink
+        if not command:
+            return result
+        self._result = result
+        self.cancelled = False
+        profiler = self.profiler
+        record = None
+        if profiler.enabled:
+            record = profiler.begin(command, self.editor_kind if self.editor_mode else 'top' if self.top_mode else None)
+            if sink is not None:
+                result.sink = profiler.counting(record, sink)
+        try:
+            if self.editor_mode:
+                self._editor_input(command)
+            elif self.top_mode:
+                self._top_input(command)
+            else:
+                try:
+                    expanded = self.history.expand(command)  # !! / !n 확장
+                except HistoryError as e:
+                    self.error(str(e))
+                    return result
+                if expanded != command:
+                    result.command = expanded
+                    result.stdout.append(expanded)  # bash처럼 확장된 명령을 먼저 보여준다
+                self.history.add(expanded)  # 명령어 히스토리에 추가
+                self._dispatch(expanded)
+        finally:
+            self._result = None
+            if record is not None:
+                profiler.end(record, result)
+        return result
+
+    def _parse(self, command):
+        # 명령줄 -> ([단계별 인자 목록], 리다이렉션 대상, 이어쓰기 여부)
+        # 같은 줄은 한 번만 파싱한다 (결과 목록은 읽기만 하므로 공유해도 된다)
+        parsed = _parse_cache.get(command)
+        if parsed is not None:
+            _parse_cache.move_to_end(command)
+            return parsed
+        parsed = self._tokenize(command)
+        _parse_cache[command] = parsed
+        if len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+        return parsed
+
+    def _tokenize(self, command):
+        # 따옴표 안의 글롭 문자는 확장하지 않도록 표시해 둔다 (확장할 단어는 GlobWord)
+        lexer = shlex.shlex(protect(command), posix=True, punctuation_chars='|>')
+        lexer.whitespace_split = True
+        stages = [[]]
+        redirect = None
+        append = False
+        tokens = iter(lexer)
+        for token in tokens:
+            if token == '|':
+                stages.append([])
+            elif token in ('>', '>>'):
+                redirect = next(tokens, None)
+                append = token == '>>'
+                if redirect is None or redirect in ('|', '>', '>>'):
+                    raise ValueError("리다이렉션 대상 파일이 없습니다.")
+                redirect = literal(redirect)
+            else:
+                stages[-1].append(word(token))
+        if any(not stage for stage in stages):
+            raise ValueError("파이프 앞뒤에 명령어가 필요합니다.")
+        return stages, redirect, append
+
+    def _dispatch(self, command):
+        try:
+            parsed = self._parse(command)
+        except ValueError as e:
+            self.error(f"구문 오류: {str(e)}", status=2)
+            return
+        self._run(parsed)
+
+    def _run(self, parsed):
+        stages, redirect, append = parsed
+        if stages[0][0] == 'time':
+            self._time(parsed)
+            return
+        # 각 단계는 앞 단계의 줄 반복자를 받아 새 반복자를 돌려준다 (지연 평가)
+        stream = None
+        for argv in stages:
+            argv = self._expand_globs(argv)
+            cmd = argv[0]
+            handler = self.commands.get(cmd)
+            if handler is None:
+                self.error(f"명령어 '{cmd}'를 찾을 수 없습니다.", status=127)
+                return
+            try:
+                if stream is not None and cmd in self.filters:
+                    output = handler(argv[1:], stdin=stream)
+                else:
+                    output = handler(argv[1:])
+            except CommandCancelled:
+                self._interrupted()
+                return
+            except Exception as e:
+                self.error(f"오류: {str(e)}")
+                return
+            stream = output if output is not None else ()
+
+        try:
+            if redirect is None:
+                self._write_stdout(stream)
+            elif not self.vfs.write_lines(redirect, stream, append):
+                self.error(f"파일에 쓸 수 없습니다: {redirect}")
+        except CommandCancelled:
+            self._interrupted()
+        except Exception as e:
+            self.error(f"오류: {str(e)}")
+
+    def _time(self, parsed):
+        # bash의 time 키워드: 뒤의 파이프라인 전체가 걸린 시간을 (출력이 끝난 뒤) 오류 출력으로 알려 준다
+        stages, redirect, append = parsed
+        start = time.perf_counter()
+        user, system = perf.cpu_times()
+        if len(stages[0]) > 1:
+            self._run(([stages[0][1:]] + stages[1:], redirect, append))
+        elapsed = time.perf_counter() - start
+        end_user, end_system = perf.cpu_times()
+        self._result.stderr.extend(["", f"real\t{_minutes(elapsed)}",
+                                    f"user\t{_minutes(end_user - user)}", f"sys\t{_minutes(end_system - system)}"])
+
+    def _write_stdout(self, stream):
+        result = self._result
+        if result.sink is None:
+            result.stdout.extend(stream)
+            return
+        # 받아 가는 쪽이 있으면 긴 출력도 끝날 때까지 기다리지 않고 조금씩 넘긴다
+        deadline = time.monotonic() + OUTPUT_BATCH_SECONDS
+        for line in stream:
+            result.stdout.append(line)
+            if len(result.stdout) >= OUTPUT_BATCH_LINES or time.monotonic() >= deadline:
+                result.flush()
+                deadline = time.monotonic() + OUTPUT_BATCH_SECONDS
+
+    # Ctrl-C
+    def cancel(self):
+        # 실행 중인 명령을 멈춰 달라고 표시한다 (다른 스레드에서 불러도 된다).
+        # 명령은 파일을 읽거나 트리를 훑는 중간중간 check_cancel()에서 멈춘다.
+        self.cancelled = True
+
+    def check_cancel(self):
+        if self.cancelled:
+            raise CommandCancelled()
+
+    def _cancellable_sleep(self, seconds):
+        # 한 번에 길게 자지 않고 CANCEL_CHECK_SECONDS씩 나눠 자면서 Ctrl-C를 확인한다
+        deadline = time.monotonic() + seconds
+        while True:
+            self.check_cancel()
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, CANCEL_CHECK_SECONDS))
+
+    def _cancellable(self, lines):
+        # 줄 반복자를 CANCEL_CHECK_LINES줄씩 넘기면서 그 사이에 Ctrl-C를 확인한다
+        lines = iter(lines)
+        while True:
+            self.check_cancel()
+            batch = list(itertools.islice(lines, CANCEL_CHECK_LINES))
+            if not batch:
+                return
+            yield from batch
+
+    def _interrupted(self):
+        if self._script_depth:
+            raise CommandCancelled()  # 스크립트 안이면 스크립트 전체를 멈춘다
+        self.error("^C", status=130)
+
+    def _expand_globs(self, argv):
+        # 명령 실행 전에 GlobWord 인자를 맞는 경로들로 바꾼다. 맞는 것이 없으면 bash처럼 글자 그대로 둔다
+        if not any(arg.__class__ is GlobWord for arg in argv):
+            return argv
+        expanded = []
+        for arg in argv:
+            if arg.__class__ is GlobWord:
+                expanded.extend(self.globber.expand(arg) or [literal(arg)])
+            else:
+                expanded.append(arg)
+        return expanded
+
+    def error(self, message, status=1):
+        self._result.stderr.append(message)
+        self._result.status = status
+
+    def panel(self, message):
+        self._result.panel.append(message)
+
+    @staticmethod
+    def _split_flags(args):
+        flags = set()
+        rest = []
+        for arg in args:
+            if arg.startswith('-') and len(arg) > 1:
+                flags.update(arg[1:])
+            else:
+                rest.append(arg)
+        return flags, rest
+
+    @staticmethod
+    def _human_size(size):
+        for unit in ('', 'K', 'M', 'G', 'T'):
+            if size < 1024 or unit == 'T':
+                if unit == '':
+                    return str(size)
+                return f"{size:.1f}{unit}" if size < 10 else f"{size:.0f}{unit}"
+            size /= 1024
+
+    def ls_command(self, args):
+        flags, paths = self._split_flags(args)
+        single = self.vfs._resolve_path(paths[0]) if len(paths) == 1 else None
+        if len(paths) > 1 or (single is not None and not single.is_dir()):
+            return self._ls_many(flags, paths)  # 여러 경로나 파일 (ls *.txt)
+        path = paths[0] if paths else None
+        self.panel(f"디렉토리 내용을 표시합니다: {path if path else self.vfs.get_path()}")
+        if 'l' not in flags:
+            return self.vfs.list_dir(path)
+
+        entries = self.vfs.list_entries(path)
+        if entries is None:
+            self.error(f"디렉토리를 찾을 수 없습니다: {path}")
+            return None
+        # 디렉토리 크기는 하위 전체 크기 (노드에 캐시된 집계값이라 항목 수에만 비례)
+        size_of = self._human_size if 'h' in flags else str
+        total = sum(node.size for name, node in entries)
+        lines = [f"합계 {size_of(total)}"]
+        for name, node in entries:
+            if node.is_dir():
+                lines.append(f"drwxr-xr-x {node.ndirs + 2:>3} user user {size_of(node.size):>8} {name}/")
+            else:
+                lines.append(f"-rw-r--r-- {1:>3} user user {size_of(node.size):>8} {name}")
+        return lines
+
+    def _ls_many(self, flags, paths):
+        # ls *.txt dir1 dir2 : 파일을 먼저 보여주고, 디렉토리는 "이름:" 제목 아래에 (bash와 같은 순서)
+        files = []
+        dirs = []
+        for path in paths:
+            node = self.vfs._resolve_path(path)
+            if node is None:
+                self.error(f"ls: '{path}'에 접근할 수 없습니다: 그런 파일이나 디렉토리가 없습니다")
+            elif node.is_dir():
+                dirs.append(path)
+            else:
+                files.append((path, node))
+        size_of = self._human_size if 'h' in flags else str
+        lines = []
+        for path, node in files:
+            lines.append(f"-rw-r--r-- {1:>3} user user {size_of(node.size):>8} {path}" if 'l' in flags else path)
+        for path in dirs:
+            if lines:
+                lines.append("")
+            lines.append(f"{path}:")
+            lines.extend(self.ls_command(sorted(f'-{flag}' for flag in flags) + [path]) or [])
+        return lines
+
+    def du_command(self, args):
+        flags, paths = self._split_flags(args)
+        size_of = self._human_size if 'h' in flags else str
+        lines = []
+        for path in paths or ['.']:
+            node = self.vfs._resolve_path(path)
+            if node is None:
+                self.error(f"du: '{path}'에 접근할 수 없습니다: 그런 파일이나 디렉토리가 없습니다")
+                continue
+            if 's' in flags or not node.is_dir():
+                lines.append(f"{size_of(node.size)}\t{path}")
+                continue
+            # -s가 없으면 하위 디렉토리마다 한 줄 (각 줄은 캐시된 값이라 O(1))
+            for sub_path, sub in self._dir_walk(node, path.rstrip('/') or '/'):
+                lines.append(f"{size_of(sub.size)}\t{sub_path}")
+        self.panel("디스크 사용량 표시")
+        return lines
+
+    def _dir_walk(self, node, path):
+        # 하위 디렉토리를 후위 순서로 (du 출력 순서)
+        result = []
+        stack = [(node, path, False)]
+        while stack:
+            current, current_path, visited = stack.pop()
+            self.check_cancel()
+            if visited:
+                result.append((current_path, current))
+                continue
+            stack.append((current, current_path, True))
+            prefix = '' if current_path == '/' else current_path
+            kids = current.children
+            for name in sorted(kids, reverse=True):
+                child = kids[name]
+                if child.is_dir():
+                    stack.append((child, f"{prefix}/{name}", False))
+        return result
+
+    def df_command(self, args):
+        flags, paths = self._split_flags(args)
+        root = self.vfs.root
+        self.panel("파일 시스템 사용량 표시")
+        if 'i' in flags:
+            inodes = DISK_CAPACITY // 4096
+            used = root.nfiles + root.ndirs + 1
+            return ["Filesystem      Inodes   IUsed   IFree IUse% Mounted on",
+                    f"vfs         {inodes:>10} {used:>7} {inodes - used:>7} {used * 100 // inodes:>4}% /"]
+        size_of = self._human_size if 'h' in flags else (lambda size: str(size // 1024))
+        used = root.size
+        percent = -(-used * 100 // DISK_CAPACITY)
+        header = "Filesystem      Size    Used   Avail Use% Mounted on" if 'h' in flags else \
+            "Filesystem 1K-blocks    Used   Avail Use% Mounted on"
+        return [header,
+                f"vfs        {size_of(DISK_CAPACITY):>9} {size_of(used):>7} {size_of(DISK_CAPACITY - used):>7} {percent:>3}% /"]
+
+    def mount_command(self, args):
+        if not self.allow_mount:
+            self.error("mount: 이 환경에서는 사용할 수 없습니다")
+            return None
+        if not args:
+            self.panel("마운트 목록 표시")
+            return [f"{node.host_path} on {self.vfs.node_path(node)} type hostfs (ro)"
+                    for node in active_mounts(self.vfs)]
+        if len(args) != 2:
+            self.error("사용법: mount <호스트 폴더> <경로>")
+            return None
+        try:
+            mount(self.vfs, args[0], args[1])
+        except ValueError as e:
+            self.error(f"mount: {e}")
+            return None
+        self.panel(f"호스트 폴더 연결 (읽기 전용): {args[0]} -> {args[1]}")
+        return [f"'{args[0]}'를 '{args[1]}'에 읽기 전용으로 연결했습니다."]
+
+    def umount_command(self, args):
+        if len(args) != 1:
+            self.error("사용법: umount <경로>")
+            return None
+        try:
+            umount(self.vfs, args[0])
+        except ValueError as e:
+            self.error(f"umount: {e}")
+            return None
+        self.panel(f"호스트 폴더 연결 해제: {args[0]}")
+        return [f"'{args[0]}'의 연결을 해제했습니다."]
+
+    def cd_command(self, args):
+        if not args:
+            self.error("사용법: cd <디렉토리>")
+            return None
+        if not self.vfs.change_dir(args[0]):
+            self.error(f"디렉토리를 찾을 수 없습니다: {args[0]}")
+            return None
+        self.panel(f"디렉토리로 이동합니다: {args[0]}")
+        return [f"현재 디렉토리: {self.vfs.get_path()}"]
+
+    def pwd_command(self, args):
+        self.panel(f"현재 경로: {self.vfs.get_path()}")
+        return [self.vfs.get_path()]
+
+    def mkdir_command(self, args):
+        if not args:
+            self.error("사용법: mkdir <디렉토리명>...")
+            return None
+        lines = []
+        for path in args:
+            if not self.vfs.create_dir(path):
+                self.error(f"디렉토리를 생성할 수 없습니다: {path}")
+                continue
+            self.panel(f"새 디렉토리 생성: {path}")
+            lines.append(f"디렉토리 '{path}'가 생성되었습니다.")
+        return lines
+
+    def rm_command(self, args):
+        # rm *.log 처럼 글롭이 여러 인자로 펼쳐지므로 인자마다 삭제한다 (-r/-f는 받아들이기만 한다)
+        flags, paths = self._split_flags(args)
+        if not paths:
+            self.error("사용법: rm <파일명>...")
+            return None
+        lines = []
+        for path in paths:
+            try:
+                removed = self.vfs.remove(path)
+            except ValueError as e:
+                self.error(f"rm: {e}")
+                continue
+            if not removed:
+                self.error(f"파일이나 디렉토리를 찾을 수 없습니다: {path}")
+                continue
+            self.panel(f"파일/디렉토리 삭제: {path}")
+            lines.append(f"'{path}'가 삭제되었습니다.")
+        return lines
+
+    def cp_command(self, args):
+        recursive = False
+        paths = []
+        for arg in args:
+            if arg in ('-r', '-R', '-a'):
+                recursive = True
+            else:
+                paths.append(arg)
+        if len(paths) < 2:
+            self.error("사용법: cp [-r] <원본>... <대상>")
+            return None
+        sources, dst = self._sources_and_target(paths)
+        if sources is None:
+            return None
+        lines = []
+        for src in sources:
+            source = self.vfs._resolve_path(src)
+            if source is None:
+                self.error(f"파일이나 디렉토리를 찾을 수 없습니다: {src}")
+                continue
+            if source.is_dir() and not recursive:
+                self.error(f"'{src}'는 디렉토리입니다. 복사하려면 -r 옵션을 사용하세요.")
+                continue
+            if not self.vfs.copy(src, dst, recursive):
+                self.error(f"복사할 수 없습니다: {src} -> {dst}")
+                continue
+            self.panel(f"복사: {src} -> {dst}")
+            lines.append(f"'{src}'를 '{dst}'(으)로 복사했습니다.")
+        return lines
+
+    def _sources_and_target(self, paths):
+        # cp/mv a b c dir : 원본이 여러 개면(글롭 확장 등) 대상은 디렉토리여야 한다
+        sources, dst = paths[:-1], paths[-1]
+        if len(sources) > 1:
+            target = self.vfs._resolve_path(dst)
+            if target is None or not target.is_dir():
+                self.error(f"대상 '{dst}'는 디렉토리가 아닙니다")
+                return None, None
+        return sources, dst
+
+    def mv_command(self, args):
+        if len(args) < 2:
+            self.error("사용법: mv <원본>... <대상>")
+            return None
+        sources, dst = self._sources_and_target(args)
+        if sources is None:
+            return None
+        lines = []
+        for src in sources:
+            if self.vfs._resolve_path(src) is None:
+                self.error(f"파일이나 디렉토리를 찾을 수 없습니다: {src}")
+                continue
+            if not self.vfs.move(src, dst):
+                self.error(f"이동할 수 없습니다: {src} -> {dst}")
+                continue
+            self.panel(f"이동: {src} -> {dst}")
+            lines.append(f"'{src}'를 '{dst}'(으)로 이동했습니다.")
+        return lines
+
+    def find_command(self, args):
+        start = '.'
+        name = None
+        kind = None
+        maxdepth = None
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            value = args[i + 1] if i + 1 < len(args) else None
+            if arg in ('-name', '-type', '-maxdepth'):
+                if value is None:
+                    self.error(f"find: {arg} 옵션에 값이 필요합니다.")
+                    return None
+                if arg == '-name':
+                    name = value
+                elif arg == '-type':
+                    if value not in ('f', 'd'):
+                        self.error(f"find: 알 수 없는 종류입니다: {value}")
+                        return None
+                    kind = 'file' if value == 'f' else 'directory'
+                else:
+                    if not (value.isascii() and value.isdigit()):
+                        self.error(f"find: -maxdepth에는 0 이상의 정수가 필요합니다: '{value}' "
+                                   "(사용법: find [경로] [-name 패턴] [-type f|d] [-maxdepth N])")
+                        return None
+                    maxdepth = int(value)
+                i += 2
+                continue
+            if arg.startswith('-') or i > 0:
+                self.error(f"find: 알 수 없는 옵션입니다: {arg}")
+                return None
+            start = arg
+            i += 1
+
+        node = self.vfs._resolve_path(start)
+        if node is None:
+            self.error(f"find: '{start}': 그런 파일이나 디렉토리가 없습니다")
+            return None
+        self.panel(f"파일 찾기: {start}")
+        display = start.rstrip('/') if start != '/' else ''
+        if name is None:
+            return self._walk(node, display or '/', kind, maxdepth)
+        # 마운트된 호스트 폴더는 들여다본 곳만 색인에 있으므로, 찾기 전에 끝까지 읽어 둔다
+        refresh_mounts(self.vfs, node)
+        return self._find_indexed(node, display, name, kind, maxdepth)
+
+    def _find_indexed(self, node, display, pattern, kind, maxdepth):
+        # 이름 색인에서 후보를 찾고 시작 경로 아래에 있는 것만 고른다
+        base = self.vfs.node_path(node)
+        prefix = '' if base == '/' else base
+        for path, hit in self.name_index.search(pattern):
+            self.check_cancel()
+            if path != base and not path.startswith(prefix + '/'):
+                continue
+            rel = path[len(prefix):]
+            if maxdepth is not None and rel.count('/') > maxdepth:
+                continue
+            if kind is not None and hit.type != kind:
+                continue
+            yield display + rel if (display or rel) else '/'
+
+    def _walk(self, node, display, kind, maxdepth):
+        stack = [(node, display, 0)]
+        while stack:
+            current, path, depth = stack.pop()
+            self.check_cancel()
+            if kind is None or current.type == kind:
+                yield path
+            if current.is_dir() and (maxdepth is None or depth < maxdepth):
+                prefix = '' if path == '/' else path
+                kids = current.children
+                for child in sorted(kids, reverse=True):
+                    stack.append((kids[child], f"{prefix}/{child}", depth + 1))
+
+    def locate_command(self, args):
+        if not args:
+            self.error("사용법: locate <패턴>")
+            return None
+        pattern = args[0]
+        if not GLOB_CHARS.search(pattern):
+            pattern = f"*{pattern}*"
+        self.panel(f"파일 위치 찾기: {args[0]}")
+        paths = [path for path, node in self.name_index.search(pattern)]
+        if not paths:
+            self._result.status = 1
+        return paths
+
+    def cat_command(self, args, stdin=None):
+        if not args:
+            if stdin is None:
+                self.error("사용법: cat <파일명>")
+                return None
+            return stdin
+        return self._cat_lines(args)
+
+    def _cat_lines(self, paths):
+        for path in paths:
+            lines = self.vfs.read_lines(path)
+            if lines is None:
+                self.error(f"파일을 찾을 수 없습니다: {path}")
+                continue
+            self.panel(f"파일 내용 표시: {path}")
+            yield from self._cancellable(lines)
+
+    def _input_lines(self, files, stdin, usage):
+        # 파일 인자가 있으면 파일을, 없으면 파이프 입력을 읽는다
+        if files:
+            return self._cat_lines(files)
+        if stdin is None:
+            self.error(usage)
+            return None
+        return stdin
+
+    def _count_option(self, command, args, default=10):
+        # head/tail 의 -n N, -N 형식 옵션 처리. 줄 수가 숫자가 아니면 오류를 내고 (None, None)
+        count = default
+        rest = []
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg == '-n' and i + 1 < len(args):
+                value = args[i + 1]
+                try:
+                    count = int(value)
+                except ValueError:
+                    self.error(f"{command}: 잘못된 줄 수입니다: {value} (사용법: {command} [-n N] <파일>)")
+                    return None, None
+                i += 1
+            elif arg.startswith('-n') and arg[2:].isdigit():
+                count = int(arg[2:])
+            elif arg.startswith('-') and arg[1:].isdigit():
+                count = int(arg[1:])
+            else:
+                rest.append(arg)
+            i += 1
+        return count, rest
+
+    def grep_command(self, args, stdin=None):
+        flags = set()
+        rest = []
+        for arg in args:
+            if arg.startswith('-') and len(arg) > 1 and not rest:
+                flags.update(arg[1:])
+            else:
+                rest.append(arg)
+        if not rest:
+            self.error("사용법: grep [-i] [-v] [-n] [-c] [-r] <패턴> [파일...]")
+            return None
+        pattern, files = rest[0], rest[1:]
+        try:
+            regex = re.compile(pattern, re.IGNORECASE if 'i' in flags else 0)
+        except re.error:
+            regex = re.compile(re.escape(pattern), re.IGNORECASE if 'i' in flags else 0)
+        if 'r' in flags or 'R' in flags:
+            self.panel(f"패턴 검색 (하위 디렉토리 포함): {pattern}")
+            return self._grep_recursive(regex, files or ['.'], flags)
+        if files:
+            # GNU grep처럼 파일이 둘 이상이면 줄(-c면 개수) 앞에 "경로:"를 붙인다
+            self.panel(f"패턴 검색: {pattern}")
+            return self._grep_files(regex, files, flags)
+        lines = self._input_lines(files, stdin, "사용법: grep <패턴> <파일>")
+        if lines is None:
+            return None
+        self.panel(f"패턴 검색: {pattern}")
+        return self._grep(regex, lines, 'v' in flags, 'n' in flags, 'c' in flags)
+
+    def _grep(self, regex, lines, invert, numbered, count_only):
+        search = regex.search
+        count = 0
+        for number, line in enumerate(lines, 1):
+            if (search(line) is None) == invert:
+                count += 1
+                if not count_only:
+                    yield f"{number}:{line}" if numbered else line
+        if count_only:
+            yield str(count)
+        if count == 0:
+            self._result.status = 1
+
+    def _grep_targets(self, paths, recursive=True):
+        # grep 대상: (표시 경로, 파일 노드)를 경로 순서대로, 그리고 읽지 못한 인자가 있었는지.
+        # 없는 파일(-r이 아니면 디렉토리도)은 GNU grep처럼 오류로 알리고 종료 코드를 2로 만든다
+        targets = []
+        failed = False
+        for path in paths:
+            node = self.vfs._resolve_path(path)
+            if node is None:
+                self.error(f"grep: {path}: 그런 파일이나 디렉토리가 없습니다", status=2)
+                failed = True
+                continue
+            if not recursive:
+                if node.is_dir():
+                    self.error(f"grep: {path}: 디렉토리입니다", status=2)
+                    failed = True
+                else:
+                    targets.append((path, node))
+                continue
+            stack = [(node, path.rstrip('/') or '/')]
+            while stack:
+                current, current_path = stack.pop()
+                self.check_cancel()
+                if not current.is_dir():
+                    targets.append((current_path, current))
+                    continue
+                prefix = '' if current_path == '/' else current_path
+                kids = current.children
+                for name in sorted(kids, reverse=True):
+                    stack.append((kids[name], f"{prefix}/{name}"))
+        return targets, failed
+
+    def _grep_files(self, regex, paths, flags):
+        targets, failed = self._grep_targets(paths, recursive=False)
+        matched = yield from self._grep_each(regex, targets, flags, len(paths) > 1)
+        self._grep_status(matched, failed)
+
+    def _grep_each(self, regex, targets, flags, labelled):
+        # 파일을 차례로 찾는다. labelled면 줄과 개수 앞에 "경로:"를 붙인다. 찾은 줄이 있었는지 돌려준다
+        invert, numbered, count_only = 'v' in flags, 'n' in flags, 'c' in flags
+        search = regex.search
+        matched = False
+        for path, node in targets:
+            label = f"{path}:" if labelled else ""
+            count = 0
+            for number, line in enumerate(self._cancellable(node.iter_lines()), 1):
+                if (search(line) is None) == invert:
+                    count += 1
+                    if not count_only:
+                        yield f"{label}{number}:{line}" if numbered else f"{label}{line}"
+            if count_only:
+                yield f"{label}{count}"
+            matched = matched or count > 0
+        return matched
+
+    def _grep_status(self, matched, failed):
+        # GNU grep: 읽지 못한 파일이 있으면 2, 아니면 찾았으면 0, 못 찾았으면 1
+        if failed:
+            self._result.status = 2
+        elif not matched:
+            self._result.status = 1
+
+    def _grep_recursive(self, regex, paths, flags):
+        import parallel_grep  # multiprocessing을 불러오는 데 시간이 걸리므로 처음 grep -r 할 때
+        invert, numbered, count_only = 'v' in flags, 'n' in flags, 'c' in flags
+        targets, failed = self._grep_targets(paths)
+        matched = False
+        if self.allow_parallel and parallel_grep.available(sum(node.size for path, node in targets)):
+            # 내용이 크면 프로세스 풀에서 파일/조각을 나눠 동시에 찾는다
+            jobs = []
+            for path, node in targets:
+                data = node._content
+                if data.__class__ is HostContent:
+                    jobs.append((path, [(data.path, True, 1)]))
+                else:
+                    jobs.append((path, parallel_grep.split(node.content)))
+            for path, hits in parallel_grep.search(regex.pattern, regex.flags & re.IGNORECASE, invert,
+                                                   count_only, jobs, self.check_cancel):
+                if count_only:
+                    matched = matched or hits > 0
+                    yield f"{path}:{hits}"
+                    continue
+                matched = matched or bool(hits)
+                for number, line in hits:
+                    yield f"{path}:{number}:{line}" if numbered else f"{path}:{line}"
+        else:
+            matched = yield from self._grep_each(regex, targets, flags, True)
+        self._grep_status(matched, failed)
+
+    def head_command(self, args, stdin=None):
+        count, files = self._count_option('head', args)
+        if count is None:
+            return None
+        lines = self._input_lines(files, stdin, "사용법: head [-n N] <파일>")
+        if lines is None:
+            return None
+        self.panel(f"앞부분 {count}줄 표시")
+        # islice가 count줄을 채우면 앞 단계는 더 이상 읽히지 않는다
+        return itertools.islice(lines, max(count, 0))
+
+    def tail_command(self, args, stdin=None):
+        count, files = self._count_option('tail', args)
+        if count is None:
+            return None
+        lines = self._input_lines(files, stdin, "사용법: tail [-n N] <파일>")
+        if lines is None:
+            return None
+        self.panel(f"뒷부분 {count}줄 표시")
+        return deque(lines, maxlen=max(count, 0))
+
+    def wc_command(self, args, stdin=None):
+        flags = set()
+        files = []
+        for arg in args:
+            if arg.startswith('-') and len(arg) > 1:
+                flags.update(arg[1:])
+            else:
+                files.append(arg)
+        if files:
+            line_count = word_count = char_count = 0
+            for path in files:
+                node = self.vfs._resolve_path(path)
+                if node is None or node.type != 'file':
+                    self.error(f"파일을 찾을 수 없습니다: {path}")
+                    continue
+                self.panel(f"파일 내용 표시: {path}")
+                lines, words, chars, size = self._wc_count(self._cancellable(node.iter_lines()))
+                if lines and size == node.size + 1:
+                    # 마지막 줄에 줄바꿈이 없다. coreutils처럼 줄 수는 '\n' 개수로 센다
+                    lines -= 1
+                    chars -= 1
+                line_count += lines
+                word_count += words
+                char_count += chars
+        elif stdin is None:
+            self.error("사용법: wc [-l] [-w] [-c] <파일>")
+            return None
+        else:
+            # 파이프로 받은 줄은 모두 줄바꿈으로 끝난 것으로 센다
+            line_count, word_count, char_count, size = self._wc_count(stdin)
+        if not flags:
+            flags = {'l', 'w', 'c'}
+        columns = []
+        if 'l' in flags:
+            columns.append(f"{line_count:>7}")
+        if 'w' in flags:
+            columns.append(f"{word_count:>7}")
+        if 'c' in flags or 'm' in flags:
+            columns.append(f"{char_count:>7}")
+        if len(files) == 1:
+            columns.append(files[0])
+        self.panel("줄/단어/글자 수 세기")
+        return [" ".join(columns)]
+
+    @staticmethod
+    def _wc_count(lines):
+        # (줄 수, 단어 수, 글자 수, UTF-8 바이트 수). 줄마다 줄바꿈 하나가 붙었다고 보고 센다
+        line_count = word_count = char_count = byte_count = 0
+        for line in lines:
+            line_count += 1
+            word_count += len(line.split())
+            char_count += len(line) + 1
+            byte_count += (len(line) if line.isascii() else len(line.encode('utf-8'))) + 1
+        return line_count, word_count, char_count, byte_count
+
+    def sort_command(self, args, stdin=None):
+        flags = set()
+        files = []
+        for arg in args:
+            if arg.startswith('-') and len(arg) > 1:
+                flags.update(arg[1:])
+            else:
+                files.append(arg)
+        lines = self._input_lines(files, stdin, "사용법: sort [-r] [-n] [-u] <파일>")
+        if lines is None:
+            return None
+        if 'u' in flags:
+            lines = set(lines)
+        key = None
+        if 'n' in flags:
+            key = self._numeric_key
+        self.panel("줄 정렬")
+        return sorted(lines, key=key, reverse='r' in flags)
+
+    @staticmethod
+    def _numeric_key(line):
+        match = re.match(r'\s*(-?\d+(?:\.\d+)?)', line)
+        return (float(match.group(1)) if match else 0.0, line)
+
+    def uniq_command(self, args, stdin=None):
+        counted = '-c' in args
+        files = [arg for arg in args if arg != '-c']
+        lines = self._input_lines(files, stdin, "사용법: uniq [-c] <파일>")
+        if lines is None:
+            return None
+        self.panel("연속된 중복 줄 제거")
+        return self._uniq(lines, counted)
+
+    def _uniq(self, lines, counted):
+        previous = None
+        count = 0
+        for line in lines:
+            if count and line == previous:
+                count += 1
+                continue
+            if count:
+                yield f"{count:>7} {previous}" if counted else previous
+            previous = line
+            count = 1
+        if count:
+            yield f"{count:>7} {previous}" if counted else previous
+
+    def touch_command(self, args):
+        if not args:
+            self.error("사용법: touch <파일명>...")
+            return None
+        lines = []
+        for path in args:
+            if not self.vfs.create_file(path):
+                self.error(f"파일을 생성할 수 없습니다: {path}")
+                continue
+            self.panel(f"새 파일 생성: {path}")
+            lines.append(f"파일 '{path}'가 생성되었습니다.")
+        return lines
+
+    def clear_command(self, args):
+        self._result.clear = True
+        self.panel("화면을 초기화합니다.")
+
+    def exit_command(self, args):
+        self._result.exit = True
+        return ["프로그램을 종료합니다."]
+
+    def echo_command(self, args):
+        if not args:
+            return [""]
+        self.panel(f"텍스트 출력: {' '.join(args)}")
+        return [" ".join(args)]
+
+    def whoami_command(self, args):
+        self.panel("현재 사용자 정보 표시")
+        return ["user"]
+
+    def date_command(self, args):
+        self.panel("현재 날짜와 시간 표시")
+        return [datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+
+    def help_command(self, args):
+        self.panel("도움말 정보 표시")
+        return HELP_TEXT.split('\n')
+
+    def history_command(self, args):
+        # history [N] : 마지막 N개만, history -c : 모두 지우기
+        if args and args[0] == '-c':
+            self.history.clear()
+            self.panel("명령어 히스토리 삭제")
+            return None
+        count = None
+        if args:
+            if not args[0].isdigit():
+                self.error(f"history: 숫자가 필요합니다: {args[0]}")
+                return None
+            count = int(args[0])
+        if not len(self.history):
+            return ["명령어 히스토리가 없습니다."]
+        self.panel("명령어 히스토리 표시")
+        return (f"{number}  {cmd}" for number, cmd in self.history.numbered(count))
+
+    # 스크립트 실행
+    def parse_script(self, text):
+        # 스크립트 -> [(줄 번호, 명령줄, 파싱 결과 또는 ValueError)]. 같은 내용은 한 번만 파싱한다
+        import hashlib
+        key = hashlib.sha1(text.encode('utf-8')).digest()
+        steps = _script_cache.get(key)
+        if steps is not None:
+            _script_cache.move_to_end(key)
+            return steps
+        steps = list(self.iter_steps(iter_text_lines(text)))
+        _script_cache[key] = steps
+        if len(_script_cache) > SCRIPT_CACHE_SIZE:
+            _script_cache.popitem(last=False)
+        return steps
+
+    def iter_steps(self, lines):
+        # 줄 반복자 -> 단계 반복자 (표준 입력처럼 끝을 모르는 입력도 한 줄씩 처리)
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue  # 빈 줄, 주석, #!
+            try:
+                yield number, line, self._parse(line)
+            except ValueError as e:
+                yield number, line, e
+
+    def run_script(self, steps, name, subshell=False):
+        # 단계마다 CommandResult를 하나씩 돌려준다 (히스토리에는 남기지 않는다).
+        # subshell(bash)이면 끝난 뒤 작업 디렉토리를 되돌리고, exit는 스크립트만 끝낸다.
+        outer = self._result
+        saved_cwd = self.vfs.get_path() if subshell else None
+        self._script_depth += 1
+        try:
+            for number, line, parsed in steps:
+                self.check_cancel()
+                result = CommandResult(line)
+                stop = False
+                self._result = result
+                record = self.profiler.begin(line) if self.profiler.enabled else None
+                try:
+                    if self._script_depth > MAX_SCRIPT_DEPTH:
+                        self.error(f"{name}: 스크립트 중첩이 너무 깊습니다")
+                        stop = True
+                    elif isinstance(parsed, ValueError):
+                        self.error(f"{name}: {number}행: 구문 오류: {parsed}", status=2)
+                    elif subshell and parsed[0][0][0] == 'exit':
+                        stop = True
+                    else:
+                        self._run(parsed)
+                        if self.in_interactive_mode():
+                            self.editor_mode = self.top_mode = False
+                            result.stdout = []
+                            self.error(f"{name}: {number}행: 스크립트에서는 대화형 명령을 쓸 수 없습니다: {line}")
+                finally:
+                    self._result = outer
+                    if record is not None:
+                        self.profiler.end(record, result)
+                yield result
+                if stop or result.exit:
+                    return
+        finally:
+            self._script_depth -= 1
+            if saved_cwd is not None:
+                self.vfs.change_dir(saved_cwd)
+
+    def _script_output(self, steps, name, subshell):
+        # 스크립트 안 명령들의 출력을 한 줄씩 흘려보낸다 (파이프/리다이렉션 가능)
+        outer = self._result
+        outer.status = 0
+        for result in self.run_script(steps, name, subshell):
+            outer.stderr.extend(result.stderr)
+            outer.panel.extend(result.panel)
+            outer.status = result.status
+            if result.exit:
+                outer.exit = True
+            yield from result.stdout
+
+    def _script_source(self, command, args, stdin):
+        if not args:
+            if stdin is None:
+                self.error(f"사용법: {command} <스크립트 파일>", status=2)
+                return None
+            return "\n".join(stdin), command  # cat setup.sh | bash
+        node = self.vfs._resolve_path(args[0])
+        if node is None or node.is_dir():
+            self.error(f"{command}: {args[0]}: 그런 파일이 없습니다", status=127)
+            return None
+        return node.content, args[0]
+
+    def bash_command(self, args, stdin=None):
+        source = self._script_source('bash', args, stdin)
+        if source is None:
+            return None
+        text, name = source
+        self.panel(f"스크립트 실행: {name}")
+        return self._script_output(self.parse_script(text), name, subshell=True)
+
+    def source_command(self, args):
+        # 현재 셸에서 실행: cd 등의 효과가 남는다
+        source = self._script_source('source', args, None)
+        if source is None:
+            return None
+        text, name = source
+        self.panel(f"스크립트 실행 (현재 셸): {name}")
+        return self._script_output(self.parse_script(text), name, subshell=False)
+
+    def time_command(self, args):
+        # 파이프라인 맨 앞의 time은 _run에서 처리한다 (여기 오는 것은 파이프 중간의 time)
+        self.error("time: 파이프라인 맨 앞에만 쓸 수 있습니다 (예: time cat a.txt | wc -l)")
+        return None
+
+    def perfstat_command(self, args):
+        # perfstat [on|mem|off|reset]: 측정을 켜 둔 동안 실행한 명령별 p50/p95/p99
+        profiler = self.profiler
+        action = args[0] if args else None
+        if action == 'on':
+            profiler.enable()
+            self.panel("성능 측정 시작")
+            return ["명령별 실행 시간 측정을 시작합니다. (perfstat: 결과 보기, perfstat off: 끄기)"]
+        if action == 'mem':
+            profiler.enable(memory=True)
+            self.panel("성능 측정 시작 (메모리 포함)")
+            return ["실행 시간과 메모리 측정을 시작합니다. (메모리를 재는 동안은 명령이 느려집니다)"]
+        if action == 'off':
+            profiler.disable()
+            self.panel("성능 측정 끝")
+            return ["측정을 껐습니다. 모은 통계는 perfstat reset 전까지 남습니다."]
+        if action == 'reset':
+            profiler.reset()
+            return ["모은 통계를 지웠습니다."]
+        if action is not None:
+            self.error("사용법: perfstat [on|mem|off|reset]")
+            return None
+        if not profiler.stats:
+            return ["측정한 명령이 없습니다." + ("" if profiler.enabled else " (perfstat on으로 측정을 시작하세요)")]
+        return profiler.summary()
+
+    def blobstat_command(self, args):
+        # blobstat [-h]: 큰 파일 내용을 넣어 두는 내용 저장소(blob_store)의 크기와 중복 제거/압축 비율
+        flags, rest = self._split_flags(args)
+        if rest or flags - {'h'}:
+            self.error("사용법: blobstat [-h]")
+            return None
+        store = self.vfs.store
+        if store is None:
+            return ["내용 저장소를 쓰지 않습니다. (파일 내용을 노드에 그대로 둡니다)"]
+        stats = store.stats()
+        size_of = self._human_size if 'h' in flags else (lambda size: f"{size} 바이트")
+        logical, unique, physical = stats['logical_bytes'], stats['unique_bytes'], stats['physical_bytes']
+        self.panel("내용 저장소 사용량 표시")
+        return [f"blob {stats['blobs']}개 (압축 {stats['compressed']}개), 참조 {stats['refs']}개",
+                f"논리 크기: {size_of(logical)} (복사본을 포함해 파일마다 따로 가졌을 때)",
+                f"중복 제거 후: {size_of(unique)} ({stats['dedup_ratio']:.2f}배)",
+                f"실제 크기: {size_of(physical)} (압축 {stats['compression_ratio']:.2f}배, "
+                f"전체 {logical / physical if physical else 1.0:.2f}배)"]
+
+    def top_command(self, args):
+        # top [-b] [-n 횟수] [-d 초] [-o 정렬기준]
+        # -b 또는 -n이 있으면 배치 모드: 화면을 정해진 횟수만큼 출력하고 끝낸다
+        batch = False
+        iterations = None
+        delay = self.top_delay
+        sort_key = self.top_sort
+        options = iter(args)
+        for arg in options:
+            if arg == '-b':
+                batch = True
+                continue
+            if arg not in ('-n', '-d', '-o'):
+                self.error(f"top: 알 수 없는 옵션입니다: {arg}")
+                return None
+            value = next(options, None)
+            if value is None:
+                self.error(f"top: {arg} 옵션에 값이 필요합니다")
+                return None
+            if arg == '-o':
+                sort_key = value.upper()
+                if sort_key not in SORT_KEYS:
+                    self.error(f"top: 정렬 기준을 알 수 없습니다: {value} ({', '.join(SORT_KEYS)})")
+                    return None
+                continue
+            try:
+                number = int(value) if arg == '-n' else float(value)
+            except ValueError:
+                number = 0
+            if number <= 0:
+                self.error(f"top: 잘못된 값입니다: {arg} {value}")
+                return None
+            if arg == '-n':
+                iterations = number
+            else:
+                delay = number
+
+        self.top_sort = sort_key
+        self.top_delay = delay
+        self.panel("시스템 프로세스 정보 표시")
+        if batch or iterations is not None:
+            return self._top_batch(iterations or 1, delay)
+        self.top_mode = True
+        self._result.live = True
+        return self._top_screen()
+
+    def _top_batch(self, iterations, delay):
+        for i in range(iterations):
+            if i:
+                self._cancellable_sleep(delay)
+            yield from self._top_frame()
+            yield ""
+
+    def _top_input(self, command):
+        if command == "q":
+            self.top_mode = False
+            if self._top_sampler is not None:
+                self._top_sampler.close()  # 열어 둔 /proc 파일을 닫는다
+            self._result.stdout.append("top 모드를 종료합니다.")
+            return
+        if command in SORT_HOTKEYS:
+            self.top_sort = SORT_HOTKEYS[command]
+        elif command.startswith("d "):
+            try:
+                delay = float(command[2:])
+            except ValueError:
+                delay = 0
+            if delay <= 0:
+                self.error(f"잘못된 갱신 간격입니다: {command[2:]}")
+                return
+            self.top_delay = delay
+        self._result.live = True
+        self._result.stdout.extend(self._top_screen())
+
+    def top_tick(self):
+        # GUI 타이머가 top 화면을 새로 그릴 때 부른다 (히스토리에 남지 않는다)
+        result = CommandResult('')
+        if self.top_mode:
+            result.live = True
+            result.stdout = self._top_screen()
+        return result
+
+    def _top_screen(self):
+        hint = f"종료: q  정렬: P(CPU) M(메모리) N(PID) T(시간)  간격 변경: d 초  [정렬 {self.top_sort}, {self.top_delay:g}초마다 갱신]"
+        return [hint] + self._top_frame()
+
+    def _top_frame(self):
+        # /proc이 있으면(리눅스) 실제 값, 없거나(Windows 등) 서버 세션이면 시뮬레이션 값
+        if self._top_sampler is None and self.allow_host_proc and ProcSampler.available():
+            self._top_sampler = ProcSampler()
+        if self._top_sampler is not None:
+            return self._top_sampler.frame(self.top_sort, self.top_rows)
+        return self.top_info()
+
+    def top_info(self):
+        # 시뮬레이션된 프로세스 정보 생성
+        processes = [
+            {"PID": 1, "USER": "root", "PR": 20, "NI": 0, "VIRT": "100m", "RES": "10m", "SHR": "5m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:10", "COMMAND": "init"},
+            {"PID": 2, "USER": "root", "PR": 20, "NI": 0, "VIRT": "200m", "RES": "20m", "SHR": "10m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:20", "COMMAND": "kthreadd"},
+            {"PID": 3, "USER": "user", "PR": 20, "NI": 0, "VIRT": "300m", "RES": "30m", "SHR": "15m", "S": "R", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:30", "COMMAND": "bash"},
+            {"PID": 4, "USER": "user", "PR": 20, "NI": 0, "VIRT": "400m", "RES": "40m", "SHR": "20m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:40", "COMMAND": "python"},
+            {"PID": 5, "USER": "user", "PR": 20, "NI": 0, "VIRT": "500m", "RES": "50m", "SHR": "25m", "S": "S", "CPU": random.randint(0, 5), "MEM": random.randint(1, 10), "TIME": "00:00:50", "COMMAND": "top"}
+        ]
+
+        # 헤더
+        lines = ["PID USER      PR  NI    VIRT    RES    SHR S  %CPU %MEM     TIME+ COMMAND"]
+
+        # 프로세스 정보
+        for proc in processes:
+            lines.append(f"{proc['PID']:<4} {proc['USER']:<9} {proc['PR']:<3} {proc['NI']:<3} {proc['VIRT']:<7} {proc['RES']:<7} {proc['SHR']:<7} {proc['S']} {proc['CPU']:>4} {proc['MEM']:>4} {proc['TIME']:>9} {proc['COMMAND']}")
+
+        # 시스템 정보
+        lines.append("")
+        lines.append(f"Tasks: {len(processes)} total, 1 running, {len(processes)-1} sleeping, 0 stopped, 0 zombie")
+        lines.append(f"Cpu(s): {random.randint(1, 100)}%us, {random.randint(1, 50)}%sy, {random.randint(0, 20)}%ni, {random.randint(1, 50)}%id, {random.randint(0, 10)}%wa, {random.randint(0, 5)}%hi, {random.randint(0, 5)}%si, {random.randint(0, 5)}%st")
+        lines.append(f"Mem: {random.randint(1000, 8000)}M total, {random.randint(500, 4000)}M used, {random.randint(500, 4000)}M free, {random.randint(100, 1000)}M buffers")
+        lines.append(f"Swap: {random.randint(1000, 4000)}M total, {random.randint(0, 1000)}M used, {random.randint(1000, 4000)}M free, {random.randint(500, 2000)}M cached")
+        lines.append("")
+        return lines
+
+    def vi_command(self, args):
+        if not args:
+            self.error("사용법: vi <파일명>")
+            return None
+        if not self._open_editor(args[0], 'vi'):
+            return None
+        if self.editor_insert:
+            return [f"'{self.editor_filename}' 파일 편집 모드로 진입했습니다. (새 파일, 입력 모드)",
+                    "입력을 마치려면 ^[ (Esc)를 입력하세요. :wq 저장 후 종료, :q! 저장하지 않고 종료"]
+        return [f"'{self.editor_filename}' 파일 편집 모드로 진입했습니다. ({self._editor_stats()})",
+                "명령 모드: :N 줄 이동, j/k 아래/위, dd 줄 삭제, o/O 아래/위에 입력, i 현재 줄 앞에 입력",
+                "편집을 마치려면 :wq 를 입력하세요.",
+                "저장하지 않고 종료하려면 :q! 를 입력하세요.",
+                self._editor_show()]
+
+    def nano_command(self, args):
+        if not args:
+            self.error("사용법: nano <파일명>")
+            return None
+        if not self._open_editor(args[0], 'nano'):
+            return None
+        return [f"'{self.editor_filename}' 파일 편집 모드로 진입했습니다. ({self._editor_stats()})",
+                "입력한 줄은 현재 줄 아래에 들어갑니다. ^K 줄 잘라내기, ^_ N 줄 이동, ^O 저장",
+                "편집을 마치려면 ^X (Ctrl+X)를 입력하세요.",
+                "저장하지 않고 종료하려면 ^C (Ctrl+C)를 입력하세요."]
+
+    def _open_editor(self, filename, kind):
+        # 파일이 있으면 내용을 피스 테이블로 연다 (내용을 복사하지 않는다).
+        # 저장할 경로는 지금 기준의 절대 경로로 정해 둔다.
+        node = self.vfs._resolve_path(filename)
+        if node is not None:
+            if node.is_dir():
+                self.error(f"{filename}: 디렉토리입니다.")
+                return False
+            path = self.vfs.node_path(node)
+            buffer = PieceTable.of(node)
+        else:
+            parent, name = self.vfs._split_parent(filename)
+            if parent is None or not name or name in ('.', '..'):
+                self.error(f"{filename}: 그런 디렉토리가 없습니다.")
+                return False
+            path = self.vfs.node_path(parent).rstrip('/') + '/' + name
+            buffer = PieceTable()
+        self.editor_filename = filename
+        self.editor_path = path
+        self.editor_buffer = buffer
+        self.editor_kind = kind
+        self.editor_modified = False
+        self.editor_mode = True
+        # vi는 첫 줄(빈 파일이면 입력 모드), nano는 마지막 줄 아래에 이어 쓰도록 연다
+        self.editor_insert = kind == 'nano' or not buffer.lines
+        self.editor_line = 0 if kind == 'vi' and buffer.lines else buffer.lines - 1
+        self.panel(f"파일 편집 시작: {self.editor_path}")
+        return True
+
+    def _editor_stats(self):
+        buffer = self.editor_buffer
+        return f"{buffer.lines}줄, {buffer.length}바이트"
+
+    def _editor_show(self):
+        # 현재 줄 보여주기
+        if self.editor_line < 0:
+            return "(파일의 맨 앞)" if self.editor_buffer.lines else "(빈 파일)"
+        return f"{self.editor_line + 1}: {self.editor_buffer.line(self.editor_line)}"
+
+    def _editor_goto(self, target):
+        # target: 1부터 센 줄 번호 (0이면 첫 줄 앞). 범위 밖이면 끝으로 붙인다
+        self.editor_line = max(-1, min(target, self.editor_buffer.lines) - 1)
+        self._result.stdout.append(self._editor_show())
+
+    def _editor_delete(self, count):
+        if not self.editor_buffer.lines:
+            self.error("지울 줄이 없습니다. (빈 파일)")
+            return
+        if self.editor_line < 0:
+            self.editor_line = 0  # 파일의 맨 앞이면 첫 줄부터 지운다
+        removed = self.editor_buffer.delete(self.editor_line, count)
+        self.editor_modified = True
+        self.editor_line = min(self.editor_line, self.editor_buffer.lines - 1)
+        self._result.stdout.append(f"{removed}줄 삭제")
+        self._result.stdout.append(self._editor_show())
+
+    def _editor_input(self, command):
+        if command == ":wq" or command == ":x" or command == "ZZ":
+            self.save_and_exit_editor()
+        elif command == ":q!":
+            self.exit_editor_without_save()
+        elif command == "^X":  # Ctrl+X (nano 종료)
+            self.save_and_exit_editor()
+        elif command == "^C":  # Ctrl+C (nano 취소)
+            self.exit_editor_without_save()
+        elif self.editor_kind == 'nano':
+            self._nano_input(command)
+        elif self.editor_insert:
+            if command in ("^[", "ESC"):  # Esc: 명령 모드로
+                self.editor_insert = False
+                self._result.stdout.append(self._editor_show())
+            else:
+                self._editor_type(command)
+        else:
+            self._vi_command_input(command)
+
+    def _editor_type(self, text):
+        # 입력한 줄을 현재 줄 아래에 넣고 그 줄로 간다
+        self.editor_line += 1
+        self.editor_buffer.insert(self.editor_line, [text])
+        self.editor_modified = True
+        self._result.stdout.append(text)
+
+    def _nano_input(self, command):
+        if command == "^K":  # 현재 줄 잘라내기
+            self._editor_delete(1)
+        elif command == "^O":  # 저장 (편집은 계속)
+            self._save_editor()
+        elif command == "^_" or command.startswith("^_ "):  # 줄 이동
+            target = command[2:].strip()
+            if not target.isdigit():
+                self.error("사용법: ^_ <줄 번호>")
+                return
+            self._editor_goto(int(target))
+        else:
+            self._editor_type(command)
+
+    def _vi_command_input(self, command):
+        line = self.editor_line
+        if command == "dd" or (command.endswith("dd") and command[:-2].isdigit()):
+            self._editor_delete(int(command[:-2] or 1))
+        elif command in ("o", "O", "i"):
+            # o: 아래에 입력, O/i: 현재 줄 위에 입력 (입력한 줄은 현재 줄 아래에 들어가므로 한 줄 위로)
+            if command != "o":
+                self.editor_line = line - 1 if line >= 0 else -1
+            self.editor_insert = True
+            self._result.stdout.append("-- 입력 --")
+        elif command == "j" or command == "k":
+            self._editor_goto(line + 1 + (1 if command == "j" else -1))
+        elif command == "gg":
+            self._editor_goto(1)
+        elif command in ("G", ":$"):
+            self._editor_goto(self.editor_buffer.lines)
+        elif command.startswith(":") and command[1:].isdigit():
+            self._editor_goto(int(command[1:]))
+        elif command == ":p":
+            self._result.stdout.append(self._editor_show())
+        elif command == ":w":
+            self._save_editor()
+        elif command == ":q":
+            if self.editor_modified:
+                self.error("변경 내용이 저장되지 않았습니다 (무시하고 나가려면 :q!)")
+            else:
+                self._close_editor()
+        else:
+            self.error(f"알 수 없는 명령입니다: {command} (입력하려면 먼저 o 또는 i)")
+
+    def _save_editor(self):
+        # 바뀐 것이 있을 때만 조각 목록을 복사해 노드 내용으로 넣는다 (원본 문자열은 그대로 공유)
+        if not self.editor_modified and self.vfs._resolve_path(self.editor_path) is not None:
+            self._result.stdout.append(f"'{self.editor_filename}' 변경 내용이 없습니다.")
+            return True
+        try:
+            saved = self.vfs.write_file(self.editor_path, self.editor_buffer.copy())
+        except PermissionError as e:
+            self.error(str(e))
+            return False
+        if not saved:
+            self.error(f"파일에 쓸 수 없습니다: {self.editor_path}")
+            return False
+        self.editor_modified = False
+        self._result.stdout.append(f"'{self.editor_filename}' 파일이 저장되었습니다. ({self._editor_stats()})")
+        self.panel(f"파일 저장 완료: {self.editor_path}")
+        return True
+
+    def save_and_exit_editor(self):
+        if self._save_editor():
+            self._close_editor()
+
+    def exit_editor_without_save(self):
+        self._result.stdout.append("편집을 취소하고 종료합니다.")
+        self.panel("파일 편집 취소")
+        self._close_editor()
+
+    def _close_editor(self):
+        self.editor_mode = False
+        self.editor_buffer = None
+        self.editor_filename = ""
+        self.editor_path = ""
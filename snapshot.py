@@ -0,0 +1,122 @@
+import mmap
+import struct
+
+from vfs import Inode, VirtualFileSystem
+
+# 스냅샷 파일 구조
+#   헤더 | 노드 테이블(고정 길이 레코드) | 이름 영역 | 내용 영역
+# 노드는 전위 순서로 저장하므로 부모 인덱스는 항상 자기보다 작다.
+# 내용이 같은 파일들은 내용 영역의 같은 위치를 가리킨다 (한 번만 저장).
+MAGIC = b'LSIMSNP1'
+HEADER = struct.Struct('<8sIQQQ')  # magic, 노드 수, 테이블/이름/내용 영역 시작 위치
+RECORD = struct.Struct('<IBIHQQ')  # 부모, 종류, 이름 위치, 이름 길이, 내용 위치, 내용 길이
+NO_PARENT = 0xFFFFFFFF
+TYPE_DIR = 0
+TYPE_FILE = 1
+
+
+class MappedContent:
+    # mmap 영역의 일부를 가리키는 파일 내용. read_file/cat이 처음 읽을 때만 디코딩한다.
+    __slots__ = ('mapping', 'offset', 'length')
+
+    def __init__(self, mapping, offset, length):
+        self.mapping = mapping
+        self.offset = offset
+        self.length = length
+
+    def raw(self):
+        return self.mapping[self.offset:self.offset + self.length]
+
+    def load(self):
+        return self.raw().decode('utf-8')
+
+    def iter_lines(self):
+        mapping = self.mapping
+        start = self.offset
+        end = self.offset + self.length
+        while start < end:
+            newline = mapping.find(b'\n', start, end)
+            if newline < 0:
+                yield mapping[start:end].decode('utf-8')
+                return
+            yield mapping[start:newline].decode('utf-8')
+            start = newline + 1
+
+
+def _content_bytes(node):
+    data = node._content
+    if data.__class__ is not str:
+        return data.raw()  # 지연 내용(mmap, 호스트 파일)은 디코딩 없이 그대로 복사
+    return node.content.encode('utf-8')
+
+
+def save_snapshot(vfs, path):
+    records = []
+    names = bytearray()
+    blobs = []
+    blob_size = 0
+    offsets = {}  # 내용 -> 내용 영역 위치 (같은 내용의 파일들은 한 곳을 같이 가리킨다)
+
+    # 전위 순회: (노드, 부모 인덱스)
+    stack = [(vfs.root, NO_PARENT)]
+    while stack:
+        node, parent_index = stack.pop()
+        index = len(records)
+        name = node.name.encode('utf-8')
+        if node.is_dir():
+            records.append((parent_index, TYPE_DIR, len(names), len(name), 0, 0))
+            for child in reversed(sorted(node.children)):
+                stack.append((node.children[child], index))
+        else:
+            data = _content_bytes(node)
+            at = offsets.get(data)
+            if at is None:
+                at = offsets[data] = blob_size
+                blobs.append(data)
+                blob_size += len(data)
+            records.append((parent_index, TYPE_FILE, len(names), len(name), at, len(data)))
+        names += name
+
+    table_offset = HEADER.size
+    names_offset = table_offset + RECORD.size * len(records)
+    blob_offset = names_offset + len(names)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(records), table_offset, names_offset, blob_offset))
+        f.write(b''.join(RECORD.pack(*record) for record in records))
+        f.write(names)
+        for data in blobs:
+            f.write(data)
+
+
+def load_snapshot(path):
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, count, table_offset, names_offset, blob_offset = HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"스냅샷 파일이 아닙니다: {path}")
+
+    table = mapping[table_offset:names_offset]
+    names = mapping[names_offset:blob_offset].decode('utf-8')
+    # 이름 위치는 바이트 기준이므로 ASCII가 아닌 이름이 있으면 바이트로 잘라야 한다
+    ascii_names = len(names) == blob_offset - names_offset
+    names_raw = None if ascii_names else mapping[names_offset:blob_offset]
+
+    nodes = []
+    for parent_index, kind, name_at, name_len, data_at, data_len in RECORD.iter_unpack(table):
+        if ascii_names:
+            name = names[name_at:name_at + name_len]
+        else:
+            name = names_raw[name_at:name_at + name_len].decode('utf-8')
+        parent = nodes[parent_index] if parent_index != NO_PARENT else None
+        if kind == TYPE_DIR:
+            node = Inode(name, 'directory', parent)
+        else:
+            content = MappedContent(mapping, blob_offset + data_at, data_len) if data_len else ''
+            node = Inode(name, 'file', parent, content)
+        if parent is not None:
+            parent.children[name] = node
+        nodes.append(node)
+
+    if not nodes or nodes[0].type != 'directory':
+        raise ValueError(f"잘못된 스냅샷입니다: {path}")
+    return VirtualFileSystem(root=nodes[0])
@@ -0,0 +1,117 @@
+import time
+
+from PyQt5.QtCore import QEvent, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtWidgets import QLineEdit, QPlainTextEdit
+
+DEFAULT_SCROLLBACK = 10000  # 터미널에 보관할 최대 줄 수
+
+
+class TerminalOutput(QPlainTextEdit):
+    # 줄 수가 제한된(링 버퍼) 출력 창.
+    # append()는 줄을 모아두기만 하고, 이벤트 루프가 한 번 돌 때 한꺼번에 삽입한다.
+    def __init__(self, scrollback=DEFAULT_SCROLLBACK, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)  # 실행 취소 기록이 쌓이지 않도록
+        self.setFont(QFont('Consolas', 10))
+        self.setMaximumBlockCount(scrollback)  # 넘치면 오래된 줄부터 버린다
+        self._pending = []
+        self._flush_scheduled = False
+        self._live_lines = 0  # 끝에서부터 제자리 갱신 영역(top 화면)의 줄 수
+        self.profiler = None  # 추적 중이면 화면에 넣는 시간을 'render'로 남긴다 (perf.Profiler)
+
+    def scrollback(self):
+        return self.maximumBlockCount()
+
+    def append(self, text):
+        self._pending.append(text)
+        self._schedule_flush()
+
+    def extend(self, lines):
+        if lines:
+            self._pending.extend(lines)
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        # 화면에 남을 수 없는 줄은 삽입 전에 미리 버려 메모리를 제한한다
+        limit = self.maximumBlockCount()
+        if limit > 0 and len(self._pending) > 2 * limit:
+            del self._pending[:-limit]
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def flush(self):
+        self._flush_scheduled = False
+        if not self._pending:
+            return
+        # 한 틱에 쌓인 출력은 삽입 한 번(레이아웃 한 번)으로 처리
+        limit = self.maximumBlockCount()
+        if limit > 0 and len(self._pending) > limit:
+            del self._pending[:-limit]
+        profiler = self.profiler
+        start = time.perf_counter() if profiler is not None and profiler.tracing else None
+        count = len(self._pending)
+        text = "\n".join(self._pending)
+        self._pending = []
+        self._live_lines = 0  # 일반 출력이 뒤에 붙으면 갱신 영역은 끝난다
+        self.appendPlainText(text)
+        self.moveCursor(QTextCursor.End)
+        if start is not None:
+            profiler.add_event('flush', 'render', start, time.perf_counter(), {'lines': count})
+
+    def show_live(self, lines):
+        # 마지막 화면을 덧붙이지 않고 제자리에서 바꾼다 (top). 스크롤백이 늘지 않는다.
+        self.flush()
+        text = "\n".join(lines)
+        if not self._live_lines:
+            self.appendPlainText(text)
+        else:
+            document = self.document()
+            first = max(document.blockCount() - self._live_lines, 0)
+            cursor = QTextCursor(document.findBlockByNumber(first))
+            cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+        self._live_lines = len(lines)
+        self.moveCursor(QTextCursor.End)
+
+    def end_live(self):
+        self._live_lines = 0
+
+    def clear(self):
+        self._pending = []
+        self._live_lines = 0
+        super().clear()
+
+    def toPlainText(self):
+        self.flush()
+        return super().toPlainText()
+
+
+class CommandInput(QLineEdit):
+    # 명령 입력 줄. Tab은 포커스 이동 대신 자동 완성 요청으로 쓴다.
+    # Ctrl-R은 히스토리 역방향 검색, 검색 중 Esc는 찾은 명령을 입력 줄에 두고, Ctrl-G는 검색 취소.
+    # Ctrl-C는 선택한 글자가 없으면 복사 대신 실행 중인 명령 중단 요청으로 쓴다.
+    completionRequested = pyqtSignal()
+    interruptRequested = pyqtSignal()
+    reverseSearchRequested = pyqtSignal()
+    searchExitRequested = pyqtSignal(bool)  # True: 찾은 명령을 입력 줄에 둔다
+
+    def event(self, event):
+        if event.type() == QEvent.KeyPress:
+            key = event.key()
+            control = event.modifiers() & Qt.ControlModifier
+            if key == Qt.Key_Tab:
+                self.completionRequested.emit()
+                return True
+            if control and key == Qt.Key_R:
+                self.reverseSearchRequested.emit()
+                return True
+            if control and key == Qt.Key_C and not self.hasSelectedText():
+                self.interruptRequested.emit()
+                return True
+            if key == Qt.Key_Escape or (control and key == Qt.Key_G):
+                self.searchExitRequested.emit(key == Qt.Key_Escape)
+                return True
+        return super().event(event)
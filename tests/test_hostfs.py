@@ -0,0 +1,29 @@
+from hostfs import mount
+from shell_engine import ShellEngine
+
+
+def make_engine(host):
+    engine = ShellEngine()
+    mount(engine.vfs, str(host), '/mnt')
+    return engine
+
+
+def test_cp_file_from_mount_keeps_content(tmp_path):
+    (tmp_path / 'f.log').write_text('before\n')
+    engine = make_engine(tmp_path)
+    assert engine.execute('cp /mnt/f.log /one.log').status == 0
+    (tmp_path / 'f.log').write_text('after, and longer\n')
+    assert engine.execute('cat /one.log').stdout == ['before']
+    assert engine.vfs._resolve_path('/one.log').size == len('before\n')
+
+
+def test_cp_r_from_mount_is_detached_from_host(tmp_path):
+    (tmp_path / 'a.txt').write_text('a\n')
+    engine = make_engine(tmp_path)
+    assert engine.execute('cp -r /mnt /copy').status == 0
+    (tmp_path / 'b.txt').write_text('b' * 33 + '\n')
+    (tmp_path / 'a.txt').write_text('changed\n')
+    assert engine.execute('ls /copy').stdout == ['a.txt']
+    assert engine.execute('cat /copy/a.txt').stdout == ['a']
+    assert engine.execute('du -s /copy').stdout[0].split()[0] == '2'
+    assert engine.vfs._resolve_path('/copy').read_only is False
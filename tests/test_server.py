@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import parallel_grep
+from server import SimulatorServer
+from vfs import VirtualFileSystem
+
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await reader.readline()  # 인사 줄
+    return reader, writer
+
+
+async def request(reader, writer, command):
+    writer.write((command + '\n').encode('utf-8'))
+    lines = []
+    while True:
+        line = (await reader.readline()).decode('utf-8').rstrip('\n')
+        if line.startswith('= '):
+            return lines, line
+        lines.append(line)
+
+
+def test_slow_command_does_not_block_other_sessions():
+    async def run():
+        server = SimulatorServer(VirtualFileSystem())
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        slow = await connect(port)
+        fast = await connect(port)
+        start = time.perf_counter()
+        slow_task = asyncio.ensure_future(request(*slow, 'top -b -n 2 -d 1'))
+        await asyncio.sleep(0.1)
+        lines, status = await request(*fast, 'pwd')
+        fast_elapsed = time.perf_counter() - start
+        await slow_task
+        slow_elapsed = time.perf_counter() - start
+        for _, writer in (slow, fast):
+            writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return lines, status, fast_elapsed, slow_elapsed
+
+    lines, status, fast_elapsed, slow_elapsed = asyncio.run(run())
+    assert lines[0] == '1 /'
+    assert status.startswith('= 0 ')
+    assert slow_elapsed >= 1.0
+    assert fast_elapsed < 0.5, fast_elapsed
+
+
+def test_sessions_do_not_use_grep_process_pool(monkeypatch):
+    # 코어가 여럿이고 파일이 커서 원래는 프로세스 풀을 쓸 상황을 만든다
+    monkeypatch.setattr(parallel_grep, 'workers', lambda: 4)
+    monkeypatch.setattr(parallel_grep, 'PARALLEL_BYTES', 0)
+    monkeypatch.setattr(parallel_grep, '_pool', None)
+    base = VirtualFileSystem()
+    base.create_dir('/lab')
+    for i in range(8):
+        base.write_file(f'/lab/f{i}.log', 'INFO ok\nERROR bad\n' * 100)
+    server = SimulatorServer(base)
+    session = server.open_session()
+    result = session.execute('grep -r -c ERROR /lab')
+    server.close_session(session)
+    assert result.status == 0
+    assert len(result.stdout) == 8
+    assert parallel_grep._pool is None
+
+
+def test_top_in_session_does_not_show_host_processes():
+    server = SimulatorServer(VirtualFileSystem())
+    session = server.open_session()
+    result = session.execute('top -b -n 1')
+    server.close_session(session)
+    assert result.status == 0
+    assert session.engine._top_sampler is None
+    commands = {line.split()[-1] for line in result.stdout[1:] if line and line[0].isdigit()}
+    assert commands == {'init', 'kthreadd', 'bash', 'python', 'top'}
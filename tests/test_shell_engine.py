@@ -0,0 +1,81 @@
+import threading
+import time
+
+from shell_engine import ShellEngine
+
+
+def test_top_batch_stops_soon_after_cancel():
+    engine = ShellEngine()
+    cancelled_at = []
+
+    def cancel():
+        cancelled_at.append(time.perf_counter())
+        engine.cancel()
+
+    timer = threading.Timer(0.3, cancel)
+    timer.start()
+    result = engine.execute('top -b -n 4 -d 1')
+    stop = time.perf_counter() - cancelled_at[0]
+    timer.join()
+    assert result.status == 130
+    assert stop < 0.1, stop
+
+
+def make_files(engine):
+    engine.execute('cd /home/user')
+    engine.vfs.write_file('/home/user/a.log', 'ERROR one\nINFO two\nERROR three\n')
+    engine.vfs.write_file('/home/user/b.log', 'INFO only\n')
+
+
+def test_grep_prefixes_paths_with_several_files():
+    engine = ShellEngine()
+    make_files(engine)
+    result = engine.execute('grep ERROR a.log b.log')
+    assert result.stdout == ['a.log:ERROR one', 'a.log:ERROR three']
+    assert result.status == 0
+    assert engine.execute('grep -n ERROR a.log b.log').stdout == ['a.log:1:ERROR one', 'a.log:3:ERROR three']
+    assert engine.execute('grep ERROR a.log').stdout == ['ERROR one', 'ERROR three']
+
+
+def test_grep_count_per_file():
+    engine = ShellEngine()
+    make_files(engine)
+    result = engine.execute('grep -c ERROR a.log b.log')
+    assert result.stdout == ['a.log:2', 'b.log:0']
+    assert result.status == 0
+    assert engine.execute('grep -c ERROR a.log').stdout == ['2']
+
+
+def test_grep_missing_file_is_an_error():
+    engine = ShellEngine()
+    make_files(engine)
+    result = engine.execute('grep -c ERROR missing.log')
+    assert result.stdout == []
+    assert result.stderr == ['grep: missing.log: 그런 파일이나 디렉토리가 없습니다']
+    assert result.status == 2
+    result = engine.execute('grep ERROR a.log missing.log')
+    assert result.stdout == ['a.log:ERROR one', 'a.log:ERROR three']
+    assert result.status == 2
+
+
+def test_wc_counts_newlines():
+    engine = ShellEngine()
+    engine.execute('cd /home/user')
+    engine.vfs.write_file('/home/user/partial.txt', 'one two\nthree')
+    engine.vfs.write_file('/home/user/full.txt', 'one two\nthree\n')
+    assert engine.execute('wc partial.txt').stdout == ['      1       3      13 partial.txt']
+    assert engine.execute('wc -l full.txt').stdout == ['      2 full.txt']
+    assert engine.execute('wc -l partial.txt full.txt').stdout == ['      3']
+    assert engine.execute('cat partial.txt | wc -l').stdout == ['      2']
+
+
+def test_rm_ancestor_of_cwd_says_busy():
+    engine = ShellEngine()
+    engine.execute('mkdir /work')
+    engine.execute('mkdir /work/sub')
+    engine.execute('cd /work/sub')
+    result = engine.execute('rm -r /work /missing')
+    assert result.stderr == ['rm: 사용 중인 디렉토리입니다 (현재 디렉토리가 그 안에 있습니다): /work',
+                             '파일이나 디렉토리를 찾을 수 없습니다: /missing']
+    assert result.status == 1
+    assert engine.execute('pwd').stdout == ['/work/sub']
@@ -0,0 +1,16 @@
+import pytest
+
+from vfs import VirtualFileSystem
+
+
+def test_remove_refuses_ancestor_of_cwd():
+    vfs = VirtualFileSystem()
+    vfs.create_dir('/work')
+    vfs.create_dir('/work/sub')
+    vfs.change_dir('/work/sub')
+    with pytest.raises(ValueError, match='사용 중인 디렉토리'):
+        vfs.remove('/work')
+    with pytest.raises(ValueError, match='사용 중인 디렉토리'):
+        vfs.remove('.')
+    assert vfs._resolve_path('/work/sub') is vfs.cwd
+    assert vfs.remove('/missing') is False
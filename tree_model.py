@@ -0,0 +1,335 @@
+import bisect
+import threading
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, QPersistentModelIndex, Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QStyle
+
+from shell_engine import ShellEngine
+from vfs import VfsListener
+
+FETCH_BATCH = 100  # 펼칠 때 한 번에 보여줄 자식 수 (나머지는 스크롤하면 더 가져온다)
+SIZE_REFRESH_MS = 100  # 디렉토리 크기 열을 모아서 다시 그리는 간격
+FETCH_RETRY_MS = 50  # 명령 실행 중이라 미룬 폴더 읽기를 다시 시도하는 간격
+
+
+class _GuiThreadRelay(VfsListener):
+    # 명령 실행기(작업 스레드)에서 온 변경 알림을 GUI 스레드의 모델로 넘긴다.
+    # BlockingQueuedConnection이라 보낸 스레드는 모델이 처리할 때까지 기다린다
+    # (모델은 동기 실행 때와 똑같이 알림 순간의 트리를 본다). GUI 스레드에서 온 알림은 바로 넘긴다.
+    def __init__(self, model):
+        self.model = model
+        self.thread = threading.get_ident()
+
+    def _send(self, event, *args):
+        if threading.get_ident() == self.thread:
+            getattr(self.model, event)(*args)
+        else:
+            self.model.vfsEvent.emit(event, args)
+
+    def node_added(self, node):
+        self._send('node_added', node)
+
+    def node_removed(self, node, old_parent):
+        self._send('node_removed', node, old_parent)
+
+    def node_moved(self, node, old_parent, old_name):
+        self._send('node_moved', node, old_parent, old_name)
+
+    def content_changed(self, node):
+        self._send('content_changed', node)
+
+    def children_materialized(self, directory):
+        self._send('children_materialized', directory)
+
+
+class VfsTreeModel(QAbstractItemModel, VfsListener):
+    # Windows 패널의 폴더 트리. 펼친 디렉토리만 자식을 읽고(fetchMore), 파일 시스템 변경 알림을
+    # 받아 바뀐 줄만 rowsInserted/rowsRemoved/dataChanged로 알린다 (전체 다시 그리기 없음).
+    # 디렉토리마다 정렬된 이름 목록과 같은 순서의 노드 목록을 갖고, 앞에서 shown개만 뷰에 보인다.
+    COLUMNS = ('이름', '크기')
+    vfsEvent = pyqtSignal(str, object)  # 다른 스레드에서 온 변경 알림 (이벤트 이름, 인자)
+
+    def __init__(self, vfs, parent=None):
+        super().__init__(parent)
+        self.vfs = vfs
+        self._names = {}  # 펼친 디렉토리 -> 정렬된 자식 이름 목록
+        self._nodes = {}  # 펼친 디렉토리 -> 같은 순서의 자식 노드 목록
+        self._shown = {}  # 펼친 디렉토리 -> 뷰에 보인 줄 수
+        self._owner = {}  # 목록에 든 노드 -> 그 목록의 디렉토리 (삭제/이동 중에도 parent()가 맞도록)
+        self._dirty = set()  # 크기 열을 다시 그릴 디렉토리
+        self._size_timer = QTimer(self)
+        self._size_timer.setSingleShot(True)
+        self._size_timer.timeout.connect(self._flush_sizes)
+        style = QApplication.style()
+        self._icons = (style.standardIcon(QStyle.SP_DirIcon), style.standardIcon(QStyle.SP_FileIcon))
+        self._delivering = False  # 작업 스레드의 알림을 처리하는 중 (그 스레드는 멈춰 기다리고 있다)
+        self._deferred = []  # 명령 실행 중이라 읽지 못한 폴더 (QPersistentModelIndex, 루트는 None)
+        self._retry_timer = QTimer(self)
+        self._retry_timer.setSingleShot(True)
+        self._retry_timer.timeout.connect(self._retry_fetch)
+        self.vfsEvent.connect(self._deliver, Qt.BlockingQueuedConnection)
+        vfs.add_listener(_GuiThreadRelay(self))
+
+    # 인덱스 <-> 노드
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else self.vfs.root
+
+    def _row(self, node):
+        # node가 보이는 줄 번호 (보이지 않으면 None)
+        owner = self._owner.get(node)
+        if owner is None:
+            return None
+        names = self._names[owner]
+        nodes = self._nodes[owner]
+        i = bisect.bisect_left(names, node.name)
+        if i >= len(nodes) or nodes[i] is not node:
+            i = nodes.index(node)  # 이름이 막 바뀐 노드 (mv 처리 중)
+        return i if i < self._shown[owner] else None
+
+    def _index(self, node, column=0):
+        if node is self.vfs.root:
+            return QModelIndex()
+        row = self._row(node)
+        if row is None:
+            return None
+        return self.createIndex(row, column, node)
+
+    def index(self, row, column, parent=QModelIndex()):
+        # 뷰가 펼친 디렉토리의 줄마다 부르므로 가장 자주 불린다 (_node를 거치지 않고 바로)
+        directory = parent.internalPointer() if parent.isValid() else self.vfs.root
+        nodes = self._nodes.get(directory)
+        if nodes is None or not 0 <= row < self._shown[directory]:
+            return QModelIndex()
+        return self.createIndex(row, column, nodes[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        owner = self._owner.get(index.internalPointer())
+        if owner is None or owner is self.vfs.root:
+            return QModelIndex()
+        row = self._row(owner)
+        return QModelIndex() if row is None else self.createIndex(row, 0, owner)
+
+    # 크기와 내용
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self._shown.get(self._node(parent), 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return True
+        node = parent.internalPointer()
+        if node.type != 'directory' or parent.column() > 0:
+            return False
+        names = self._names.get(node)
+        if names is not None:
+            return bool(names)
+        return True  # 아직 펼치지 않은 디렉토리는 펼쳐 봐야 안다 (비어 있으면 그때 화살표가 사라진다)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        if not node.is_dir():
+            return False
+        return node not in self._names or self._shown[node] < len(self._names[node])
+
+    def fetchMore(self, parent):
+        # 작업 스레드가 명령을 실행하는 중(잠금을 잡고 있음)에는 트리를 읽지 않고 끝난 뒤로 미룬다.
+        # 그 스레드가 보낸 알림을 처리하는 중이면 그 스레드는 멈춰 있으므로 바로 읽어도 된다.
+        if self._delivering:
+            self._fetch(parent)
+            return
+        if not self.vfs.lock.acquire(blocking=False):
+            entry = QPersistentModelIndex(parent) if parent.isValid() else None
+            if entry not in self._deferred:  # 뷰는 같은 폴더를 여러 번 부르기도 한다
+                self._deferred.append(entry)
+            self._retry_timer.start(FETCH_RETRY_MS)
+            return
+        try:
+            self._fetch(parent)
+        finally:
+            self.vfs.lock.release()
+
+    def _retry_fetch(self):
+        if not self.vfs.lock.acquire(blocking=False):
+            self._retry_timer.start(FETCH_RETRY_MS)
+            return
+        try:
+            deferred, self._deferred = self._deferred, []
+            for persistent in deferred:
+                if persistent is not None and not persistent.isValid():
+                    continue  # 기다리는 동안 지워진 폴더
+                parent = QModelIndex(persistent) if persistent is not None else QModelIndex()
+                if self.canFetchMore(parent):
+                    self._fetch(parent)
+        finally:
+            self.vfs.lock.release()
+
+    def _fetch(self, parent):
+        node = self._node(parent)
+        if node not in self._names:
+            kids = node.children  # 여기서 처음 구체화된다 (지연 복사본, 호스트 폴더)
+            names = sorted(kids)
+            self._names[node] = names
+            self._nodes[node] = [kids[name] for name in names]
+            self._shown[node] = 0
+            for child in self._nodes[node]:
+                self._owner[child] = node
+        shown = self._shown[node]
+        count = min(FETCH_BATCH, len(self._names[node]) - shown)
+        if count <= 0:
+            return
+        self.beginInsertRows(parent, shown, shown + count - 1)
+        self._shown[node] = shown + count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return node.name
+            return ShellEngine._human_size(node.size)
+        if role == Qt.DecorationRole and index.column() == 0:
+            return self._icons[0 if node.is_dir() else 1]
+        if role == Qt.TextAlignmentRole and index.column() == 1:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    # 목록 고치기
+    def _insert(self, directory, node):
+        names = self._names[directory]
+        i = bisect.bisect_left(names, node.name)
+        self._owner[node] = directory
+        shown = self._shown[directory]
+        if i < shown or shown == len(names):
+            # 보이는 범위 안(또는 모두 보이는 목록의 끝)이면 뷰에 알린다
+            parent = self._index(directory)
+            if parent is not None:
+                self.beginInsertRows(parent, i, i)
+                names.insert(i, node.name)
+                self._nodes[directory].insert(i, node)
+                self._shown[directory] = shown + 1
+                self.endInsertRows()
+                return
+        names.insert(i, node.name)
+        self._nodes[directory].insert(i, node)
+
+    def _take(self, directory, node, name):
+        # 목록에서 node를 뺀다 (name: 목록에 들어갈 때의 이름)
+        nodes = self._nodes[directory]
+        i = bisect.bisect_left(self._names[directory], name)
+        if i >= len(nodes) or nodes[i] is not node:
+            i = nodes.index(node)
+        shown = self._shown[directory]
+        parent = self._index(directory) if i < shown else None
+        if parent is not None:
+            self.beginRemoveRows(parent, i, i)
+        del self._names[directory][i]
+        del nodes[i]
+        if i < shown:
+            self._shown[directory] = shown - 1
+        self._forget(node)
+        if parent is not None:
+            self.endRemoveRows()
+
+    def _forget(self, node):
+        # node와 그 아래에서 펼쳤던 목록을 모두 버린다
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            self._owner.pop(current, None)
+            self._dirty.discard(current)
+            nodes = self._nodes.pop(current, None)
+            if nodes is not None:
+                del self._names[current]
+                del self._shown[current]
+                stack.extend(nodes)
+
+    def _touch(self, directory):
+        # directory부터 위로 크기가 바뀌었다. 보이는 줄만 모아서 나중에 다시 그린다
+        while directory is not None and directory is not self.vfs.root:
+            if directory in self._owner:
+                self._dirty.add(directory)
+            directory = directory.parent
+        if self._dirty and not self._size_timer.isActive():
+            self._size_timer.start(SIZE_REFRESH_MS)
+
+    def _flush_sizes(self):
+        dirty, self._dirty = self._dirty, set()
+        for node in dirty:
+            index = self._index(node, 1)
+            if index is not None:
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    # 파일 시스템 변경 알림
+    def _deliver(self, event, args):
+        self._delivering = True
+        try:
+            getattr(self, event)(*args)
+        finally:
+            self._delivering = False
+
+    def node_added(self, node):
+        directory = node.parent
+        if directory in self._names:
+            self._insert(directory, node)
+        self._touch(directory)
+
+    def node_removed(self, node, old_parent):
+        if self._owner.get(node) is old_parent:
+            self._take(old_parent, node, node.name)
+        else:
+            self._forget(node)
+        self._touch(old_parent)
+
+    def node_moved(self, node, old_parent, old_name):
+        # 옛 자리에서 빼고 새 자리에 닫힌 상태로 넣는다
+        if self._owner.get(node) is old_parent:
+            self._take(old_parent, node, old_name)
+        else:
+            self._forget(node)
+        if node.parent in self._names:
+            self._insert(node.parent, node)
+        self._touch(old_parent)
+        self._touch(node.parent)
+
+    def content_changed(self, node):
+        index = self._index(node, 1)
+        if index is not None:
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        self._touch(node.parent)
+
+    def children_materialized(self, directory):
+        # 펼쳐 둔 호스트 폴더를 다시 읽었다: 그 목록만 새로 만든다
+        if directory not in self._names:
+            return
+        self._touch(directory)
+        shown = self._shown[directory]
+        parent = self._index(directory)
+        if parent is None:
+            self._forget_children(directory)
+            return
+        if shown:
+            self.beginRemoveRows(parent, 0, shown - 1)
+        self._forget_children(directory)
+        if shown:
+            self.endRemoveRows()
+        while self.canFetchMore(parent) and self._shown[directory] < shown:
+            self._fetch(parent)
+
+    def _forget_children(self, directory):
+        for child in self._nodes.pop(directory):
+            self._forget(child)
+        del self._names[directory]
+        del self._shown[directory]
@@ -0,0 +1,749 @@
+import threading
+from collections import OrderedDict
+
+import blob_store
+from blob_store import BlobContent
+
+WRITE_CHUNK_LINES = 4096  # 리다이렉션 기록 시 한 번에 합치는 줄 수
+PATCH_MIN_BYTES = 64 * 1024  # 이보다 큰 파일을 고쳐 쓰면 저널에는 바뀐 줄 범위만 남긴다
+COMPARE_BLOCK = 1 << 16  # 바뀐 범위를 찾을 때 한 번에 비교하는 글자 수
+
+
+def iter_text_lines(text):
+    # 문자열을 줄 단위로 하나씩 잘라 준다 (전체 리스트를 만들지 않음).
+    # 마지막 줄바꿈 뒤의 빈 조각은 줄로 치지 않는다.
+    start = 0
+    end = len(text)
+    while start < end:
+        newline = text.find('\n', start)
+        if newline < 0:
+            yield text[start:]
+            return
+        yield text[start:newline]
+        start = newline + 1
+
+
+def _common_prefix(a, b):
+    # a, b 앞에서부터 같은 글자 수. 덩어리 단위로 비교하고(C 속도) 다른 덩어리 안에서만 반씩 좁힌다
+    n = min(len(a), len(b))
+    i = 0
+    while i < n:
+        j = min(i + COMPARE_BLOCK, n)
+        if a[i:j] == b[i:j]:
+            i = j
+            continue
+        while j - i > 1:
+            mid = (i + j) // 2
+            if a[i:mid] == b[i:mid]:
+                i = mid
+            else:
+                j = mid
+        return i
+    return n
+
+
+def _common_suffix(a, b, limit):
+    # a, b 뒤에서부터 같은 글자 수 (limit 이하)
+    la, lb = len(a), len(b)
+    i = 0
+    while i < limit:
+        j = min(i + COMPARE_BLOCK, limit)
+        if a[la - j:la - i] == b[lb - j:lb - i]:
+            i = j
+            continue
+        while j - i > 1:
+            mid = (i + j) // 2
+            if a[la - mid:la - i] == b[lb - mid:lb - i]:
+                i = mid
+            else:
+                j = mid
+        return i
+    return limit
+
+
+def changed_lines(old, new):
+    # old를 new로 바꾸는 (시작 위치, old에서 지울 글자 수, 넣을 글자). 줄 경계에 맞춘다. 같으면 None
+    if old == new:
+        return None
+    prefix = _common_prefix(old, new)
+    suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+    start = old.rfind('\n', 0, prefix) + 1
+    old_end = len(old) - suffix
+    new_end = len(new) - suffix
+    # 끝도 old와 new 양쪽에서 줄 시작이어야 한다 (아니면 같은 꼬리 안의 다음 줄바꿈 뒤로 옮긴다)
+    if old_end < len(old) and not ((old_end == 0 or old[old_end - 1] == '\n')
+                                    and (new_end == 0 or new[new_end - 1] == '\n')):
+        newline = old.find('\n', old_end)
+        old_end = len(old) if newline < 0 else newline + 1
+        new_end = len(new) - (len(old) - old_end)
+    return start, old_end - start, new[start:new_end]
+
+
+def content_size(data):
+    # 내용의 바이트 수 (UTF-8 기준). 지연 객체는 length를 그대로 쓴다.
+    if data.__class__ is str:
+        return len(data) if data.isascii() else len(data.encode('utf-8'))
+    return data.length
+
+
+class Inode:
+    # 파일/디렉토리 노드. 부모 포인터로 경로를 역추적한다.
+    # 파일 내용은 str 이거나, 처음 읽을 때 str을 만들어 주는 지연 객체(load(), iter_lines(), length)이다.
+    # 큰 내용은 내용 저장소(blob_store)의 blob을 가리킨다.
+    # cp -r로 만든 디렉토리는 처음에 자식이 없고(origin만 가리킴) 접근할 때 한 단계씩 복사된다.
+    # size는 파일이면 자기 크기, 디렉토리면 하위 전체 크기이고 nfiles/ndirs는 하위 파일/디렉토리 수이다.
+    __slots__ = ('name', 'type', 'parent', '_children', '_content', 'origin', 'clones',
+                 'size', 'nfiles', 'ndirs')
+    read_only = False  # 호스트 마운트(hostfs) 노드는 True
+
+    def __init__(self, name, type, parent=None, content=''):
+        self.name = name
+        self.type = type
+        self.parent = parent
+        self.origin = None  # 지연 복사본이 따라가는 원본 디렉토리
+        self.clones = None  # 이 디렉토리를 지연 복사 중인 사본 집합
+        self.nfiles = 0
+        self.ndirs = 0
+        if type == 'directory':
+            self._children = {}
+            self._content = None
+            self.size = 0
+        else:
+            self._children = None
+            self._content = content
+            self.size = content_size(content)
+
+    def totals(self):
+        # 이 노드를 부모에 붙이거나 뗄 때 부모 집계값에 더할 (크기, 파일 수, 디렉토리 수)
+        if self.type == 'file':
+            return self.size, 1, 0
+        return self.size, self.nfiles, self.ndirs + 1
+
+    def is_dir(self):
+        return self.type == 'directory'
+
+    @property
+    def children(self):
+        kids = self._children
+        if kids is None and self.origin is not None:
+            kids = self._materialize()
+        return kids
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
+    @property
+    def content(self):
+        data = self._content
+        if data is not None and data.__class__ is not str:
+            if data.__class__ is BlobContent:
+                return data.load()  # 저장소 blob은 노드에 풀어 두지 않는다
+            data = self._content = data.load()
+        return data
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self.size = content_size(value)
+
+    def iter_lines(self):
+        data = self._content
+        if data.__class__ is str:
+            return iter_text_lines(data)
+        # 아직 읽지 않은 지연 내용은 전체를 만들지 않고 줄 단위로 흘려보낸다
+        return data.iter_lines()
+
+    def clone(self, parent, name=None):
+        # O(1) 복사: 파일은 내용을 공유하고, 디렉토리는 원본을 가리키기만 한다
+        if name is None:
+            name = self.name
+        if self.type == 'file':
+            node = Inode(name, 'file', parent)
+            data = self._content
+            # 저장소 blob은 노드마다 자기 참조를 갖게 한다 (참조 수 = 그 내용을 가진 노드 수)
+            node._content = data.share() if data.__class__ is BlobContent else data
+            node.size = self.size
+            return node
+        node = Inode(name, 'directory', parent)
+        node._children = None
+        node.size = self.size
+        node.nfiles = self.nfiles
+        node.ndirs = self.ndirs
+        source = self.origin if self._children is None else self
+        node.origin = source
+        if source.clones is None:
+            source.clones = set()
+        source.clones.add(node)
+        return node
+
+    def _materialize(self):
+        # 원본의 자식을 한 단계만 복사한다. 손자 디렉토리는 다시 지연 복사본이 된다.
+        source = self.origin
+        self.origin = None
+        source.clones.discard(self)
+        if not source.clones:
+            source.clones = None
+        kids = {}
+        for name, child in source.children.items():
+            kids[name] = child.clone(self, name)
+        self._children = kids
+
+        # 이 트리를 소유한 파일 시스템에 새로 생긴 노드를 알린다 (색인 등)
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        vfs = getattr(root, 'vfs', None)
+        if vfs is not None:
+            vfs._emit('children_materialized', self)
+        return kids
+
+
+class RootInode(Inode):
+    # 루트 노드만 자신을 소유한 파일 시스템을 안다
+    __slots__ = ('vfs',)
+
+    def __init__(self, vfs):
+        super().__init__('/', 'directory')
+        self.vfs = vfs
+
+    @classmethod
+    def adopt(cls, node, vfs):
+        # 일반 노드로 만들어진 루트(시드, 스냅샷, 다른 이미지의 지연 복사본)를 RootInode로 바꾼다
+        root = cls(vfs)
+        root._children = node._children
+        root.size, root.nfiles, root.ndirs = node.size, node.nfiles, node.ndirs
+        if node.origin is not None:
+            root.origin = node.origin
+            node.origin.clones.discard(node)
+            node.origin.clones.add(root)
+        else:
+            for child in root._children.values():
+                child.parent = root
+        return root
+
+
+class VfsListener:
+    # 파일 시스템 변경 알림을 받는 쪽의 기본형. 필요한 메서드만 재정의한다.
+    def node_added(self, node):
+        pass
+
+    def node_removed(self, node, old_parent):
+        pass
+
+    def node_moved(self, node, old_parent, old_name):
+        pass
+
+    def content_changed(self, node):
+        pass
+
+    def children_materialized(self, directory):
+        # 지연 복사본의 자식이 실제 노드로 만들어졌다 (논리적인 변경은 아님)
+        pass
+
+
+SEED_TREE = {
+    'type': 'directory',
+    'name': '/',
+    'children': {
+        'bin': {
+            'type': 'directory',
+            'name': 'bin',
+            'children': {
+                'ls': {'type': 'file', 'name': 'ls', 'content': '#!/bin/bash\necho "List directory contents"'},
+                'cat': {'type': 'file', 'name': 'cat', 'content': '#!/bin/bash\necho "Concatenate files"'}
+            }
+        },
+        'etc': {
+            'type': 'directory',
+            'name': 'etc',
+            'children': {
+                'passwd': {'type': 'file', 'name': 'passwd', 'content': 'root:x:0:0:root:/root:/bin/bash\nuser:x:1000:1000:user:/home/user:/bin/bash'},
+                'hostname': {'type': 'file', 'name': 'hostname', 'content': 'linux-simulator'}
+            }
+        },
+        'home': {
+            'type': 'directory',
+            'name': 'home',
+            'children': {
+                'user': {
+                    'type': 'directory',
+                    'name': 'user',
+                    'children': {
+                        'Documents': {'type': 'directory', 'name': 'Documents', 'children': {}},
+                        'Downloads': {'type': 'directory', 'name': 'Downloads', 'children': {}},
+                        'hello.txt': {'type': 'file', 'name': 'hello.txt', 'content': 'Hello, Linux World!'}
+                    }
+                }
+            }
+        },
+        'var': {
+            'type': 'directory',
+            'name': 'var',
+            'children': {
+                'log': {
+                    'type': 'directory',
+                    'name': 'log',
+                    'children': {
+                        'syslog': {'type': 'file', 'name': 'syslog', 'content': 'System log file'}
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+class VirtualFileSystem:
+    PATH_CACHE_SIZE = 4096  # 경로 -> 노드 LRU 캐시 크기
+
+    def __init__(self, seed=SEED_TREE, root=None):
+        # root가 주어지면(스냅샷 등) 시드 트리를 만들지 않는다
+        root = root if root is not None else self._build(seed, None)
+        self.root = RootInode.adopt(root, self)
+        self._recount(self.root)
+        self.cwd = self.root
+        self._cwd_path = '/'
+        self._path_cache = OrderedDict()
+        self.listeners = []
+        self.mounts = []  # 호스트 디렉토리 마운트 지점 (hostfs)
+        self.journal = None  # 변경 기록 저널 (journal.py). 있으면 바뀐 것만 덧붙여 자동 저장한다
+        self.store = blob_store.STORE  # 큰 파일 내용을 넣는 내용 저장소 (None이면 노드에 str로 둔다)
+        # GUI의 명령 실행기가 작업 스레드에서 명령을 실행하는 동안 잡는다.
+        # 화면 쪽(폴더 트리)은 이 잠금을 기다리지 않고, 못 잡으면 트리 읽기를 미룬다.
+        self.lock = threading.RLock()
+
+    @classmethod
+    def overlay(cls, base):
+        # base 이미지를 읽기 전용으로 공유하고, 바뀐 부분만 따로 갖는 파일 시스템
+        # (base 쪽은 이후 수정하지 않는다는 전제)
+        return cls(root=base.root.clone(None, '/'))
+
+    def release(self):
+        # 더 이상 쓰지 않는 파일 시스템의 지연 복사본을 원본의 clones에서 떼어낸다.
+        # 공유 이미지 위의 세션을 닫을 때 호출하지 않으면 원본 쪽에 참조가 남는다.
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.origin is not None:
+                node.origin.clones.discard(node)
+                if not node.origin.clones:
+                    node.origin.clones = None
+                node.origin = None
+            elif node._children:
+                stack.extend(node._children.values())
+        self.listeners = []
+
+    def _build(self, spec, parent):
+        node = Inode(spec['name'], spec['type'], parent, spec.get('content', ''))
+        if node.is_dir():
+            for child_spec in spec['children'].values():
+                node.children[child_spec['name']] = self._build(child_spec, node)
+        return node
+
+    def _recount(self, top):
+        # 하위 트리 전체의 집계값을 처음부터 계산한다 (시작할 때 한 번)
+        order = []
+        stack = [top]
+        while stack:
+            node = stack.pop()
+            if node._children is not None:  # 지연 복사본은 복사할 때 받은 값을 그대로 쓴다
+                order.append(node)
+                stack.extend(node._children.values())
+        for node in reversed(order):
+            size = files = dirs = 0
+            for child in node._children.values():
+                child_size, child_files, child_dirs = child.totals()
+                size += child_size
+                files += child_files
+                dirs += child_dirs
+            node.size, node.nfiles, node.ndirs = size, files, dirs
+
+    def _adjust(self, directory, size, files=0, dirs=0):
+        # 부모 방향으로 올라가며 집계값을 갱신한다 (O(깊이))
+        node = directory
+        while node is not None:
+            node.size += size
+            node.nfiles += files
+            node.ndirs += dirs
+            node = node.parent
+
+    def _invalidate(self):
+        # 트리가 바뀌면 캐시된 경로는 모두 무효가 된다
+        self._path_cache.clear()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def _emit(self, event, *args):
+        for listener in self.listeners:
+            getattr(listener, event)(*args)
+
+    def _log(self, op, *args):
+        # 성공한 변경 하나를 저널에 남긴다 (경로는 절대 경로로)
+        if self.journal is not None:
+            self.journal.append(op, args)
+
+    def _log_tree(self, node):
+        # 호스트 마운트에서 복사한 것은 다시 실행할 때 원본이 없을 수 있으므로 내용째 남긴다
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current.is_dir():
+                self._log('mkdir', self.node_path(current))
+                stack.extend(current.children.values())
+            else:
+                self._log('write', self.node_path(current), current.content)
+
+    def _store_tree(self, node):
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current._children is not None:
+                stack.extend(current._children.values())
+            else:
+                current._content = self._stored(current._content)
+
+    def _is_attached(self, node):
+        while node.parent is not None:
+            node = node.parent
+        return node is self.root
+
+    def _detach_clones(self, directory):
+        # directory 아래가 바뀌기 직전에 호출한다. 이 경로를 지연 복사 중인 사본들이
+        # 바뀌기 전 상태를 먼저 복사해 가도록, 루트부터 경로를 따라 한 단계씩 구체화한다.
+        chain = []
+        node = directory
+        while node is not None:
+            chain.append(node)
+            node = node.parent
+        for node in reversed(chain):
+            while node.clones:
+                clone = next(iter(node.clones))
+                if self._is_attached(clone):
+                    clone._materialize()
+                else:
+                    # 이미 삭제된 사본은 복사할 필요 없이 목록에서만 뺀다
+                    node.clones.discard(clone)
+            node.clones = None
+
+    def _is_ancestor(self, node, descendant):
+        while descendant is not None:
+            if descendant is node:
+                return True
+            descendant = descendant.parent
+        return False
+
+    def node_path(self, node):
+        parts = []
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return '/' + '/'.join(reversed(parts))
+
+    def get_current_dir(self):
+        return self.cwd
+
+    def list_dir(self, path=None):
+        if path is None:
+            current = self.cwd
+        else:
+            current = self._resolve_path(path)
+        if current and current.is_dir():
+            return sorted(current.children)
+        return []
+
+    def list_entries(self, path=None):
+        # ls -l 용: (이름, 노드) 목록
+        current = self.cwd if path is None else self._resolve_path(path)
+        if current is None:
+            return None
+        if not current.is_dir():
+            return [(current.name, current)]
+        kids = current.children
+        return [(name, kids[name]) for name in sorted(kids)]
+
+    def _resolve_path(self, path):
+        # 상태를 바꾸지 않는 경로 해석기 (current_path를 건드리지 않음)
+        if not path:
+            return None
+        if path.startswith('/'):
+            key = path
+            node = self.root
+        else:
+            key = self._cwd_path.rstrip('/') + '/' + path
+            node = self.cwd
+
+        cache = self._path_cache
+        hit = cache.get(key)
+        if hit is not None:
+            cache.move_to_end(key)
+            return hit
+
+        for part in path.split('/'):
+            if not part or part == '.':
+                continue
+            if part == '..':
+                if node.parent is not None:
+                    node = node.parent
+                continue
+            if not node.is_dir():
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+
+        cache[key] = node
+        if len(cache) > self.PATH_CACHE_SIZE:
+            cache.popitem(last=False)
+        return node
+
+    def _split_parent(self, path):
+        # 'a/b/c' -> (a/b 노드, 'c')
+        path = path.rstrip('/')
+        if '/' not in path:
+            return self.cwd, path
+        head, name = path.rsplit('/', 1)
+        parent = self._resolve_path(head or '/')
+        if parent is None or not parent.is_dir():
+            return None, name
+        return parent, name
+
+    def change_dir(self, path):
+        target = self._resolve_path(path)
+        if target and target.is_dir():
+            self.cwd = target
+            self._cwd_path = self.node_path(target)
+            return True
+        return False
+
+    def get_path(self):
+        return self._cwd_path
+
+    def _check_writable(self, node, path):
+        if node.read_only:
+            raise PermissionError(f"읽기 전용 파일 시스템입니다: {path}")
+
+    def _add_child(self, path, type):
+        parent, name = self._split_parent(path)
+        if parent is None or not name or name in ('.', '..') or name in parent.children:
+            return None
+        self._check_writable(parent, path)
+        self._detach_clones(parent)
+        node = Inode(name, type, parent)
+        parent.children[name] = node
+        self._adjust(parent, *node.totals())
+        self._invalidate()
+        self._emit('node_added', node)
+        return node
+
+    def create_file(self, name):
+        node = self._add_child(name, 'file')
+        if node is None:
+            return False
+        self._log('touch', self.node_path(node))
+        return True
+
+    def create_dir(self, name):
+        node = self._add_child(name, 'directory')
+        if node is None:
+            return False
+        self._log('mkdir', self.node_path(node))
+        return True
+
+    def read_file(self, path):
+        target = self._resolve_path(path)
+        if target and target.type == 'file':
+            return target.content
+        return None
+
+    def read_lines(self, path):
+        target = self._resolve_path(path)
+        if target and target.type == 'file':
+            return target.iter_lines()
+        return None
+
+    def write_file(self, path, content):
+        target = self._resolve_path(path)
+        if target is None:
+            target = self._add_child(path, 'file')
+            if target is None:
+                return False
+        elif target.type != 'file':
+            return False
+        else:
+            self._check_writable(target, path)
+            self._detach_clones(target.parent)
+        old_size = target.size
+        old = target._content
+        target.content = self._stored(content)
+        self._adjust(target.parent, target.size - old_size)
+        self._emit('content_changed', target)
+        if self.journal is not None:
+            self._log_write(target, old, old_size, content)
+        return True
+
+    def _log_write(self, target, old, old_size, content):
+        # 에디터가 넣은 지연 내용(피스 테이블)은 글자로 풀어서 남긴다.
+        # 큰 파일을 고쳐 쓴 것이면 바뀐 줄 범위만 남기고(patch), 내용이 그대로면 아무것도 남기지 않는다
+        # (큰 파일을 저장할 때마다 저널이 파일 크기만큼 늘어 스냅샷 압축이 자주 일어나지 않도록)
+        text = content if content.__class__ is str else content.load()
+        path = self.node_path(target)
+        if old is None or old_size < PATCH_MIN_BYTES:
+            self._log('write', path, text)
+            return
+        change = changed_lines(old if old.__class__ is str else old.load(), text)
+        if change is not None:
+            start, removed, inserted = change
+            self._log('patch', path, str(start), str(removed), inserted)
+
+    def _stored(self, content):
+        # 큰 str 내용은 저장소에 넣고 그 참조로 바꾼다 (같은 내용은 한 번만, 크면 압축해서)
+        # 에디터의 피스 테이블은 원래 내용과 버퍼를 같이 쓰므로 그대로 둔다
+        if (content.__class__ is str and self.store is not None
+                and len(content) >= blob_store.STORE_MIN_BYTES):
+            return self.store.put(content)
+        return content
+
+    def write_lines(self, path, lines, append=False):
+        # 리다이렉션(>, >>) 대상. 줄을 일정 크기 묶음으로 합쳐 한 번에 기록한다.
+        target = self._resolve_path(path)
+        if target is None:
+            target = self._add_child(path, 'file')
+            if target is None:
+                return False
+        elif target.type != 'file':
+            return False
+        self._check_writable(target, path)
+
+        chunks = []
+        buffer = []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= WRITE_CHUNK_LINES:
+                buffer.append('')
+                chunks.append('\n'.join(buffer))
+                buffer = []
+        if buffer:
+            buffer.append('')
+            chunks.append('\n'.join(buffer))
+
+        if self.journal is not None:
+            # >> 는 덧붙인 부분만 남긴다
+            self._log('append' if append else 'write', self.node_path(target), ''.join(chunks))
+        if append:
+            # 저장소에 넣은 내용이면 전체를 풀고 합친 것을 다시 해시/압축해 넣는다 (>> 한 번이 파일 크기에 비례).
+            # 내용 주소 방식이라 덧붙인 부분만 따로 둘 수 없다
+            existing = target.content
+            if existing and not existing.endswith('\n'):
+                existing += '\n'
+            chunks.insert(0, existing)
+        self._detach_clones(target.parent)
+        old_size = target.size
+        target.content = self._stored(''.join(chunks))
+        self._adjust(target.parent, target.size - old_size)
+        self._emit('content_changed', target)
+        return True
+
+    def remove(self, path):
+        target = self._resolve_path(path)
+        if target is None or target.parent is None:
+            return False
+        # 현재 디렉토리나 그 상위 디렉토리는 삭제할 수 없다 (없는 것과 구분해 이유를 알린다)
+        if self._is_ancestor(target, self.cwd):
+            raise ValueError(f"사용 중인 디렉토리입니다 (현재 디렉토리가 그 안에 있습니다): {path}")
+        self._check_writable(target, path)
+        self._log('rm', self.node_path(target))
+        parent = target.parent
+        self._detach_clones(parent)
+        del parent.children[target.name]
+        target.parent = None
+        size, files, dirs = target.totals()
+        self._adjust(parent, -size, -files, -dirs)
+        self._invalidate()
+        self._emit('node_removed', target, parent)
+        return True
+
+    def _destination(self, source, dst):
+        # cp/mv 대상 해석: 존재하는 디렉토리면 그 안에 같은 이름으로, 아니면 부모 + 새 이름
+        target = self._resolve_path(dst)
+        if target is not None and target.is_dir():
+            return target, source.name
+        parent, name = self._split_parent(dst)
+        if parent is None or not name or name in ('.', '..'):
+            return None, None
+        return parent, name
+
+    def _link(self, parent, name, node):
+        # 같은 이름의 파일이 있으면 덮어쓴다 (호출하는 쪽에서 디렉토리 충돌은 걸러낸다)
+        existing = parent.children.get(name)
+        if existing is not None:
+            existing.parent = None
+            size, files, dirs = existing.totals()
+            self._adjust(parent, -size, -files, -dirs)
+            self._emit('node_removed', existing, parent)
+        node.name = name
+        node.parent = parent
+        parent.children[name] = node
+        self._adjust(parent, *node.totals())
+
+    def copy(self, src, dst, recursive=False):
+        source = self._resolve_path(src)
+        if source is None or source.parent is None:
+            return False
+        if source.is_dir() and not recursive:
+            return False
+        parent, name = self._destination(source, dst)
+        if parent is None or self._is_ancestor(source, parent):
+            return False
+        existing = parent.children.get(name)
+        if existing is source or (existing is not None and (existing.is_dir() or source.is_dir())):
+            return False
+        self._check_writable(parent, dst)
+        self._detach_clones(parent)
+        node = source.clone(parent, name)
+        if source.read_only:
+            self._store_tree(node)  # 호스트에서 읽어 온 큰 내용은 저장소에 넣는다
+        self._link(parent, name, node)
+        self._invalidate()
+        self._emit('node_added', node)
+        if self.journal is not None:
+            if source.read_only:
+                self._log_tree(node)
+            else:
+                self._log('cp', self.node_path(source), self.node_path(node))
+        return True
+
+    def move(self, src, dst):
+        # 노드를 새 부모/이름에 다시 연결할 뿐 내용은 복사하지 않는다
+        source = self._resolve_path(src)
+        if source is None or source.parent is None:
+            return False
+        parent, name = self._destination(source, dst)
+        if parent is None or self._is_ancestor(source, parent):
+            return False
+        if parent is source.parent and name == source.name:
+            return True
+        self._check_writable(source, src)
+        self._check_writable(parent, dst)
+        old_parent = source.parent
+        self._detach_clones(old_parent)
+        self._detach_clones(parent)
+        existing = parent.children.get(name)
+        if existing is not None and (existing.is_dir() or source.is_dir()):
+            return False
+        old_name = source.name
+        old_path = self.node_path(source)
+        del old_parent.children[old_name]
+        size, files, dirs = source.totals()
+        self._adjust(old_parent, -size, -files, -dirs)
+        self._link(parent, name, source)
+        self._invalidate()
+        self._emit('node_moved', source, old_parent, old_name)
+        self._log('mv', old_path, self.node_path(source))
+        if self._is_ancestor(source, self.cwd):
+            self._cwd_path = self.node_path(self.cwd)
+        return True